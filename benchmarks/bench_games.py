@@ -0,0 +1,214 @@
+"""Throughput benchmarks for the game hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench_games.py             # compare with the baseline
+    python benchmarks/bench_games.py --update    # record a new baseline
+
+Each benchmark reports operations per second, the best of several
+repeats. A benchmark fails when its throughput drops below the baseline
+by more than the threshold (20% by default), and the script then exits
+with status 1. Baselines depend on the machine, so record them on the
+machine that runs the comparison.
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hangman.ascii_art import display_word_progress  # noqa: E402
+from hangman.hangman import HangmanGame  # noqa: E402
+from hangman.words import WordStore, compile_word_store, get_random_word  # noqa: E402
+from rock_paper_scissors import CHOICES, determine_winner, get_computer_choice  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+WORD_LENGTHS = (4, 8, 16)
+STORE_SIZES = (10000, 200000)
+
+def make_word(length, rng):
+    """Make a random upper-case word of the given length."""
+    return "".join(rng.choice(string.ascii_uppercase) for _ in range(length))
+
+def bench_determine_winner():
+    """Benchmark determine_winner over every pair of choices."""
+    pairs = [(user, computer) for user in CHOICES for computer in CHOICES]
+    def run(n):
+        for _ in range(n // len(pairs)):
+            for user, computer in pairs:
+                determine_winner(user, computer)
+        return n // len(pairs) * len(pairs)
+    return run
+
+def bench_get_computer_choice():
+    """Benchmark picking the computer's choice."""
+    def run(n):
+        for _ in range(n):
+            get_computer_choice()
+        return n
+    return run
+
+def bench_make_guess(length):
+    """Benchmark make_guess on a word of the given length.
+    
+    Returns:
+        callable: Runs about n guesses and returns the number made
+    """
+    word = make_word(length, random.Random(length))
+    # Half the guesses hit the word, half miss, and the game never ends.
+    letters = sorted(set(word))[:13]
+    misses = [letter for letter in string.ascii_uppercase if letter not in word]
+    letters = (letters + misses)[:13]
+    def run(n):
+        game = HangmanGame(max_wrong_guesses=27, word=word)
+        for _ in range(n // len(letters)):
+            game.reset_game(word=word)
+            for letter in letters:
+                game.make_guess(letter)
+        return n // len(letters) * len(letters)
+    return run
+
+def bench_get_game_state(changing):
+    """Benchmark get_game_state, after a guess each time if changing is true."""
+    def run(n):
+        game = HangmanGame(max_wrong_guesses=27, word="BENCHMARKING")
+        letters = string.ascii_uppercase
+        for index in range(n):
+            if changing:
+                if index % 26 == 0:
+                    game.reset_game(word="BENCHMARKING")
+                game.make_guess(letters[index % 26])
+            game.get_game_state()
+        return n
+    return run
+
+def bench_display_word_progress(length):
+    """Benchmark display_word_progress on a half-guessed word."""
+    word = make_word(length, random.Random(length))
+    guessed = set(word[::2])
+    def run(n):
+        for _ in range(n):
+            display_word_progress(word, guessed)
+        return n
+    return run
+
+def bench_get_random_word():
+    """Benchmark get_random_word with the built-in word lists."""
+    def run(n):
+        for _ in range(n):
+            get_random_word("medium")
+        return n
+    return run
+
+def bench_store_random_word(store):
+    """Benchmark picking words from a compiled word store."""
+    def run(n):
+        for _ in range(n):
+            store.random_word("medium")
+        return n
+    return run
+
+def build_benchmarks(tmp_dir):
+    """Get the benchmarks by name."""
+    benchmarks = {
+        "determine_winner": bench_determine_winner(),
+        "get_computer_choice": bench_get_computer_choice(),
+        "get_game_state[cached]": bench_get_game_state(False),
+        "get_game_state[after_guess]": bench_get_game_state(True),
+        "get_random_word[builtin]": bench_get_random_word(),
+    }
+    for length in WORD_LENGTHS:
+        benchmarks[f"make_guess[len={length}]"] = bench_make_guess(length)
+        benchmarks[f"display_word_progress[len={length}]"] = bench_display_word_progress(length)
+    rng = random.Random(0)
+    for size in STORE_SIZES:
+        path = os.path.join(tmp_dir, f"words{size}.hws")
+        words = (make_word(rng.randint(4, 12), rng) for _ in range(size))
+        compile_word_store(path, {"medium": words})
+        benchmarks[f"get_random_word[store={size}]"] = bench_store_random_word(WordStore(path))
+    return benchmarks
+
+def measure(run, min_time=0.2, repeats=5):
+    """Measure the best throughput of a benchmark, in operations per second."""
+    n = 100
+    while True:
+        start = time.perf_counter()
+        run(n)
+        if time.perf_counter() - start >= min_time / 4:
+            break
+        n *= 4
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ops = run(n)
+        best = max(best, ops / (time.perf_counter() - start))
+    return best
+
+def compare(results, baseline, threshold):
+    """Find the benchmarks that regressed past the threshold.
+    
+    Returns:
+        list: (name, baseline ops/s, measured ops/s) of each regression
+    """
+    regressions = []
+    for name, ops in results.items():
+        expected = baseline.get(name)
+        if expected and ops < expected * (1 - threshold):
+            regressions.append((name, expected, ops))
+    return regressions
+
+def main(argv=None):
+    """Run the benchmarks and compare them with the baseline.
+    
+    Returns:
+        int: Exit status, 1 if any benchmark regressed
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the game hot paths.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fractional throughput drop (default: %(default)s)")
+    parser.add_argument("--update", action="store_true", help="record results as the new baseline")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        benchmarks = build_benchmarks(tmp_dir)
+        results = {}
+        for name, run in benchmarks.items():
+            if args.filter in name:
+                results[name] = measure(run)
+                print(f"{name:40} {results[name]:>14,.0f} ops/s")
+    
+    if args.update:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update({name: round(ops) for name, ops in results.items()})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to record one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for name, expected, ops in regressions:
+        print(f"REGRESSION {name}: {ops:,.0f} ops/s, baseline {expected:,.0f} ops/s")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
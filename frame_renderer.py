@@ -0,0 +1,91 @@
+"""Buffered frame rendering for the console games.
+
+A frame is the list of lines a game shows on each turn. FrameRenderer
+writes a whole frame in a single write. On a terminal it moves the cursor
+back over the previous frame and only rewrites the lines that changed;
+elsewhere (pipes, files, dumb terminals) it writes every frame in full.
+"""
+
+import os
+import shutil
+import sys
+
+CURSOR_UP = "\x1b[{}A"
+CURSOR_DOWN = "\x1b[B"
+CLEAR_LINE = "\x1b[2K"
+CLEAR_BELOW = "\x1b[J"
+
+def _supports_ansi(stream):
+    try:
+        is_tty = stream.isatty()
+    except (AttributeError, ValueError):
+        return False
+    return is_tty and os.environ.get("TERM") != "dumb"
+
+class FrameRenderer:
+    """Draws frames of lines, redrawing only what changed on terminals."""
+
+    def __init__(self, stream=None, ansi=None):
+        """Create a renderer.
+
+        Args:
+            stream: Text stream to write to; defaults to sys.stdout
+            ansi (bool): Whether to redraw in place with ANSI cursor
+                control; detected from the stream if None
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.ansi = _supports_ansi(self.stream) if ansi is None else ansi
+        self._lines = None
+        # Lines written below the current frame since it was drawn
+        self._below = 0
+
+    def render(self, lines):
+        """Draw a frame.
+
+        Args:
+            lines (list): Lines of the frame; strings may contain newlines
+        """
+        lines = "\n".join(lines).split("\n")
+        previous = self._lines
+        if not self.ansi or previous is None:
+            text = "\n".join(lines) + "\n"
+        else:
+            up = len(previous) + self._below
+            if up >= shutil.get_terminal_size().lines:
+                # The previous frame scrolled out of reach; draw in full.
+                text = "\n".join(lines) + "\n"
+            else:
+                parts = [CURSOR_UP.format(up), "\r"] if up else ["\r"]
+                for index, line in enumerate(lines):
+                    if index < len(previous) and previous[index] == line:
+                        parts.append(CURSOR_DOWN)
+                    else:
+                        parts.append(CLEAR_LINE + line + "\n")
+                parts.append(CLEAR_BELOW)
+                text = "".join(parts)
+        self.stream.write(text)
+        self.stream.flush()
+        self._lines = lines
+        self._below = 0
+
+    def write(self, text):
+        """Write text below the current frame."""
+        self.stream.write(text)
+        self.stream.flush()
+        self._below += text.count("\n")
+
+    def input(self, prompt):
+        """Read a line below the current frame.
+
+        Returns:
+            str: The line read, without its newline
+        """
+        self.stream.flush()
+        value = input(prompt)
+        self._below += 1
+        return value
+
+    def reset(self):
+        """Forget the current frame, so the next one is drawn below it."""
+        self._lines = None
+        self._below = 0
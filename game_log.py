@@ -0,0 +1,498 @@
+"""Compact binary logs of rock paper scissors rounds and hangman games.
+
+Both formats are columnar and bit-packed, and their readers memory-map
+the file and work on ``memoryview`` slices of it, so an archive can be
+scored or replayed without decoding it into a Python object per round.
+Whole-buffer passes go through ``bytes.translate`` one chunk of
+SCAN_CHUNK bytes at a time, which keeps memory use bounded for any file
+size.
+
+Rock paper scissors log (all integers little-endian):
+
+    header   magic b"GLR1", bits per move (u8), rule set name (15 bytes,
+             NUL padded), round count (u64)
+    rounds   one code per round, user move | computer move << bits,
+             packed two rounds per byte (low nibble first) when moves
+             take 2 bits, or one round per byte when they take 4
+
+Hangman log:
+
+    header   magic b"GLH1", game count (u32), guess count (u32)
+    word ids one u32 per game (see hangman.words.get_word_id)
+    counts   number of guesses of each game (u8)
+    guesses  the letters guessed in every game, back to back, as 5-bit
+             codes (A = 0) packed least significant bit first
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+from rps_rules import CLASSIC, OUTCOMES, RULE_SETS
+
+RPS_MAGIC = b"GLR1"
+HANGMAN_MAGIC = b"GLH1"
+
+# Bytes translated per pass when scanning a log
+SCAN_CHUNK = 1 << 20
+# Word ids a hangman log writer buffers before writing them out
+WRITE_CHUNK = 1 << 16
+
+_RPS_HEADER = struct.Struct("<4sB15sQ")
+_HANGMAN_HEADER = struct.Struct("<4sII")
+
+LETTER_BITS = 5
+
+def _move_bits(rules):
+    if len(rules) <= 4:
+        return 2
+    if len(rules) <= 16:
+        return 4
+    raise ValueError("game logs are limited to rule sets of 16 moves")
+
+def _times(factor):
+    return bytes(value * factor & 0xFF for value in range(256))
+
+_HIGH_NIBBLE = _times(16)
+
+def _add_bytes(first, second):
+    """Add two equal-length byte strings byte by byte, when no sum overflows a byte."""
+    total = int.from_bytes(first, "little") + int.from_bytes(second, "little")
+    return total.to_bytes(len(first), "little")
+
+def _open_map(path):
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _write_header(f, header):
+    # Patch the header in place once the counts are known.
+    end = f.tell()
+    f.seek(0)
+    f.write(header)
+    f.seek(end)
+
+class RpsLogWriter:
+    """Appends rounds to a rock paper scissors log file."""
+
+    def __init__(self, path, rules=CLASSIC):
+        """Create a log file, replacing any existing one.
+
+        Args:
+            path (str): Log file path
+            rules (RuleSet): Rule set the rounds are played with
+        """
+        self.rules = rules
+        self.bits = _move_bits(rules)
+        self.rounds = 0
+        self._computer_shift = _times(1 << self.bits)
+        self._valid_moves = bytes(range(len(rules)))
+        # Code of the last round when it does not fill a byte by itself
+        self._pending = None
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+
+    def _header(self):
+        name = self.rules.name.encode("ascii")[:15]
+        return _RPS_HEADER.pack(RPS_MAGIC, self.bits, name, self.rounds)
+
+    def append(self, user_moves, computer_moves):
+        """Append rounds given as move indexes, such as from encode_moves.
+
+        Args:
+            user_moves (bytes): User move of each round
+            computer_moves (bytes): Computer move of each round
+        """
+        from rock_paper_scissors import _as_move_bytes
+
+        user = _as_move_bytes(user_moves)
+        computer = _as_move_bytes(computer_moves)
+        if len(user) != len(computer):
+            raise ValueError("user_moves and computer_moves must have the same length")
+        if user.translate(None, self._valid_moves) or computer.translate(None, self._valid_moves):
+            raise ValueError(f"moves must be indexes below {len(self.rules)}")
+        codes = _add_bytes(user, computer.translate(self._computer_shift))
+        self.rounds += len(codes)
+        if self.bits == 4:
+            self._file.write(codes)
+            return
+        if self._pending is not None:
+            codes = bytes([self._pending]) + codes
+            self._pending = None
+        if len(codes) % 2:
+            self._pending = codes[-1]
+            codes = codes[:-1]
+        self._file.write(_add_bytes(codes[0::2], codes[1::2].translate(_HIGH_NIBBLE)))
+
+    def close(self):
+        """Write any buffered round and the final header, and close the file."""
+        if self._file.closed:
+            return
+        if self._pending is not None:
+            self._file.write(bytes([self._pending]))
+            self._pending = None
+        _write_header(self._file, self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_rps_log(path, user_moves, computer_moves, rules=CLASSIC):
+    """Write rounds given as move indexes to a new log file."""
+    with RpsLogWriter(path, rules) as writer:
+        writer.append(user_moves, computer_moves)
+
+class RpsLog:
+    """Read-only, memory-mapped view of a rock paper scissors log."""
+
+    def __init__(self, path, rules=None):
+        """Open and map a log file.
+
+        Args:
+            path (str): Path of a file written by RpsLogWriter
+            rules (RuleSet): Rule set the rounds were played with; looked
+                up in rps_rules.RULE_SETS by the name in the header if None
+
+        Raises:
+            ValueError: If the file is not a log, or its rule set is
+                unknown or does not match ``rules``
+        """
+        self.path = path
+        self._map = _open_map(path)
+        magic, self.bits, name, self.rounds = _RPS_HEADER.unpack_from(self._map, 0)
+        if magic != RPS_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a rock paper scissors log")
+        name = name.rstrip(b"\0")
+        if rules is None:
+            rules = RULE_SETS.get(name.decode("ascii", "replace"))
+            if rules is None:
+                self._map.close()
+                raise ValueError(f"{path} uses unknown rule set {name!r}; pass rules")
+        elif rules.name.encode("ascii")[:15] != name or _move_bits(rules) != self.bits:
+            self._map.close()
+            raise ValueError(f"{path} was not written with rule set {rules.name!r}")
+        self.rules = rules
+        # The packed rounds, without copying them out of the mapping
+        self.data = memoryview(self._map)[_RPS_HEADER.size:]
+
+        mask = (1 << self.bits) - 1
+        # Tables from a packed byte to the move of each side in each of its rounds
+        if self.bits == 2:
+            self._move_tables = [
+                (bytes(value >> shift & mask for value in range(256)),
+                 bytes(value >> shift + 2 & mask for value in range(256)))
+                for shift in (0, 4)
+            ]
+        else:
+            self._move_tables = [(bytes(value & mask for value in range(256)),
+                                  bytes(value >> 4 for value in range(256)))]
+
+    def __len__(self):
+        return self.rounds
+
+    def close(self):
+        """Release the view and unmap the file."""
+        self.data.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _chunks(self):
+        for start in range(0, len(self.data), SCAN_CHUNK):
+            yield self.data[start:start + SCAN_CHUNK].tobytes()
+
+    def moves(self):
+        """Unpack every round.
+
+        Returns:
+            tuple: User moves and computer moves as bytes of move indexes,
+                ready for rock_paper_scissors.determine_winners
+        """
+        user = bytearray(len(self.data) * len(self._move_tables))
+        computer = bytearray(len(user))
+        step = len(self._move_tables)
+        position = 0
+        for chunk in self._chunks():
+            end = position + len(chunk) * step
+            for offset, (user_table, computer_table) in enumerate(self._move_tables):
+                user[position + offset:end:step] = chunk.translate(user_table)
+                computer[position + offset:end:step] = chunk.translate(computer_table)
+            position = end
+        return bytes(user[:self.rounds]), bytes(computer[:self.rounds])
+
+    def score(self):
+        """Count the results of every round without unpacking them.
+
+        Returns:
+            dict: Number of rounds for each outcome ('tie', 'user', 'computer')
+        """
+        size = len(self.rules)
+        # For each packed byte, the number of its rounds won by each side
+        wins = [bytearray(256), bytearray(256)]
+        for value in range(256):
+            for user_table, computer_table in self._move_tables:
+                user, computer = user_table[value], computer_table[value]
+                if user < size and computer < size:
+                    outcome = self.rules.outcome(user, computer)
+                    if outcome:
+                        wins[outcome - 1][value] += 1
+        wins = [bytes(table) for table in wins]
+
+        counts = [0, 0]
+        for chunk in self._chunks():
+            for side, table in enumerate(wins):
+                counted = chunk.translate(table)
+                counts[side] += counted.count(1) + 2 * counted.count(2)
+        # A padding round at the end is a tie of move 0 against itself.
+        return dict(zip(OUTCOMES, (self.rounds - sum(counts), *counts)))
+
+class HangmanLogWriter:
+    """Collects hangman games and writes them as a columnar log."""
+
+    def __init__(self, path):
+        """Start a log; it replaces any existing file when the writer is closed.
+
+        Word ids are written out WRITE_CHUNK at a time; the guess counts
+        and letters, a byte or less per game and guess, are kept until
+        the end.
+
+        Args:
+            path (str): Log file path
+        """
+        self.path = path
+        self.games = 0
+        self._word_ids = array("I")
+        self._counts = bytearray()
+        self._letters = bytearray()
+        self._tmp_path = f"{path}.tmp{os.getpid()}"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(self._header())
+
+    def _header(self):
+        return _HANGMAN_HEADER.pack(HANGMAN_MAGIC, self.games, len(self._letters))
+
+    def _flush_word_ids(self):
+        if sys.byteorder == "big":
+            self._word_ids.byteswap()
+        self._word_ids.tofile(self._file)
+        del self._word_ids[:]
+
+    def append(self, word, guesses):
+        """Add a game.
+
+        Args:
+            word (str): Word of the game, known to hangman.words
+            guesses (str): Letters guessed, in order; at most 255
+        """
+        from hangman.words import get_word_id
+
+        letters = guesses.upper().encode("ascii")
+        if len(letters) > 255:
+            raise ValueError("games are limited to 255 guesses")
+        codes = letters.translate(_LETTER_CODES)
+        if codes.translate(None, bytes(range(26))):
+            raise ValueError(f"Guesses must be letters: {guesses!r}")
+        self._word_ids.append(get_word_id(word))
+        self._counts.append(len(codes))
+        self._letters += codes
+        self.games += 1
+        if len(self._word_ids) >= WRITE_CHUNK:
+            self._flush_word_ids()
+
+    def close(self):
+        """Write the rest of the log and move it into place."""
+        if self._file.closed:
+            return
+        with self._file as f:
+            self._flush_word_ids()
+            f.write(self._counts)
+            f.write(_pack_letters(self._letters))
+            _write_header(f, self._header())
+        os.replace(self._tmp_path, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Translation of upper-case ASCII letters to codes 0-25; anything else
+# becomes 255 and is rejected.
+_LETTER_CODES = bytes(value - 65 if 65 <= value <= 90 else 255 for value in range(256))
+
+def _pack_letters(codes):
+    """Pack 5-bit codes, eight per five bytes."""
+    packed = bytearray()
+    for start in range(0, len(codes), 8):
+        group = 0
+        for shift, code in enumerate(codes[start:start + 8]):
+            group |= code << shift * LETTER_BITS
+        packed += group.to_bytes(5, "little")
+    return bytes(packed[:(len(codes) * LETTER_BITS + 7) // 8])
+
+def _unpack_letters(data, count):
+    """Unpack count 5-bit codes from packed bytes into upper-case letters."""
+    letters = bytearray()
+    for start in range(0, count, 8):
+        offset = start * LETTER_BITS // 8
+        group = int.from_bytes(data[offset:offset + 5], "little")
+        for _ in range(min(8, count - start)):
+            letters.append(65 + (group & 31))
+            group >>= LETTER_BITS
+    return letters.decode("ascii")
+
+class HangmanLog:
+    """Read-only, memory-mapped view of a hangman log."""
+
+    def __init__(self, path):
+        """Open and map a log file.
+
+        Args:
+            path (str): Path of a file written by HangmanLogWriter
+        """
+        self.path = path
+        self._map = _open_map(path)
+        magic, self.games, self.guesses = _HANGMAN_HEADER.unpack_from(self._map, 0)
+        if magic != HANGMAN_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a hangman log")
+        view = memoryview(self._map)
+        start = _HANGMAN_HEADER.size
+        # The columns, as views into the mapping; the little-endian word
+        # ids are copied and swapped on big-endian hosts.
+        self.word_ids = view[start:start + 4 * self.games]
+        if sys.byteorder == "big":
+            word_ids = array("I", self.word_ids.tobytes())
+            word_ids.byteswap()
+            self.word_ids.release()
+            self.word_ids = memoryview(word_ids)
+        else:
+            self.word_ids = self.word_ids.cast("I")
+        start += 4 * self.games
+        self.counts = view[start:start + self.games]
+        start += self.games
+        self.letters = view[start:]
+        self._starts = None
+
+    def __len__(self):
+        return self.games
+
+    def close(self):
+        """Release the views and unmap the file."""
+        for view in (self.word_ids, self.counts, self.letters):
+            view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _guesses_at(self, first, count):
+        # Unpack from the start of the 8-letter group holding the first guess.
+        group = first // 8
+        skip = first - group * 8
+        end = group * 5 + (skip + count + 7) // 8 * 5
+        return _unpack_letters(self.letters[group * 5:end], skip + count)[skip:]
+
+    def guesses_of(self, index):
+        """Get the letters guessed in a game, as an upper-case string."""
+        if self._starts is None:
+            self._starts = [0, *accumulate(self.counts)]
+        return self._guesses_at(self._starts[index], self.counts[index])
+
+    def replay(self, max_wrong_guesses=6):
+        """Replay every game.
+
+        One HangmanGame is reset for each game rather than creating one
+        per game.
+
+        Args:
+            max_wrong_guesses (int): Maximum number of wrong guesses allowed
+
+        Yields:
+            HangmanGame: The game after its guesses, reused for the next game
+        """
+        from hangman.hangman import HangmanGame
+        from hangman.words import get_word_by_id
+
+        game = None
+        position = 0
+        for word_id, count in zip(self.word_ids, self.counts):
+            word = get_word_by_id(word_id)
+            if game is None:
+                game = HangmanGame(max_wrong_guesses=max_wrong_guesses, word=word)
+            else:
+                game.reset_game(word=word)
+            for letter in self._guesses_at(position, count):
+                game.make_guess(letter)
+            position += count
+            yield game
+
+    def score(self, max_wrong_guesses=6):
+        """Count the games won and lost by replaying them.
+
+        Returns:
+            dict: Number of games won, lost and left unfinished
+        """
+        totals = {"won": 0, "lost": 0, "unfinished": 0}
+        for game in self.replay(max_wrong_guesses):
+            totals["won" if game.won else "lost" if game.game_over else "unfinished"] += 1
+        return totals
+
+def pack_rps_script(lines, path, rules=CLASSIC):
+    """Pack the JSON lines written by rock_paper_scissors.play_script into a log.
+
+    Returns:
+        int: Number of rounds written
+    """
+    import json
+
+    user = bytearray()
+    computer = bytearray()
+    for line in lines:
+        result = json.loads(line)
+        if "error" not in result:
+            user.append(rules.index[result["user"]])
+            computer.append(rules.index[result["computer"]])
+    write_rps_log(path, user, computer, rules)
+    return len(user)
+
+def main(argv=None):
+    """Pack and score game logs from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pack and score compact game logs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="pack JSON lines from rock_paper_scissors --script")
+    pack.add_argument("results")
+    pack.add_argument("log")
+    pack.add_argument("--rules", choices=sorted(RULE_SETS), default="classic")
+    score = commands.add_parser("score", help="count the results in a log")
+    score.add_argument("log")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        with open(args.results) as lines:
+            print(pack_rps_script(lines, args.log, RULE_SETS[args.rules]), "rounds")
+        return
+    with open(args.log, "rb") as f:
+        magic = f.read(4)
+    log = RpsLog(args.log) if magic == RPS_MAGIC else HangmanLog(args.log)
+    with log:
+        for outcome, count in log.score().items():
+            print(f"{outcome}: {count}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Counters and histograms for the games, exported in Prometheus text format.
+
+Metrics are off by default. The hooks in HangmanGame and the rock paper
+scissors loops only check ``game_metrics.registry``, which is None until
+enable() is called, so they cost next to nothing when disabled.
+
+To let a node exporter scrape the metrics, write them to a file in its
+textfile collector directory, either once with write_textfile or
+periodically with TextfileExporter.
+"""
+
+import os
+from bisect import bisect_left
+
+# Buckets of the built-in histograms
+GUESS_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 12, 15, 20, 26)
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+
+# Seconds between writes of a TextfileExporter
+EXPORT_INTERVAL = 15
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter, optionally split by the value of one label."""
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.values = {}
+
+    def inc(self, label_value=None, amount=1):
+        """Add to the counter for a label value."""
+        self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def render(self):
+        """Render the counter in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_value, value in sorted(self.values.items(), key=lambda item: str(item[0])):
+            labels = "" if self.label is None else f'{{{self.label}="{label_value}"}}'
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Histogram with fixed bucket upper bounds."""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus one for values above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """Count a value in its bucket."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        """Render the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(self.sum)}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+class GameMetrics:
+    """The metrics recorded by the games."""
+
+    def __init__(self):
+        self.make_guess_seconds = Histogram(
+            "hangman_make_guess_seconds", "Time spent in HangmanGame.make_guess.",
+            LATENCY_BUCKETS)
+        self.guesses_per_game = Histogram(
+            "hangman_guesses_per_game", "Letters guessed in finished hangman games.",
+            GUESS_BUCKETS)
+        self.hangman_games = Counter(
+            "hangman_games_total", "Finished hangman games by result.", "result")
+        self.hangman_game_seconds = Histogram(
+            "hangman_game_duration_seconds", "Time from the start to the end of hangman games.",
+            DURATION_BUCKETS)
+        self.rps_rounds = Counter(
+            "rps_rounds_total", "Rock paper scissors rounds by winner.", "winner")
+        self.rps_session_seconds = Histogram(
+            "rps_session_duration_seconds", "Length of rock paper scissors sessions.",
+            DURATION_BUCKETS)
+
+    def metrics(self):
+        """Get all the metrics."""
+        return [self.make_guess_seconds, self.guesses_per_game, self.hangman_games,
+                self.hangman_game_seconds, self.rps_rounds, self.rps_session_seconds]
+
+    def render(self):
+        """Render all the metrics in Prometheus text format."""
+        lines = []
+        for metric in self.metrics():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# The active metrics, or None while metrics are disabled
+registry = None
+
+def enable():
+    """Start recording metrics.
+
+    Returns:
+        GameMetrics: The active metrics
+    """
+    global registry
+    if registry is None:
+        registry = GameMetrics()
+    return registry
+
+def disable():
+    """Stop recording metrics and discard them."""
+    global registry
+    registry = None
+
+def write_textfile(path, metrics=None):
+    """Write metrics to a file in Prometheus text format.
+
+    The file is written next to its destination and moved into place, so
+    a scraper never reads a partially written file.
+
+    Args:
+        path (str): Destination, usually a .prom file in the node exporter's
+            textfile collector directory
+        metrics (GameMetrics): Metrics to write; the active ones if None
+    """
+    metrics = metrics or registry
+    if metrics is None:
+        return
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        f.write(metrics.render())
+    os.replace(tmp_path, path)
+
+class TextfileExporter:
+    """Background thread that periodically writes the active metrics to a file."""
+
+    def __init__(self, path, interval=EXPORT_INTERVAL):
+        import threading
+
+        self.path = path
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self):
+        """Start exporting."""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            write_textfile(self.path)
+
+    def stop(self):
+        """Stop exporting and write the metrics one last time."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        write_textfile(self.path)
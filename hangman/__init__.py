@@ -0,0 +1 @@
+"""Hangman game package."""
@@ -0,0 +1,5 @@
+"""Run hangman with ``python -m hangman``."""
+
+from .hangman import main
+
+main()
@@ -99,10 +99,4 @@ def display_word_progress(word, guessed_letters):
     Returns:
         str: Word with guessed letters shown and others as underscores
     """
-    display = ""
-    for letter in word:
-        if letter.upper() in guessed_letters:
-            display += letter + " "
-        else:
-            display += "_ "
-    return display.strip()
+    return " ".join(letter if letter.upper() in guessed_letters else "_" for letter in word)
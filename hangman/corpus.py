@@ -0,0 +1,167 @@
+"""Build word stores from large word corpora.
+
+A corpus is a text file with one or more words per line. Ingesting it
+streams the file line by line, normalizes and de-duplicates the words,
+scores their difficulty in parallel chunks and splits them into the
+easy, medium and hard tiers by score quantiles. The result is compiled
+into a word store (see hangman.words) kept in a cache directory under the
+SHA-256 of the corpus, so an unchanged corpus is only processed once.
+
+Usage:
+
+    python -m hangman.corpus words.txt
+    HANGMAN_WORD_STORE=$(python -m hangman.corpus words.txt) python -m hangman
+"""
+
+import hashlib
+import math
+import os
+
+from .words import DIFFICULTIES, _normalize_word, compile_word_store
+
+# Relative frequency of each letter in English text, in percent.
+LETTER_FREQUENCIES = {
+    "A": 8.2, "B": 1.5, "C": 2.8, "D": 4.3, "E": 12.7, "F": 2.2, "G": 2.0,
+    "H": 6.1, "I": 7.0, "J": 0.15, "K": 0.77, "L": 4.0, "M": 2.4, "N": 6.7,
+    "O": 7.5, "P": 1.9, "Q": 0.095, "R": 6.0, "S": 6.3, "T": 9.1, "U": 2.8,
+    "V": 0.98, "W": 2.4, "X": 0.15, "Y": 2.0, "Z": 0.074,
+}
+
+# Rarity of each letter in bits: rare letters are harder to think of.
+LETTER_RARITY = {letter: -math.log2(percent / 100) for letter, percent in LETTER_FREQUENCIES.items()}
+
+# Weights of the parts of a difficulty score. Fewer distinct letters and
+# shorter words give the player fewer chances of a hit.
+RARITY_WEIGHT = 1.0
+DISTINCT_WEIGHT = 8.0
+LENGTH_WEIGHT = 4.0
+
+# Words shorter than this are left out of the tiers.
+MIN_LENGTH = 3
+
+# Fractions of the words, from easiest to hardest, in each tier.
+TIER_QUANTILES = (1 / 3, 2 / 3)
+
+# Words scored per task sent to a worker process.
+CHUNK_SIZE = 50000
+
+# Bumped whenever scoring changes, so cached word stores are rebuilt.
+CACHE_VERSION = 1
+
+CACHE_ENV_VAR = "HANGMAN_CACHE_DIR"
+
+def score_word(word):
+    """Score how hard a word is to guess.
+
+    Args:
+        word (str): Normalized, upper-case word
+
+    Returns:
+        float: Difficulty score; higher is harder
+    """
+    letters = set(word)
+    rarity = sum(LETTER_RARITY[letter] for letter in letters) / len(letters)
+    return (RARITY_WEIGHT * rarity + DISTINCT_WEIGHT / len(letters)
+            + LENGTH_WEIGHT / len(word))
+
+def _score_chunk(words):
+    """Score one chunk of words in a worker."""
+    return [score_word(word) for word in words]
+
+def iter_corpus(lines):
+    """Normalize the words of a corpus, skipping duplicates and unusable words.
+
+    Args:
+        lines (iterable): Lines of the corpus, each with any number of
+            whitespace-separated words
+
+    Yields:
+        str: Each usable word once, upper-case, in corpus order
+    """
+    seen = set()
+    for line in lines:
+        for word in line.split():
+            word = _normalize_word(word)
+            if len(word) >= MIN_LENGTH and word not in seen:
+                seen.add(word)
+                yield word
+
+def corpus_digest(path):
+    """Get the SHA-256 hex digest of a corpus file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def classify(words, workers=None):
+    """Split words into difficulty tiers by score.
+
+    Args:
+        words (list): Normalized, unique words
+        workers (int): Worker processes to score with; 1 scores in this
+            process, None uses one per CPU
+
+    Returns:
+        dict: Mapping of difficulty ('easy', 'medium', 'hard') to its words
+    """
+    chunks = [words[start:start + CHUNK_SIZE] for start in range(0, len(words), CHUNK_SIZE)]
+    if workers == 1 or len(chunks) <= 1:
+        results = map(_score_chunk, chunks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_score_chunk, chunks))
+    scores = [score for chunk in results for score in chunk]
+
+    # Rank by score, breaking ties by word so tiers do not depend on corpus order.
+    ranked = sorted(range(len(words)), key=lambda index: (scores[index], words[index]))
+    bounds = [0] + [round(quantile * len(ranked)) for quantile in TIER_QUANTILES] + [len(ranked)]
+    return {
+        difficulty: [words[index] for index in ranked[bounds[tier]:bounds[tier + 1]]]
+        for tier, difficulty in enumerate(DIFFICULTIES)
+    }
+
+def default_cache_dir():
+    """Get the directory word stores built from corpora are cached in."""
+    cache_dir = os.environ.get(CACHE_ENV_VAR)
+    if cache_dir:
+        return cache_dir
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "hangman")
+
+def ingest_corpus(path, cache_dir=None, workers=None):
+    """Build a word store from a corpus, or reuse the cached one.
+
+    Args:
+        path (str): Corpus file, UTF-8 text with whitespace-separated words
+        cache_dir (str): Directory to cache word stores in; see default_cache_dir
+        workers (int): Worker processes to score with; see classify
+
+    Returns:
+        str: Path of the word store, ready for hangman.words.use_word_store
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    store_path = os.path.join(cache_dir, f"{corpus_digest(path)}-v{CACHE_VERSION}.hws")
+    if os.path.exists(store_path):
+        return store_path
+
+    with open(path, encoding="utf-8", errors="replace") as lines:
+        words = list(iter_corpus(lines))
+    os.makedirs(cache_dir, exist_ok=True)
+    compile_word_store(store_path, classify(words, workers))
+    return store_path
+
+def main(argv=None):
+    """Ingest a corpus from the command line and print the word store path."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build a hangman word store from a word corpus.")
+    parser.add_argument("corpus")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    print(ingest_corpus(args.corpus, args.cache_dir, args.workers))
+
+if __name__ == "__main__":
+    main()
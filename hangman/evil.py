@@ -0,0 +1,194 @@
+"""Evil hangman, where the game never commits to a word until it has to.
+
+An EvilHangmanGame keeps every dictionary word of the chosen length that
+is consistent with the guesses so far. Each guess splits these candidates
+into families by the positions the guessed letter would reveal, and the
+game keeps the largest family, so the player only hits a letter when
+missing it would leave fewer words.
+
+The candidates are held as one bytes object of upper-case words, each
+padded with zero bytes to a multiple of 8 bytes. Partitioning them for a
+guess is a few passes over that buffer in C rather than a Python loop per
+word:
+
+* one ``bytes.translate`` turns the guessed letter into 1 and every other
+  byte into 0, so each word becomes its pattern;
+* casting the patterns to unsigned 64-bit integers gives the integer key
+  of every word of up to 8 letters at once, and a Counter groups the keys
+  in one pass;
+* ``itertools.compress`` keeps the words of the chosen family.
+"""
+
+import struct
+import sys
+from array import array
+from collections import Counter
+from itertools import compress
+from operator import itemgetter
+
+from .hangman import HangmanGame, get_random_word
+from .words import get_word_block
+
+def _pattern_table(letter):
+    """Build a translation table mapping a letter to 1 and all else to 0."""
+    table = bytearray(256)
+    table[ord(letter)] = 1
+    return bytes(table)
+
+# Translation tables by guessed letter, see _pattern_table
+_PATTERN_TABLES = {chr(ord("A") + i): _pattern_table(chr(ord("A") + i)) for i in range(26)}
+
+def pack_words(block, length):
+    """Pad fixed-width words to a multiple of 8 bytes each.
+    
+    Args:
+        block (bytes): Words of ``length`` bytes, back to back
+        length (int): Length of the words
+        
+    Returns:
+        tuple: The padded words and the width each now takes
+    """
+    stride = -(-length // 8) * 8
+    packed = bytearray(len(block) // length * stride)
+    for position in range(length):
+        packed[position::stride] = block[position::length]
+    return bytes(packed), stride
+
+def partition(candidates, stride, letter):
+    """Group padded words by where a letter occurs in them.
+    
+    Args:
+        candidates (bytes): Upper-case words padded by pack_words
+        stride (int): Width of each padded word
+        letter (str): Upper-case letter
+        
+    Returns:
+        tuple: Counter of pattern key to family size, and the key of each
+            word in order. A key is the word's pattern, with a byte set to
+            1 for each position of the letter, read as a native-order
+            integer; 0 means the word does not contain the letter.
+    """
+    table = _PATTERN_TABLES.get(letter)
+    if table is None or letter.encode("ascii") not in candidates:
+        keys = [0] * (len(candidates) // stride)
+        return Counter({0: len(keys)} if keys else {}), keys
+    patterns = candidates.translate(table)
+    if stride == 8:
+        keys = memoryview(patterns).cast("Q").tolist()
+    else:
+        unpack = struct.Struct(f"{stride}s").iter_unpack
+        keys = [int.from_bytes(pattern, sys.byteorder)
+                for pattern in map(itemgetter(0), unpack(patterns))]
+    return Counter(keys), keys
+
+def choose_family(families, stride=8):
+    """Pick the family the game keeps.
+    
+    The largest family wins. Ties go to a miss, then to the family that
+    reveals the fewest positions, then to the one revealing the earliest
+    position.
+    
+    Args:
+        families (Counter): Pattern key to family size, from partition
+        stride (int): Width of each padded word
+        
+    Returns:
+        int: Key of the chosen family
+    """
+    return max(families, key=lambda key: (families[key], key == 0, -bin(key).count("1"),
+                                          key.to_bytes(stride, sys.byteorder)))
+
+def select(candidates, stride, selectors):
+    """Keep the padded words whose selector is true.
+    
+    Args:
+        candidates (bytes): Upper-case words padded by pack_words
+        stride (int): Width of each padded word
+        selectors (iterable): One truth value per word
+        
+    Returns:
+        bytes: The kept words, still padded
+    """
+    if stride == 8:
+        return array("Q", compress(memoryview(candidates).cast("Q"), selectors)).tobytes()
+    words = map(itemgetter(0), struct.Struct(f"{stride}s").iter_unpack(candidates))
+    return b"".join(compress(words, selectors))
+
+class EvilHangmanGame(HangmanGame):
+    """Hangman game that picks the word as late and as unhelpfully as it can."""
+    
+    __slots__ = ("_words", "_length", "_candidates", "_stride")
+    
+    def __init__(self, difficulty="medium", max_wrong_guesses=6, word=None, words=None):
+        """Initialize a new evil hangman game.
+        
+        Args:
+            difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random')
+            max_wrong_guesses (int): Maximum number of wrong guesses allowed
+            word (str): Word whose length is played; picked at random for
+                the difficulty if None
+            words (iterable): Candidate words; defaults to the dictionary
+                words of the difficulty
+        """
+        self._words = words
+        super().__init__(difficulty, max_wrong_guesses, self._load_candidates(difficulty, word))
+    
+    def _load_candidates(self, difficulty, word):
+        """Collect the candidate words of the played length.
+        
+        Returns:
+            str: The word to start from
+        """
+        if word is None:
+            word = get_random_word(difficulty)
+        word = word.upper()
+        length = len(word)
+        if self._words is None:
+            candidates = get_word_block(length, difficulty)
+        else:
+            candidates = "".join(candidate.upper() for candidate in self._words
+                                 if len(candidate) == length).encode("ascii", "replace")
+        self._length = length
+        self._candidates, self._stride = pack_words(
+            candidates or word.encode("ascii", "replace"), length)
+        return word
+    
+    @property
+    def candidate_count(self):
+        """int: Number of words still consistent with the guesses."""
+        return len(self._candidates) // self._stride
+    
+    def candidates(self):
+        """Get the words still consistent with the guesses.
+        
+        Returns:
+            list: The candidate words in upper case
+        """
+        data = self._candidates
+        return [data[start:start + self._length].decode("ascii")
+                for start in range(0, len(data), self._stride)]
+    
+    def _make_guess(self, guess):
+        """Keep the largest family of candidates, then score the guess against it."""
+        letter = guess.upper()
+        if self.is_valid_guess(letter) and not self.game_over:
+            families, keys = partition(self._candidates, self._stride, letter)
+            best = choose_family(families, self._stride)
+            if families[best] != len(keys):
+                self._candidates = select(self._candidates, self._stride, map(best.__eq__, keys))
+            # Every word of the family matches the revealed letters so far, so
+            # switching to one of them keeps the progress shown to the player.
+            word = self._candidates[:self._length].decode("ascii")
+            if word != self.word:
+                self._index_word(word)
+                self._changed("word")
+        return super()._make_guess(guess)
+    
+    def reset_game(self, difficulty="medium", word=None):
+        """Reset the game with a new word length and a fresh set of candidates.
+        
+        Args:
+            difficulty (str): Difficulty level for the new candidates
+            word (str): Word whose length is played; picked at random if None
+        """
+        self._set_word(self._load_candidates(difficulty, word))
@@ -1,25 +1,360 @@
 """Main hangman game logic."""
 
-import re
-from .words import get_random_word
-from .ascii_art import get_hangman_art, display_word_progress
+import time
+from collections.abc import Mapping, MutableSet
+from enum import Enum
+import game_metrics
+
+# Bit for each letter in the 26-bit letter masks used by HangmanGame.
+LETTER_BITS = {chr(ord("A") + i): 1 << i for i in range(26)}
+
+# hangman.words and hangman.ascii_art, imported on first use to keep
+# starting the game cheap.
+_words = None
+_ascii_art = None
+
+def get_random_word(difficulty="random", rng=None):
+    """Get a random word for the given difficulty, loading the word lists on first use.
+    
+    Args:
+        difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random')
+        rng: Random number generator to draw with; defaults to
+            random_source.default_source()
+        
+    Returns:
+        str: A random word in upper case
+    """
+    global _words
+    if _words is None:
+        from . import words as _words
+    return _words.get_random_word(difficulty, rng)
+
+def get_hangman_art(wrong_guesses):
+    """Get the ASCII art for a number of wrong guesses, loading it on first use."""
+    global _ascii_art
+    if _ascii_art is None:
+        from . import ascii_art as _ascii_art
+    return _ascii_art.get_hangman_art(wrong_guesses)
+
+def letter_bit(letter):
+    """Get the mask bit for an upper-case letter.
+    
+    Args:
+        letter (str): Upper-case letter
+        
+    Returns:
+        int: A single-bit mask; letters outside A-Z map above bit 25
+    """
+    return LETTER_BITS.get(letter) or 1 << (26 + ord(letter))
+
+# Letters of each value of the A-M and N-Z halves of a letter mask, filled
+# in on first use.
+_half_letters = ({}, {})
+
+def _letters_of(mask):
+    letters = []
+    while mask:
+        lowest = mask & -mask
+        index = lowest.bit_length() - 1
+        letters.append(chr(ord("A") + index) if index < 26 else chr(index - 26))
+        mask ^= lowest
+    return letters
+
+def mask_letters(mask):
+    """Get the letters in a letter mask, the inverse of letter_bit.
+    
+    Args:
+        mask (int): Letter mask, such as HangmanGame.guessed_mask
+        
+    Returns:
+        list: The letters, in sorted order
+    """
+    letters = []
+    for half, shift in zip(_half_letters, (0, 13)):
+        bits = mask >> shift & 0x1FFF
+        run = half.get(bits)
+        if run is None:
+            run = half[bits] = _letters_of(bits << shift)
+        letters += run
+    if mask >> 26:
+        letters += _letters_of(mask >> 26 << 26)
+    return letters
+
+# Fields of the dict returned by HangmanGame.get_game_state.
+STATE_FIELDS = ("word_progress", "hangman_art", "guessed_letters", "wrong_guesses",
+                "max_wrong_guesses", "game_over", "won", "word")
+
+# Position of each field in HangmanGame._field_versions.
+_FIELD_INDEX = {field: index for index, field in enumerate(STATE_FIELDS)}
+
+# Most words whose letter masks _index_letters keeps; past this, the
+# masks of new words are computed for each game.
+WORD_INDEX_LIMIT = 65536
+
+# Letter mask and letter positions of each word, shared by the games
+# playing it.
+_word_indexes = {}
+
+def _index_letters(word):
+    """Get the letter mask of a word and a bitmask of the positions of each letter."""
+    index = _word_indexes.get(word)
+    if index is None:
+        # word_mask has a bit per distinct letter in the word and positions
+        # maps each letter bit to a bitmask of the positions it occupies.
+        word_mask = 0
+        positions = {}
+        for position, letter in enumerate(word.upper()):
+            bit = letter_bit(letter)
+            word_mask |= bit
+            positions[bit] = positions.get(bit, 0) | 1 << position
+        index = (word_mask, positions)
+        if len(_word_indexes) < WORD_INDEX_LIMIT:
+            _word_indexes[word] = index
+    return index
+
+class GuessedLetters(MutableSet):
+    """Set of the letters guessed in a game, read from its guessed_mask.
+    
+    Adding or discarding a letter changes the game's guesses and word
+    progress, without counting it as a right or wrong guess.
+    """
+    
+    __slots__ = ("_game",)
+    
+    def __init__(self, game):
+        self._game = game
+    
+    @classmethod
+    def _from_iterable(cls, letters):
+        # Results of set operations are plain sets, not views.
+        return set(letters)
+    
+    def __contains__(self, letter):
+        return (isinstance(letter, str) and len(letter) == 1
+                and bool(letter_bit(letter) & self._game._guessed_mask))
+    
+    def __iter__(self):
+        return iter(mask_letters(self._game._guessed_mask))
+    
+    def __len__(self):
+        return bin(self._game._guessed_mask).count("1")
+    
+    def __repr__(self):
+        return repr(set(self))
+    
+    def add(self, letter):
+        self._game._set_guessed(letter, True)
+    
+    def discard(self, letter):
+        self._game._set_guessed(letter, False)
+
+class GuessStatus(str, Enum):
+    """Outcome of a guess; compares equal to its lower-case name."""
+    
+    INVALID = "invalid"
+    DUPLICATE = "duplicate"
+    CORRECT = "correct"
+    WRONG = "wrong"
+    WIN = "win"
+    LOSE = "lose"
+    
+    def __str__(self):
+        return self.value
+
+# Statuses of guesses that were not counted against the game.
+REJECTED = frozenset((GuessStatus.INVALID, GuessStatus.DUPLICATE))
+
+# Message of each status, formatted with the arguments of its GuessResult.
+MESSAGES = {
+    GuessStatus.INVALID: "Please enter a single letter.",
+    GuessStatus.DUPLICATE: "You already guessed '{}'.",
+    GuessStatus.CORRECT: "Good guess! '{}' is in the word.",
+    GuessStatus.WRONG: "'{}' is not in the word. {} guesses left.",
+    GuessStatus.WIN: "Correct! You won! The word was '{}'.",
+    GuessStatus.LOSE: "Game over! The word was '{}'.",
+}
+
+class GuessResult(Mapping):
+    """Result of a guess, read-only and shared between guesses with the same outcome.
+    
+    The message is only formatted when it is read. As a mapping, a result
+    has the "status" and "message" keys of the dicts make_guess used to
+    return; as_dict builds such a dict.
+    """
+    
+    __slots__ = ("status", "_args", "_message")
+    
+    def __init__(self, status, *args):
+        """Create a result.
+        
+        Args:
+            status (GuessStatus): Outcome of the guess
+            *args: Values formatted into the message of the status
+        """
+        self.status = status
+        self._args = args
+        self._message = None
+    
+    @property
+    def message(self):
+        """str: Message about the guess for the player."""
+        if self._message is None:
+            self._message = MESSAGES[self.status].format(*self._args)
+        return self._message
+    
+    def __getitem__(self, key):
+        if key == "status":
+            return self.status
+        if key == "message":
+            return self.message
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(("status", "message"))
+    
+    def __len__(self):
+        return 2
+    
+    def __repr__(self):
+        return f"GuessResult({self.status.value!r}, {self.message!r})"
+    
+    def as_dict(self):
+        """Get the result as a plain dict with a string status, such as for JSON."""
+        return {"status": self.status.value, "message": self.message}
+
+# Most results shared per status; past this, new results are not shared.
+SHARED_RESULTS_LIMIT = 4096
+
+# Shared results by status, keyed by the guess (and the guesses left for
+# wrong guesses). Wins and losses name the word, so they are not shared.
+_INVALID = GuessResult(GuessStatus.INVALID)
+_duplicate_results = {}
+_correct_results = {}
+_wrong_results = {}
+
+def _share(results, key, result):
+    """Keep a result for reuse, unless its status already shares too many."""
+    if len(results) < SHARED_RESULTS_LIMIT:
+        results[key] = result
+    return result
 
 class HangmanGame:
-    """Hangman game class that manages game state and logic."""
+    """Hangman game class that manages game state and logic.
+    
+    Games are slotted and keep their progress in letter masks rather than
+    sets and lists, as a server may hold a great many of them.
+    """
     
-    def __init__(self, difficulty="medium", max_wrong_guesses=6):
+    __slots__ = ("max_wrong_guesses", "word", "wrong_guesses", "game_over", "won",
+                 "_version", "_word_mask", "_positions", "_guessed_mask", "_revealed", "_art",
+                 "_field_versions", "_snapshot", "_started")
+    
+    def __init__(self, difficulty="medium", max_wrong_guesses=6, word=None):
         """Initialize a new hangman game.
         
         Args:
             difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random')
             max_wrong_guesses (int): Maximum number of wrong guesses allowed
+            word (str): Word to guess; picked at random for the difficulty if None
         """
-        self.word = get_random_word(difficulty)
         self.max_wrong_guesses = max_wrong_guesses
-        self.guessed_letters = set()
+        self._version = 0
+        self._set_word(word if word is not None else get_random_word(difficulty))
+    
+    def _set_word(self, word):
+        """Start guessing a new word and precompute its letter masks.
+        
+        Args:
+            word (str): The word to guess
+        """
+        self._index_word(word)
         self.wrong_guesses = 0
         self.game_over = False
         self.won = False
+        self._guessed_mask = 0
+        
+        # Render pieces kept up to date by make_guess, and the version of the
+        # state at which each field of get_game_state last changed, by
+        # position in STATE_FIELDS.
+        self._revealed = ["_"] * len(word)
+        self._art = get_hangman_art(0)
+        self._version += 1
+        self._field_versions = [self._version] * len(STATE_FIELDS)
+        self._snapshot = None
+        self._started = time.monotonic() if game_metrics.registry is not None else None
+    
+    def _index_word(self, word):
+        """Set the word and its letter masks, leaving the guesses alone.
+        
+        Args:
+            word (str): The word to guess
+        """
+        self.word = word
+        self._word_mask, self._positions = _index_letters(word)
+    
+    def _reveal(self, positions, shown=True):
+        """Show or hide the letters of the word at a bitmask of positions."""
+        revealed = self._revealed
+        word = self.word
+        while positions:
+            lowest = positions & -positions
+            index = lowest.bit_length() - 1
+            revealed[index] = word[index] if shown else "_"
+            positions ^= lowest
+    
+    def _set_guessed(self, letter, guessed):
+        """Add or remove a guessed letter without scoring it; see GuessedLetters."""
+        bit = letter_bit(letter)
+        if bool(self._guessed_mask & bit) == guessed:
+            return
+        self._guessed_mask ^= bit
+        if bit & self._word_mask:
+            self._reveal(self._positions[bit], guessed)
+            self._changed("guessed_letters", "word_progress")
+        else:
+            self._changed("guessed_letters")
+    
+    @property
+    def guessed_letters(self):
+        """GuessedLetters: Set view of the guessed letters, in upper case."""
+        return GuessedLetters(self)
+    
+    @property
+    def guessed_mask(self):
+        """int: Bitmask of the guessed letters, bit 0 for 'A' to bit 25 for 'Z'."""
+        return self._guessed_mask
+    
+    def restore(self, guessed_mask, wrong_guesses, game_over, won):
+        """Restore saved progress on the current word.
+        
+        Args:
+            guessed_mask (int): Bitmask of the guessed letters (see guessed_mask)
+            wrong_guesses (int): Number of wrong guesses made
+            game_over (bool): Whether the game had ended
+            won (bool): Whether the game was won
+        """
+        # Replayed without the metrics hooks, as these guesses were counted
+        # when they were first made.
+        for index, letter in enumerate(LETTER_BITS):
+            if guessed_mask >> index & 1:
+                self._make_guess(letter)
+        self.wrong_guesses = wrong_guesses
+        self.game_over = game_over
+        self.won = won
+        self._art = get_hangman_art(wrong_guesses)
+        self._changed(*STATE_FIELDS)
+    
+    @property
+    def state_version(self):
+        """int: Version of the game state, increased on every change."""
+        return self._version
+    
+    def _changed(self, *fields):
+        """Record that state fields changed and drop the cached snapshot."""
+        self._version += 1
+        for field in fields:
+            self._field_versions[_FIELD_INDEX[field]] = self._version
+        self._snapshot = None
     
     def is_valid_guess(self, guess):
         """Check if a guess is valid (single letter, alphabetic).
@@ -30,9 +365,12 @@ class HangmanGame:
         Returns:
             bool: True if guess is valid, False otherwise
         """
+        letter = guess.upper()
+        # Some letters, such as "ß", upper-case to more than one character
+        # and cannot have been guessed.
         return (len(guess) == 1 and 
                 guess.isalpha() and 
-                guess.upper() not in self.guessed_letters)
+                (len(letter) != 1 or not letter_bit(letter) & self._guessed_mask))
     
     def make_guess(self, guess):
         """Make a guess and update game state.
@@ -41,106 +379,329 @@ class HangmanGame:
             guess (str): The guessed character
             
         Returns:
-            dict: Result of the guess with status and message
+            GuessResult: Result of the guess with status and message
         """
+        metrics = game_metrics.registry
+        if metrics is None:
+            return self._make_guess(guess)
+        
+        start = time.perf_counter()
+        result = self._make_guess(guess)
+        metrics.make_guess_seconds.observe(time.perf_counter() - start)
+        if result.status is GuessStatus.WIN or result.status is GuessStatus.LOSE:
+            metrics.hangman_games.inc(result.status.value)
+            metrics.guesses_per_game.observe(bin(self._guessed_mask).count("1"))
+            if self._started is not None:
+                metrics.hangman_game_seconds.observe(time.monotonic() - self._started)
+        return result
+    
+    def _make_guess(self, guess):
+        """Make a guess without recording metrics; see make_guess."""
         guess = guess.upper()
         
         if not self.is_valid_guess(guess):
             if len(guess) != 1 or not guess.isalpha():
-                return {"status": "invalid", "message": "Please enter a single letter."}
+                return _INVALID
             else:
-                return {"status": "duplicate", "message": f"You already guessed '{guess}'."}
+                return (_duplicate_results.get(guess)
+                        or _share(_duplicate_results, guess, GuessResult(GuessStatus.DUPLICATE, guess)))
         
-        self.guessed_letters.add(guess)
+        bit = letter_bit(guess)
+        self._guessed_mask |= bit
         
-        if guess in self.word.upper():
+        if bit & self._word_mask:
+            # Reveal each position of the guessed letter
+            self._reveal(self._positions[bit])
+            
             # Check if word is complete
-            if all(letter.upper() in self.guessed_letters for letter in self.word):
+            if self._guessed_mask & self._word_mask == self._word_mask:
                 self.game_over = True
                 self.won = True
-                return {"status": "win", "message": f"Correct! You won! The word was '{self.word}'."}
+                self._changed("guessed_letters", "word_progress", "game_over", "won")
+                return GuessResult(GuessStatus.WIN, self.word)
             else:
-                return {"status": "correct", "message": f"Good guess! '{guess}' is in the word."}
+                self._changed("guessed_letters", "word_progress")
+                return (_correct_results.get(guess)
+                        or _share(_correct_results, guess, GuessResult(GuessStatus.CORRECT, guess)))
         else:
             self.wrong_guesses += 1
+            art = get_hangman_art(self.wrong_guesses)
+            art_changed = ("hangman_art",) if art is not self._art else ()
+            self._art = art
             if self.wrong_guesses >= self.max_wrong_guesses:
                 self.game_over = True
                 self.won = False
-                return {"status": "lose", "message": f"Game over! The word was '{self.word}'."}
+                self._changed("guessed_letters", "wrong_guesses", "game_over", "won", *art_changed)
+                return GuessResult(GuessStatus.LOSE, self.word)
             else:
-                remaining = self.max_wrong_guesses - self.wrong_guesses
-                return {"status": "wrong", "message": f"'{guess}' is not in the word. {remaining} guesses left."}
+                self._changed("guessed_letters", "wrong_guesses", *art_changed)
+                key = (guess, self.max_wrong_guesses - self.wrong_guesses)
+                return (_wrong_results.get(key)
+                        or _share(_wrong_results, key, GuessResult(GuessStatus.WRONG, *key)))
     
     def get_game_state(self):
         """Get current game state for display.
         
+        The state is built from render pieces that make_guess keeps up to
+        date, and the same snapshot is returned until the state changes, so
+        callers must treat it as read-only.
+        
         Returns:
             dict: Current game state information
         """
-        return {
-            "word_progress": display_word_progress(self.word, self.guessed_letters),
-            "hangman_art": get_hangman_art(self.wrong_guesses),
-            "guessed_letters": sorted(list(self.guessed_letters)),
-            "wrong_guesses": self.wrong_guesses,
-            "max_wrong_guesses": self.max_wrong_guesses,
-            "game_over": self.game_over,
-            "won": self.won,
-            "word": self.word
-        }
-    
-    def reset_game(self, difficulty="medium"):
+        if self._snapshot is None:
+            self._snapshot = {
+                "word_progress": " ".join(self._revealed),
+                "hangman_art": self._art,
+                "guessed_letters": mask_letters(self._guessed_mask),
+                "wrong_guesses": self.wrong_guesses,
+                "max_wrong_guesses": self.max_wrong_guesses,
+                "game_over": self.game_over,
+                "won": self.won,
+                "word": self.word
+            }
+        return self._snapshot
+    
+    def get_state_delta(self, since_version=0):
+        """Get the game state fields that changed after a given version.
+        
+        Args:
+            since_version (int): A state_version previously seen by the caller
+            
+        Returns:
+            dict: Changed fields of get_game_state plus the current "version"
+        """
+        state = self.get_game_state()
+        delta = {field: state[field] for field, version in zip(STATE_FIELDS, self._field_versions)
+                 if version > since_version}
+        delta["version"] = self._version
+        return delta
+    
+    def reset_game(self, difficulty="medium", word=None):
         """Reset the game with a new word.
         
         Args:
             difficulty (str): Difficulty level for new word
+            word (str): New word to guess; picked at random for the difficulty if None
         """
-        self.word = get_random_word(difficulty)
-        self.guessed_letters = set()
-        self.wrong_guesses = 0
-        self.game_over = False
-        self.won = False
+        self._set_word(word if word is not None else get_random_word(difficulty))
 
-def play_hangman():
-    """Play a console-based hangman game."""
+class GamePool:
+    """Finished games kept for reuse, so new games do not allocate."""
+    
+    def __init__(self, max_size=1024, game_class=HangmanGame):
+        """Create an empty pool.
+        
+        Args:
+            max_size (int): Most released games to keep; others are dropped
+            game_class (type): Class of the games created when the pool is empty
+        """
+        self.max_size = max_size
+        self.game_class = game_class
+        self._free = []
+    
+    def __len__(self):
+        return len(self._free)
+    
+    def acquire(self, difficulty="medium", max_wrong_guesses=6, word=None):
+        """Start a game, reusing a released one if there is any.
+        
+        Args:
+            difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random')
+            max_wrong_guesses (int): Maximum number of wrong guesses allowed
+            word (str): Word to guess; picked at random for the difficulty if None
+            
+        Returns:
+            HangmanGame: A game on a new word
+        """
+        if not self._free:
+            return self.game_class(difficulty, max_wrong_guesses, word)
+        game = self._free.pop()
+        game.max_wrong_guesses = max_wrong_guesses
+        game.reset_game(difficulty, word)
+        return game
+    
+    def release(self, game):
+        """Return a game that is no longer used by anyone to the pool."""
+        if len(self._free) < self.max_size:
+            game._snapshot = None
+            self._free.append(game)
+
+def public_state(game):
+    """Get the state of a game as sent to other players, hiding the word until the end."""
+    state = game.get_game_state()
+    if game.game_over:
+        return state
+    return {field: value for field, value in state.items() if field != "word"}
+
+def format_game_frame(state, message=""):
+    """Build the lines shown for a game state on each turn.
+    
+    Args:
+        state (dict): State from HangmanGame.get_game_state
+        message (str): Message about the last guess
+        
+    Returns:
+        list: Lines of the frame
+    """
+    guessed = ', '.join(state['guessed_letters']) if state['guessed_letters'] else 'None'
+    lines = [
+        state["hangman_art"],
+        f"Word: {state['word_progress']}",
+        f"Guessed letters: {guessed}",
+        f"Wrong guesses: {state['wrong_guesses']}/{state['max_wrong_guesses']}",
+        "",
+        message,
+    ]
+    if state["game_over"]:
+        lines.append(f"Final word: {state['word']}")
+    return lines
+
+def play_hangman(leaderboard=None, player=None, evil=False):
+    """Play a console-based hangman game.
+    
+    Args:
+        leaderboard (Leaderboard): Leaderboard to record finished games on
+        player (str): Name to record games under
+        evil (bool): Play evil hangman, which avoids committing to a word
+    """
+    from frame_renderer import FrameRenderer
+    game_class = HangmanGame
+    if evil:
+        from .evil import EvilHangmanGame as game_class
+    
     print("Welcome to Hangman!")
     print("Guess the word one letter at a time.")
     print("You have 6 wrong guesses before you lose.\n")
     
+    renderer = FrameRenderer()
     while True:
         # Get difficulty
         difficulty = input("Choose difficulty (easy/medium/hard/random): ").strip().lower()
         if difficulty not in ["easy", "medium", "hard", "random"]:
             difficulty = "medium"
         
-        game = HangmanGame(difficulty)
+        game = game_class(difficulty)
+        message = ""
+        renderer.reset()
         
         while not game.game_over:
-            state = game.get_game_state()
-            
-            # Display game state
-            print(state["hangman_art"])
-            print(f"Word: {state['word_progress']}")
-            print(f"Guessed letters: {', '.join(state['guessed_letters']) if state['guessed_letters'] else 'None'}")
-            print(f"Wrong guesses: {state['wrong_guesses']}/{state['max_wrong_guesses']}\n")
-            
-            # Get guess
-            guess = input("Enter your guess: ").strip()
-            result = game.make_guess(guess)
-            
-            print(f"\n{result['message']}\n")
-            
-            if result["status"] in ["win", "lose"]:
-                state = game.get_game_state()
-                print(state["hangman_art"])
-                print(f"Final word: {state['word']}\n")
+            # Display game state, then get a guess
+            renderer.render(format_game_frame(game.get_game_state(), message))
+            guess = renderer.input("Enter your guess: ").strip()
+            message = game.make_guess(guess).message
+        renderer.render(format_game_frame(game.get_game_state(), message))
+        if leaderboard is not None:
+            leaderboard.record_hangman(player, game.won, game.wrong_guesses)
         
         # Ask to play again
-        play_again = input("Do you want to play again? (y/n): ").strip().lower()
+        play_again = renderer.input("Do you want to play again? (y/n): ").strip().lower()
         if play_again != 'y' and play_again != 'yes':
             break
         print("\n" + "="*50 + "\n")
     
     print("Thanks for playing Hangman!")
 
+def iter_guesses(lines, max_wrong_guesses=6, rng=None):
+    """Play scripted hangman games without prompting or printing.
+    
+    Each line is either a command or a guess:
+    
+        new [difficulty]    start a game with a random word
+        word WORD           start a game with the given word
+        <letter>            guess a letter
+    
+    A guess with no game in progress first starts a medium game.
+    
+    Args:
+        lines (iterable): Script lines; blank lines are skipped
+        max_wrong_guesses (int): Maximum number of wrong guesses per game
+        rng: Random number generator for picking words
+        
+    Yields:
+        dict: One result per guess, with the game number, the guess, its
+            status, the word progress and wrong guesses, and the word once
+            the game is over
+    """
+    from random_source import default_source
+    
+    rng = rng or default_source()
+    game = None
+    games = 0
+    for line in lines:
+        command, _, argument = line.strip().partition(" ")
+        if not command:
+            continue
+        if command in ("new", "word"):
+            argument = argument.strip()
+            if command == "new":
+                word = get_random_word(argument or "medium", rng)
+            else:
+                word = argument.upper()
+            game = HangmanGame(max_wrong_guesses=max_wrong_guesses, word=word)
+            games += 1
+            continue
+        if game is None or game.game_over:
+            game = HangmanGame(max_wrong_guesses=max_wrong_guesses,
+                               word=get_random_word("medium", rng))
+            games += 1
+        
+        status = game.make_guess(command).status.value
+        state = game.get_game_state()
+        result = {"game": games, "guess": command, "status": status,
+                  "word_progress": state["word_progress"], "wrong_guesses": state["wrong_guesses"]}
+        if game.game_over:
+            result["word"] = game.word
+        yield result
+
+def play_script(lines, output, max_wrong_guesses=6, rng=None):
+    """Play scripted hangman games and write each result to output as a JSON line."""
+    import json
+    
+    encode = json.JSONEncoder().encode
+    write = output.write
+    for result in iter_guesses(lines, max_wrong_guesses, rng):
+        write(encode(result) + "\n")
+
+def main(argv=None):
+    """Play from the command line."""
+    import argparse
+    import sys
+    from random_source import RandomSource
+    
+    parser = argparse.ArgumentParser(description="Play hangman.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="read guesses from FILE ('-' for stdin) and write results as JSON lines")
+    parser.add_argument("--seed", type=int, help="seed the word choice of scripted games")
+    parser.add_argument("--max-wrong-guesses", type=int, default=6)
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="periodically write Prometheus metrics to FILE")
+    parser.add_argument("--leaderboard", metavar="DB",
+                        help="record finished games in the SQLite leaderboard DB")
+    parser.add_argument("--player", help="name to record games under")
+    parser.add_argument("--evil", action="store_true",
+                        help="play evil hangman, where the word changes to dodge your guesses")
+    args = parser.parse_args(argv)
+    
+    exporter = None
+    if args.metrics_file:
+        game_metrics.enable()
+        exporter = game_metrics.TextfileExporter(args.metrics_file).start()
+    try:
+        if args.script is None and args.leaderboard:
+            from leaderboard import Leaderboard, default_player
+            with Leaderboard(args.leaderboard) as board:
+                play_hangman(board, args.player or default_player(), args.evil)
+        elif args.script is None:
+            play_hangman(evil=args.evil)
+        elif args.script == "-":
+            play_script(sys.stdin, sys.stdout, args.max_wrong_guesses, RandomSource(args.seed))
+        else:
+            with open(args.script) as lines:
+                play_script(lines, sys.stdout, args.max_wrong_guesses, RandomSource(args.seed))
+    finally:
+        if exporter is not None:
+            exporter.stop()
+
 if __name__ == "__main__":
-    play_hangman()
+    main()
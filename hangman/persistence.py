@@ -0,0 +1,281 @@
+"""Binary snapshots and an append-only journal for hangman sessions.
+
+A snapshot holds one fixed-width record per session (little-endian):
+
+    session id (u64), word id (u32), guessed letter mask (u32),
+    wrong guesses (u8), max wrong guesses (u8), flags (u8), padding (1)
+
+The guessed letter mask has bit 0 for 'A' to bit 25 for 'Z', and the
+flags are GAME_OVER and WON. Word ids come from hangman.words, so a
+snapshot must be loaded with the same word store it was saved with.
+Session ids are unsigned 64-bit integers; the hex ids of hangman.server
+convert with ``int(session_id, 16)``.
+
+Changes between snapshots are appended to a journal of fixed-width
+entries, and ``compact`` folds the journal into a new snapshot. To fold
+it without losing entries appended meanwhile, the journal is first moved
+aside to ``<journal>.compacting`` and a new journal is started; the moved
+journal is deleted once the new snapshot is in place.
+"""
+
+import os
+import struct
+
+from .hangman import HangmanGame, letter_bit, LETTER_BITS
+from .words import get_word_by_id, get_word_id
+
+SNAPSHOT_MAGIC = b"HSS1"
+
+GAME_OVER = 1
+WON = 2
+
+# Journal entry kinds
+START = 1
+GUESS = 2
+END = 3
+
+_SNAPSHOT_HEADER = struct.Struct("<4sI")
+RECORD = struct.Struct("<QIIBBBx")
+# kind (u8), letter index or max wrong guesses (u8), padding (2),
+# word id (u32), session id (u64)
+JOURNAL_ENTRY = struct.Struct("<BBxxIQ")
+
+_LETTERS = list(LETTER_BITS)
+
+# Most wrong guesses a record can hold.
+MAX_WRONG_GUESSES = 255
+
+# Suffix of a journal moved aside to be folded into a snapshot.
+ROTATED_SUFFIX = ".compacting"
+
+def _check_max_wrong_guesses(game):
+    if not 0 <= game.max_wrong_guesses <= MAX_WRONG_GUESSES:
+        raise ValueError(f"Cannot save games allowing more than {MAX_WRONG_GUESSES} "
+                         f"wrong guesses, got {game.max_wrong_guesses}")
+
+def pack_session(session_id, game):
+    """Pack a game into a snapshot record.
+    
+    Args:
+        session_id (int): Session id
+        game (HangmanGame): Game to save
+        
+    Returns:
+        bytes: The record
+        
+    Raises:
+        ValueError: If the game allows more wrong guesses than a record holds
+    """
+    _check_max_wrong_guesses(game)
+    flags = (GAME_OVER if game.game_over else 0) | (WON if game.won else 0)
+    return RECORD.pack(session_id, get_word_id(game.word), game.guessed_mask & 0x3FFFFFF,
+                       game.wrong_guesses, game.max_wrong_guesses, flags)
+
+def restore_game(record):
+    """Rebuild a game from an unpacked snapshot record.
+    
+    Args:
+        record (tuple): Fields of a record, as returned by load_snapshot
+        
+    Returns:
+        HangmanGame: The restored game
+    """
+    _, word_id, guessed_mask, wrong_guesses, max_wrong_guesses, flags = record
+    game = HangmanGame(max_wrong_guesses=max_wrong_guesses, word=get_word_by_id(word_id))
+    game.restore(guessed_mask, wrong_guesses, bool(flags & GAME_OVER), bool(flags & WON))
+    return game
+
+def save_snapshot(path, sessions):
+    """Write a snapshot of sessions.
+    
+    The snapshot is written next to its destination and moved into place,
+    so a crash never leaves a partially written snapshot behind.
+    
+    Args:
+        path (str): Snapshot file path
+        sessions: Iterable of (session id, HangmanGame) pairs
+        
+    Returns:
+        int: Number of sessions saved
+    """
+    records = [pack_session(session_id, game) for session_id, game in sessions]
+    _write_records(path, records)
+    return len(records)
+
+def _write_records(path, records):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(records)))
+        f.write(b"".join(records))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_snapshot(path):
+    """Load the records of a snapshot without rebuilding any games.
+    
+    Games are rebuilt on demand with restore_game, so loading stays cheap
+    even for millions of sessions.
+    
+    Args:
+        path (str): Snapshot file path
+        
+    Returns:
+        dict: Record tuples by session id
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, count = _SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"{path} is not a hangman session snapshot")
+    body = memoryview(data)[_SNAPSHOT_HEADER.size:_SNAPSHOT_HEADER.size + count * RECORD.size]
+    return {record[0]: record for record in RECORD.iter_unpack(body)}
+
+class SessionJournal:
+    """Append-only journal of session changes since the last snapshot."""
+    
+    def __init__(self, path):
+        """Open a journal for appending, creating it if needed.
+        
+        Args:
+            path (str): Journal file path
+        """
+        self.path = path
+        self._file = open(path, "ab")
+    
+    def start(self, session_id, game):
+        """Record a new session or a reset game.
+        
+        Raises:
+            ValueError: If the game allows more wrong guesses than an entry holds
+        """
+        _check_max_wrong_guesses(game)
+        self._file.write(JOURNAL_ENTRY.pack(START, game.max_wrong_guesses,
+                                            get_word_id(game.word), session_id))
+    
+    def guess(self, session_id, letter):
+        """Record a guess; guesses other than A-Z are not recorded."""
+        letter = letter.upper()
+        if letter in LETTER_BITS:
+            self._file.write(JOURNAL_ENTRY.pack(GUESS, _LETTERS.index(letter), 0, session_id))
+    
+    def end(self, session_id):
+        """Record that a session ended."""
+        self._file.write(JOURNAL_ENTRY.pack(END, 0, 0, session_id))
+    
+    def flush(self, sync=False):
+        """Flush buffered entries, and with sync=True wait until they are on disk."""
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+    
+    def rotate(self):
+        """Move the journal aside to be compacted and start a new one.
+        
+        Raises:
+            FileExistsError: If a journal moved aside earlier was not compacted yet
+        """
+        rotated = self.path + ROTATED_SUFFIX
+        if os.path.exists(rotated):
+            raise FileExistsError(rotated)
+        self._file.close()
+        os.replace(self.path, rotated)
+        self._file = open(self.path, "ab")
+    
+    def close(self):
+        """Flush and close the journal."""
+        self._file.close()
+
+def _guess_record(record, letter_index, word_masks):
+    """Apply a guess to a record the way HangmanGame.make_guess would."""
+    session_id, word_id, guessed_mask, wrong_guesses, max_wrong_guesses, flags = record
+    bit = 1 << letter_index
+    if guessed_mask & bit:
+        return record
+    guessed_mask |= bit
+    word_mask = word_masks.get(word_id)
+    if word_mask is None:
+        word_mask = 0
+        for letter in get_word_by_id(word_id).upper():
+            word_mask |= letter_bit(letter)
+        word_masks[word_id] = word_mask
+    if bit & word_mask:
+        if guessed_mask & word_mask == word_mask:
+            flags = GAME_OVER | WON
+    else:
+        wrong_guesses += 1
+        if wrong_guesses >= max_wrong_guesses:
+            flags = GAME_OVER
+    return (session_id, word_id, guessed_mask, wrong_guesses, max_wrong_guesses, flags)
+
+def replay_journal(path, records):
+    """Apply the entries of a journal to snapshot records in place.
+    
+    Args:
+        path (str): Journal file path
+        records (dict): Record tuples by session id, from load_snapshot
+        
+    Returns:
+        dict: The updated records
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    # Ignore a torn entry at the end of the journal.
+    data = memoryview(data)[:len(data) - len(data) % JOURNAL_ENTRY.size]
+    word_masks = {}
+    for kind, value, word_id, session_id in JOURNAL_ENTRY.iter_unpack(data):
+        if kind == START:
+            records[session_id] = (session_id, word_id, 0, 0, value, 0)
+        elif kind == END:
+            records.pop(session_id, None)
+        elif kind == GUESS and session_id in records:
+            records[session_id] = _guess_record(records[session_id], value, word_masks)
+    return records
+
+def load_sessions(snapshot_path, journal_path=None):
+    """Load the latest session records from a snapshot and its journal.
+    
+    Any file may be missing, in which case it counts as empty. A journal
+    moved aside by an interrupted compact is replayed before the journal.
+    
+    Returns:
+        dict: Record tuples by session id
+    """
+    records = load_snapshot(snapshot_path) if os.path.exists(snapshot_path) else {}
+    if journal_path is not None:
+        for path in (journal_path + ROTATED_SUFFIX, journal_path):
+            if os.path.exists(path):
+                replay_journal(path, records)
+    return records
+
+def compact(snapshot_path, journal_path, journal=None):
+    """Fold a journal into a new snapshot and start an empty journal.
+    
+    The journal is moved aside before it is read, so entries appended
+    while compacting go to the new journal. Replaying a journal over a
+    snapshot it was already folded into gives the same records, so a crash
+    at any step loses nothing; a journal left aside by a crash is folded
+    in by the next compact.
+    
+    Args:
+        snapshot_path (str): Snapshot file path
+        journal_path (str): Journal file path
+        journal (SessionJournal): The open journal appending to journal_path,
+            if any; it is rotated so that it keeps appending to the new journal
+    
+    Returns:
+        int: Number of sessions in the new snapshot
+    """
+    rotated = journal_path + ROTATED_SUFFIX
+    if not os.path.exists(rotated):
+        if journal is not None:
+            journal.rotate()
+        elif os.path.exists(journal_path):
+            os.replace(journal_path, rotated)
+    records = load_snapshot(snapshot_path) if os.path.exists(snapshot_path) else {}
+    if os.path.exists(rotated):
+        replay_journal(rotated, records)
+    _write_records(snapshot_path, [RECORD.pack(*record) for record in records.values()])
+    if os.path.exists(rotated):
+        os.remove(rotated)
+    return len(records)
@@ -0,0 +1,237 @@
+"""Multiplayer hangman rooms where many players guess one shared word.
+
+Members join a room as players or spectators. Guesses are queued as they
+arrive and applied in arrival order on the next tick. After a tick, the
+state changes of all the guesses it applied are sent to every member as a
+single message: the get_state_delta of the game since the last broadcast
+plus the result of each guess. The message is serialized once and the
+same bytes are handed to every member, so a tick costs one serialization
+plus one write per member however many guesses it applied.
+
+In free-for-all rooms any player may guess at any time. In turn rooms
+players guess in the order they joined, and a guess out of turn is
+rejected with a message to that player only.
+"""
+
+import json
+from collections import deque
+
+from .hangman import REJECTED, HangmanGame, public_state
+
+FREE_FOR_ALL = "free"
+TURNS = "turns"
+MODES = (FREE_FOR_ALL, TURNS)
+
+# Seconds between ticks of RoomTable.run.
+TICK_INTERVAL = 0.05
+
+def _encode(message):
+    return (json.dumps(message) + "\n").encode()
+
+class Room:
+    """A shared hangman game and the members watching or playing it."""
+
+    def __init__(self, name, mode=FREE_FOR_ALL, difficulty="medium", max_wrong_guesses=6,
+                 word=None):
+        """Create a room with a new game.
+
+        Args:
+            name (str): Room name
+            mode (str): FREE_FOR_ALL or TURNS
+            difficulty (str): Difficulty level of the words
+            max_wrong_guesses (int): Maximum number of wrong guesses allowed
+            word (str): First word to guess; picked at random if None
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown room mode: {mode!r}")
+        self.name = name
+        self.mode = mode
+        self.difficulty = difficulty
+        self.game = HangmanGame(difficulty, max_wrong_guesses, word)
+        # Member id to the callable that sends it bytes, and the ids of the
+        # members who play, in turn order.
+        self.members = {}
+        self.players = []
+        self._turn = 0
+        self._pending = deque()
+        self._sent_version = self.game.state_version
+
+    def __len__(self):
+        return len(self.members)
+
+    @property
+    def current_player(self):
+        """str: Id of the player whose turn it is, or None in free-for-all rooms."""
+        if self.mode != TURNS or not self.players:
+            return None
+        return self.players[self._turn % len(self.players)]
+
+    def join(self, member_id, send, play=True):
+        """Add a member and send them the full state of the room.
+
+        Args:
+            member_id (str): Id of the member
+            send (callable): Called with bytes to send to the member
+            play (bool): Whether the member plays or only spectates
+        """
+        self.members[member_id] = send
+        if play and member_id not in self.players:
+            self.players.append(member_id)
+        send(_encode({"room": self.name, "state": public_state(self.game),
+                      "version": self.game.state_version, "players": self.players,
+                      "turn": self.current_player}))
+
+    def leave(self, member_id):
+        """Remove a member, passing on their turn if it was theirs."""
+        self.members.pop(member_id, None)
+        if member_id in self.players:
+            current = self._turn % len(self.players)
+            index = self.players.index(member_id)
+            del self.players[index]
+            # Keep the turn with the same player, or pass it to the next one
+            # if it was the leaving player's.
+            if index < current:
+                current -= 1
+            self._turn = current if current < len(self.players) else 0
+
+    def submit(self, member_id, letter):
+        """Queue a guess to be applied on the next tick.
+
+        Returns:
+            bool: Whether the guess was queued; only players may guess
+        """
+        if member_id not in self.players:
+            return False
+        self._pending.append((member_id, letter))
+        return True
+
+    def new_round(self, difficulty=None, word=None):
+        """Start guessing a new word; members get its state on the next tick."""
+        self.game.reset_game(difficulty or self.difficulty, word)
+
+    def _reject(self, member_id, letter, error):
+        send = self.members.get(member_id)
+        if send is not None:
+            send(_encode({"room": self.name, "letter": letter, "error": error}))
+
+    def tick(self):
+        """Apply the queued guesses in order and broadcast the changes.
+
+        Returns:
+            int: Number of guesses applied
+        """
+        results = []
+        while self._pending:
+            member_id, letter = self._pending.popleft()
+            if member_id not in self.players:
+                # The player left after guessing.
+                continue
+            if self.game.game_over:
+                self._reject(member_id, letter, "The game is over.")
+                continue
+            if self.mode == TURNS and member_id != self.current_player:
+                self._reject(member_id, letter, "It is not your turn.")
+                continue
+            result = self.game.make_guess(letter)
+            results.append({"player": member_id, "letter": letter, **result.as_dict()})
+            if self.mode == TURNS and result.status not in REJECTED:
+                self._turn += 1
+
+        if self.game.state_version != self._sent_version or results:
+            delta = self.game.get_state_delta(self._sent_version)
+            # The word is hidden until the game ends, so it is sent then
+            # even though it has not changed.
+            if self.game.game_over:
+                delta["word"] = self.game.word
+            else:
+                delta.pop("word", None)
+            self._sent_version = self.game.state_version
+            payload = _encode({"room": self.name, "delta": delta, "results": results,
+                               "turn": self.current_player})
+            for send in list(self.members.values()):
+                send(payload)
+        return len(results)
+
+class RoomTable:
+    """Rooms by name, ticking only the rooms with something to send."""
+
+    def __init__(self):
+        self._rooms = {}
+        self._member_rooms = {}
+        self._active = set()
+
+    def __len__(self):
+        return len(self._rooms)
+
+    def get(self, name):
+        """Get a room by name.
+
+        Raises:
+            KeyError: If there is no such room
+        """
+        return self._rooms[name]
+
+    def join(self, name, member_id, send, play=True, **options):
+        """Join a room, creating it with the given options if it does not exist.
+
+        Args:
+            name (str): Room name
+            member_id (str): Id of the member
+            send (callable): Called with bytes to send to the member
+            play (bool): Whether the member plays or only spectates
+            **options: Room arguments used if the room is created
+
+        Returns:
+            Room: The room joined
+        """
+        room = self._rooms.get(name)
+        if room is None:
+            room = self._rooms[name] = Room(name, **options)
+        room.join(member_id, send, play)
+        self._member_rooms.setdefault(member_id, set()).add(name)
+        return room
+
+    def leave(self, name, member_id):
+        """Leave a room, closing it when its last member leaves."""
+        room = self._rooms.get(name)
+        if room is None:
+            return
+        room.leave(member_id)
+        self._member_rooms.get(member_id, set()).discard(name)
+        if not room.members:
+            del self._rooms[name]
+            self._active.discard(name)
+
+    def leave_all(self, member_id):
+        """Leave every room a member is in, such as when they disconnect."""
+        for name in list(self._member_rooms.pop(member_id, ())):
+            self.leave(name, member_id)
+
+    def submit(self, name, member_id, letter):
+        """Queue a guess in a room; see Room.submit."""
+        queued = self.get(name).submit(member_id, letter)
+        if queued:
+            self._active.add(name)
+        return queued
+
+    def new_round(self, name, difficulty=None, word=None):
+        """Start a new word in a room; see Room.new_round."""
+        self.get(name).new_round(difficulty, word)
+        self._active.add(name)
+
+    def tick(self):
+        """Tick the rooms with queued guesses or a new round.
+
+        Returns:
+            int: Number of guesses applied
+        """
+        active, self._active = self._active, set()
+        return sum(self._rooms[name].tick() for name in active if name in self._rooms)
+
+    async def run(self, interval=TICK_INTERVAL):
+        """Tick the rooms until cancelled."""
+        import asyncio
+
+        while True:
+            await asyncio.sleep(interval)
+            self.tick()
@@ -0,0 +1,304 @@
+"""Asyncio server hosting many hangman games in one event loop.
+
+Clients send one JSON request per line and get one JSON response per line:
+
+    {"op": "new", "difficulty": "easy", "max_wrong_guesses": 6}
+        -> {"ok": true, "session": "<id>", "state": {...}}
+    {"op": "guess", "session": "<id>", "letter": "a"}
+        -> {"ok": true, "result": {...}, "state": {...}}
+    {"op": "state", "session": "<id>"}
+        -> {"ok": true, "state": {...}}
+    {"op": "end", "session": "<id>"}
+        -> {"ok": true}
+
+Failed requests get {"ok": false, "error": "<message>"}. States are the
+get_game_state dict, without the word until the game is over. Sessions
+are not tied to a connection, so a client can reconnect and carry on, and
+sessions left idle for too long are expired.
+
+Clients can also share a game in a room (see hangman.rooms):
+
+    {"op": "join", "room": "<name>", "mode": "turns", "spectate": false}
+        -> {"ok": true}
+    {"op": "room_guess", "room": "<name>", "letter": "a"}
+        -> {"ok": true}
+    {"op": "room_new", "room": "<name>"}
+        -> {"ok": true}
+    {"op": "leave", "room": "<name>"}
+        -> {"ok": true}
+
+Room members are sent the room state when they join and a message with
+the changes and guess results after every tick that changed the game.
+Room messages have a "room" key instead of "ok".
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from collections import OrderedDict
+
+from .hangman import GamePool, public_state
+from .rooms import MODES, RoomTable
+
+# Seconds a session may stay unused before it is expired.
+SESSION_IDLE_TIMEOUT = 600
+
+# Seconds between sweeps for expired sessions.
+EXPIRE_INTERVAL = 30
+
+# Difficulties clients may ask for.
+DIFFICULTIES = ("easy", "medium", "hard", "random")
+
+# Most wrong guesses a client may allow; there are only 26 letters to guess.
+MAX_WRONG_GUESSES = 26
+
+class SessionTable:
+    """Hangman games by session id, with idle expiry."""
+    
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT, clock=time.monotonic, pool=None):
+        """Create an empty session table.
+        
+        Args:
+            idle_timeout (float): Seconds a session may stay unused
+            clock (callable): Returns the current time in seconds
+            pool (GamePool): Pool that games of ended sessions go back to
+        """
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.pool = pool if pool is not None else GamePool()
+        # Kept in least recently used order, so expiry stops at the first
+        # session that is still fresh.
+        self._sessions = OrderedDict()
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def create(self, difficulty="medium", max_wrong_guesses=6):
+        """Start a new game.
+        
+        Returns:
+            tuple: The new session id and its HangmanGame
+        """
+        session_id = secrets.token_hex(8)
+        game = self.pool.acquire(difficulty, max_wrong_guesses)
+        self._sessions[session_id] = [game, self.clock()]
+        return session_id, game
+    
+    def get(self, session_id):
+        """Get the game of a session and mark the session as used.
+        
+        Raises:
+            KeyError: If there is no such session
+        """
+        entry = self._sessions[session_id]
+        entry[1] = self.clock()
+        self._sessions.move_to_end(session_id)
+        return entry[0]
+    
+    def remove(self, session_id):
+        """End a session if it exists."""
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self.pool.release(entry[0])
+    
+    def expire(self):
+        """Remove the sessions that have been idle for too long.
+        
+        Returns:
+            int: Number of sessions removed
+        """
+        deadline = self.clock() - self.idle_timeout
+        expired = 0
+        while self._sessions:
+            session_id, (game, last_used) = next(iter(self._sessions.items()))
+            if last_used > deadline:
+                break
+            del self._sessions[session_id]
+            self.pool.release(game)
+            expired += 1
+        return expired
+
+def check_game_options(difficulty, max_wrong_guesses=6):
+    """Check the game options of a request.
+    
+    Returns:
+        str: Error message for the client, or None if the options are valid
+    """
+    if not isinstance(difficulty, str) or difficulty not in DIFFICULTIES:
+        return f"difficulty must be one of {', '.join(DIFFICULTIES)}."
+    if (not isinstance(max_wrong_guesses, int) or isinstance(max_wrong_guesses, bool)
+            or not 1 <= max_wrong_guesses <= MAX_WRONG_GUESSES):
+        return f"max_wrong_guesses must be an integer from 1 to {MAX_WRONG_GUESSES}."
+    return None
+
+def handle_room_request(rooms, member_id, send, request):
+    """Handle one decoded room request from a connected member.
+    
+    Args:
+        rooms (RoomTable): Rooms of the server
+        member_id (str): Id of the connection making the request
+        send (callable): Sends bytes to the connection
+        request (dict): Decoded request
+        
+    Returns:
+        dict: Response to send back
+    """
+    op = request["op"]
+    name = request.get("room")
+    if not isinstance(name, str):
+        return {"ok": False, "error": "room must be a string."}
+    if op == "join":
+        mode = request.get("mode", MODES[0])
+        if not isinstance(mode, str) or mode not in MODES:
+            return {"ok": False, "error": f"mode must be one of {', '.join(MODES)}."}
+        difficulty = request.get("difficulty", "medium")
+        error = check_game_options(difficulty)
+        if error is not None:
+            return {"ok": False, "error": error}
+        rooms.join(name, member_id, send, not request.get("spectate", False),
+                   mode=mode, difficulty=difficulty)
+        return {"ok": True}
+    if op == "leave":
+        rooms.leave(name, member_id)
+        return {"ok": True}
+    try:
+        if op == "room_new":
+            difficulty = request.get("difficulty")
+            if difficulty is not None:
+                error = check_game_options(difficulty)
+                if error is not None:
+                    return {"ok": False, "error": error}
+            if member_id not in rooms.get(name).players:
+                return {"ok": False, "error": "Only players in the room can start a new word."}
+            rooms.new_round(name, difficulty)
+            return {"ok": True}
+        letter = request.get("letter")
+        if not isinstance(letter, str):
+            return {"ok": False, "error": "letter must be a string."}
+        if not rooms.submit(name, member_id, letter):
+            return {"ok": False, "error": "Only players in the room can guess."}
+    except KeyError:
+        return {"ok": False, "error": "Unknown room."}
+    return {"ok": True}
+
+def handle_request(sessions, request, rooms=None, member_id=None, send=None):
+    """Handle one decoded client request.
+    
+    Args:
+        sessions (SessionTable): Sessions of the server
+        request (dict): Decoded request
+        rooms (RoomTable): Rooms of the server, if it has any
+        member_id (str): Id of the connection making the request, for rooms
+        send (callable): Sends bytes to the connection, for rooms
+        
+    Returns:
+        dict: Response to send back
+    """
+    if not isinstance(request, dict):
+        return {"ok": False, "error": "Requests must be JSON objects."}
+    op = request.get("op")
+    if rooms is not None and op in ("join", "leave", "room_guess", "room_new"):
+        return handle_room_request(rooms, member_id, send, request)
+    if op == "new":
+        difficulty = request.get("difficulty", "medium")
+        max_wrong_guesses = request.get("max_wrong_guesses", 6)
+        error = check_game_options(difficulty, max_wrong_guesses)
+        if error is not None:
+            return {"ok": False, "error": error}
+        session_id, game = sessions.create(difficulty, max_wrong_guesses)
+        return {"ok": True, "session": session_id, "state": public_state(game)}
+    if op not in ("guess", "state", "end"):
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+    
+    session_id = request.get("session")
+    if not isinstance(session_id, str):
+        return {"ok": False, "error": "session must be a string."}
+    if op == "end":
+        sessions.remove(session_id)
+        return {"ok": True}
+    try:
+        game = sessions.get(session_id)
+    except KeyError:
+        return {"ok": False, "error": "Unknown or expired session."}
+    if op == "state":
+        return {"ok": True, "state": public_state(game)}
+    
+    letter = request.get("letter")
+    if not isinstance(letter, str):
+        return {"ok": False, "error": "letter must be a string."}
+    result = game.make_guess(letter)
+    return {"ok": True, "result": result.as_dict(), "state": public_state(game)}
+
+async def handle_connection(sessions, reader, writer, rooms=None):
+    """Serve requests from one client until it disconnects."""
+    member_id = secrets.token_hex(8)
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Line longer than the stream limit
+                break
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"ok": False, "error": "Invalid JSON."}
+            else:
+                response = handle_request(sessions, request, rooms, member_id, writer.write)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        if rooms is not None:
+            rooms.leave_all(member_id)
+        writer.close()
+
+async def expire_sessions(sessions, interval=EXPIRE_INTERVAL):
+    """Periodically expire idle sessions."""
+    while True:
+        await asyncio.sleep(interval)
+        sessions.expire()
+
+async def start_server(sessions, host="127.0.0.1", port=0, rooms=None):
+    """Start listening for clients.
+    
+    Returns:
+        asyncio.Server: The listening server
+    """
+    return await asyncio.start_server(
+        lambda reader, writer: handle_connection(sessions, reader, writer, rooms), host, port)
+
+async def serve(host="127.0.0.1", port=8765, idle_timeout=SESSION_IDLE_TIMEOUT):
+    """Run the server until it is cancelled."""
+    sessions = SessionTable(idle_timeout)
+    rooms = RoomTable()
+    server = await start_server(sessions, host, port, rooms)
+    reaper = asyncio.ensure_future(expire_sessions(sessions))
+    ticker = asyncio.ensure_future(rooms.run())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        reaper.cancel()
+        ticker.cancel()
+
+def main(argv=None):
+    """Run the server from the command line."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Serve hangman games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--idle-timeout", type=float, default=SESSION_IDLE_TIMEOUT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Headless hangman simulations for tuning game settings.
+
+A strategy is a picklable callable that takes a random number generator
+(a ``random_source.RandomSource``) and returns a guesser for one game.
+The guesser is called with the ``HangmanGame`` being played and returns
+the next letter to guess.
+"""
+
+import string
+from collections import Counter
+
+from random_source import RandomSource
+
+from .hangman import REJECTED, HangmanGame
+from .words import WordStore, get_random_word
+
+# English letters from most to least common.
+LETTER_FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+# Games played per task sent to a worker process.
+CHUNK_SIZE = 10000
+
+# Attempts after which a game whose guesser keeps repeating itself is
+# abandoned and counted as lost.
+MAX_ATTEMPTS = 100
+
+def frequency_strategy(rng):
+    """Strategy that guesses letters from most to least common."""
+    letters = iter(LETTER_FREQUENCY_ORDER)
+    return lambda game: next(letters)
+
+def random_strategy(rng):
+    """Strategy that guesses the alphabet in a random order."""
+    letters = list(string.ascii_uppercase)
+    rng.shuffle(letters)
+    letters = iter(letters)
+    return lambda game: next(letters)
+
+def play_headless(game, guesser):
+    """Play a game to the end without any input or output.
+    
+    Args:
+        game (HangmanGame): Game to play
+        guesser (callable): Returns the next guess for the game
+        
+    Returns:
+        int: Number of accepted guesses made
+    """
+    guesses = 0
+    for _ in range(MAX_ATTEMPTS):
+        if game.game_over:
+            break
+        try:
+            guess = guesser(game)
+        except StopIteration:
+            break
+        if game.make_guess(guess).status not in REJECTED:
+            guesses += 1
+    return guesses
+
+def _run_chunk(task):
+    """Play one chunk of games in a worker and aggregate the results.
+    
+    A word store given with the task is opened for the chunk alone rather
+    than selected with use_word_store, since the chunk may run in the
+    calling process.
+    """
+    strategy, games, difficulty, max_wrong_guesses, seed, word_store = task
+    store = None if word_store is None else WordStore(word_store)
+    pick_word = get_random_word if store is None else store.random_word
+    try:
+        rng = RandomSource(seed)
+        wins = 0
+        guess_counts = Counter()
+        wrong_guesses = Counter()
+        game = HangmanGame(difficulty, max_wrong_guesses, word=pick_word(difficulty, rng=rng))
+        for index in range(games):
+            if index:
+                game.reset_game(difficulty, word=pick_word(difficulty, rng=rng))
+            guess_counts[play_headless(game, strategy(rng))] += 1
+            wrong_guesses[game.wrong_guesses] += 1
+            wins += game.won
+        return wins, guess_counts, wrong_guesses
+    finally:
+        if store is not None:
+            store.close()
+
+def simulate(games, strategy=frequency_strategy, difficulty="random", max_wrong_guesses=6,
+             workers=None, seed=0, word_store=None):
+    """Play many games against a strategy and summarize the outcomes.
+    
+    Games are split into chunks of CHUNK_SIZE, and each chunk draws its
+    words and strategy choices from its own RNG seeded from ``seed`` and
+    the chunk number. Results are therefore reproducible for a given seed,
+    whatever the number of workers.
+    
+    Args:
+        games (int): Number of games to play
+        strategy (callable): Strategy to guess with
+        difficulty (str): Difficulty level of the words
+        max_wrong_guesses (int): Maximum number of wrong guesses allowed
+        workers (int): Worker processes to use; 1 plays in this process,
+            None uses one per CPU
+        seed (int): Base seed of the chunk RNGs
+        word_store (str): Word store file for the workers to pick from
+        
+    Returns:
+        dict: Games played, wins, win rate and histograms of accepted
+            guesses and wrong guesses per game
+    """
+    tasks = [
+        (strategy, min(CHUNK_SIZE, games - start), difficulty, max_wrong_guesses,
+         f"{seed}:{start // CHUNK_SIZE}", word_store)
+        for start in range(0, games, CHUNK_SIZE)
+    ]
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_run_chunk, tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_run_chunk, tasks))
+    
+    wins = 0
+    guess_counts = Counter()
+    wrong_guesses = Counter()
+    for chunk_wins, chunk_guess_counts, chunk_wrong_guesses in results:
+        wins += chunk_wins
+        guess_counts.update(chunk_guess_counts)
+        wrong_guesses.update(chunk_wrong_guesses)
+    
+    return {
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "guess_counts": dict(sorted(guess_counts.items())),
+        "wrong_guesses": dict(sorted(wrong_guesses.items())),
+    }
+
+def main(argv=None):
+    """Run a simulation from the command line and print the summary as JSON."""
+    import argparse
+    import json
+    
+    parser = argparse.ArgumentParser(description="Simulate hangman games.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--strategy", choices=["frequency", "random"], default="frequency")
+    parser.add_argument("--difficulty", default="random")
+    parser.add_argument("--max-wrong-guesses", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--word-store", default=None)
+    args = parser.parse_args(argv)
+    
+    strategies = {"frequency": frequency_strategy, "random": random_strategy}
+    summary = simulate(args.games, strategies[args.strategy], args.difficulty,
+                       args.max_wrong_guesses, args.workers, args.seed, args.word_store)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
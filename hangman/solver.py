@@ -0,0 +1,174 @@
+"""Hangman solver that narrows a dictionary down to the possible words.
+
+The solver indexes its dictionary once by (length, position, letter). Each
+index entry is a bitset, stored as a Python int, of the words of that
+length with that letter at that position. The words consistent with a
+game are found by intersecting and subtracting these bitsets, never by
+rescanning the dictionary.
+"""
+
+import math
+
+from .simulation import LETTER_FREQUENCY_ORDER
+
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:
+    def _popcount(value):
+        return bin(value).count("1")
+
+def _bitset(indexes, size):
+    """Build a bitset with the given bits set."""
+    bits = bytearray((size + 7) // 8)
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bits, "little")
+
+def _parse_pattern(pattern):
+    """Split a word progress pattern such as 'H _ L L _' into upper-case cells."""
+    return pattern.upper().split() if " " in pattern else list(pattern.upper())
+
+class HangmanSolver:
+    """Suggests guesses from the words still consistent with a game."""
+    
+    METHODS = ("frequency", "entropy")
+    
+    def __init__(self, words, method="frequency"):
+        """Index a dictionary.
+        
+        Args:
+            words (iterable): Dictionary words; non-alphabetic words are skipped
+            method (str): 'frequency' guesses the letter found in the most
+                candidate words, 'entropy' the letter whose presence splits
+                the candidates most evenly
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method!r}")
+        self.method = method
+        
+        by_length = {}
+        for word in set(word.strip().upper() for word in words):
+            if word.isalpha():
+                by_length.setdefault(len(word), []).append(word)
+        
+        self._words = {}
+        self._positions = {}
+        self._contains = {}
+        for length, bucket in by_length.items():
+            bucket.sort()
+            self._words[length] = bucket
+            positions = {}
+            contains = {}
+            for index, word in enumerate(bucket):
+                for position, letter in enumerate(word):
+                    positions.setdefault((length, position, letter), []).append(index)
+                for letter in set(word):
+                    contains.setdefault((length, letter), []).append(index)
+            for key, indexes in positions.items():
+                self._positions[key] = _bitset(indexes, len(bucket))
+            for key, indexes in contains.items():
+                self._contains[key] = _bitset(indexes, len(bucket))
+    
+    def _narrow(self, mask, cells, letter):
+        """Remove the candidates inconsistent with one guessed letter."""
+        length = len(cells)
+        if letter not in cells:
+            return mask & ~self._contains.get((length, letter), 0)
+        for position, cell in enumerate(cells):
+            letter_here = self._positions.get((length, position, letter), 0)
+            mask = mask & letter_here if cell == letter else mask & ~letter_here
+        return mask
+    
+    def _candidate_mask(self, cells, guessed_letters):
+        words = self._words.get(len(cells), ())
+        mask = (1 << len(words)) - 1
+        for letter in guessed_letters:
+            mask = self._narrow(mask, cells, letter.upper())
+        return mask
+    
+    def candidates(self, pattern, guessed_letters):
+        """Get the dictionary words consistent with a game.
+        
+        Args:
+            pattern (str): Word progress, as shown by display_word_progress
+            guessed_letters (iterable): Letters guessed so far
+            
+        Returns:
+            list: Matching words in alphabetical order
+        """
+        cells = _parse_pattern(pattern)
+        mask = self._candidate_mask(cells, guessed_letters)
+        words = self._words.get(len(cells), ())
+        found = []
+        # Walk only the set bits, lowest first.
+        while mask:
+            lowest = mask & -mask
+            found.append(words[lowest.bit_length() - 1])
+            mask ^= lowest
+        return found
+    
+    def _choose(self, length, mask, guessed_letters):
+        """Pick the best unguessed letter for a candidate bitset."""
+        total = _popcount(mask)
+        best_letter = None
+        best_score = None
+        for letter in LETTER_FREQUENCY_ORDER:
+            if letter in guessed_letters:
+                continue
+            count = _popcount(mask & self._contains.get((length, letter), 0))
+            if not count:
+                continue
+            if self.method == "frequency":
+                score = count
+            else:
+                p = count / total
+                score = 0.0 if p == 1 else -p * math.log2(p) - (1 - p) * math.log2(1 - p)
+            if best_score is None or score > best_score:
+                best_letter, best_score = letter, score
+        if best_letter is not None:
+            return best_letter
+        # The word is not in the dictionary; fall back to letter frequency.
+        for letter in LETTER_FREQUENCY_ORDER:
+            if letter not in guessed_letters:
+                return letter
+        return None
+    
+    def best_guess(self, pattern, guessed_letters):
+        """Suggest the next letter to guess.
+        
+        Args:
+            pattern (str): Word progress, as shown by display_word_progress
+            guessed_letters (iterable): Letters guessed so far
+            
+        Returns:
+            str: Suggested letter, or None if every letter was guessed
+        """
+        guessed_letters = set(letter.upper() for letter in guessed_letters)
+        cells = _parse_pattern(pattern)
+        return self._choose(len(cells), self._candidate_mask(cells, guessed_letters),
+                            guessed_letters)
+    
+    def hint(self, game):
+        """Suggest the next letter to guess in a HangmanGame."""
+        return self.best_guess(game.get_game_state()["word_progress"], game.guessed_letters)
+    
+    def __call__(self, rng):
+        """Use the solver as a hangman.simulation strategy."""
+        return _SolverGuesser(self)
+
+class _SolverGuesser:
+    """Guesser for one game that narrows its candidates one guess at a time."""
+    
+    def __init__(self, solver):
+        self.solver = solver
+        self.mask = None
+        self.seen = set()
+    
+    def __call__(self, game):
+        cells = _parse_pattern(game.get_game_state()["word_progress"])
+        if self.mask is None:
+            self.mask = (1 << len(self.solver._words.get(len(cells), ()))) - 1
+        for letter in game.guessed_letters - self.seen:
+            self.mask = self.solver._narrow(self.mask, cells, letter)
+        self.seen = set(game.guessed_letters)
+        return self.solver._choose(len(cells), self.mask, self.seen)
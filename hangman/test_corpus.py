@@ -0,0 +1,64 @@
+"""Tests for building word stores from corpora."""
+
+import os
+from unittest.mock import patch
+
+from hangman import corpus
+from hangman.corpus import classify, ingest_corpus, iter_corpus, score_word
+from hangman.words import WordStore
+
+class TestCorpus:
+    """Test ingesting word corpora."""
+    
+    def test_iter_corpus_normalizes_and_dedupes(self):
+        """Test that words are upper-cased, unusable words dropped and duplicates skipped."""
+        lines = ["apple Banana", "  APPLE\n", "it can't x2 cherry", "", "banana"]
+        assert list(iter_corpus(lines)) == ["APPLE", "BANANA", "CHERRY"]
+    
+    def test_score_word(self):
+        """Test that short words with rare letters score as harder."""
+        assert score_word("JAZZ") > score_word("STATION")
+        assert score_word("CAT") > score_word("CATERPILLAR")
+    
+    def test_classify_splits_by_quantiles(self):
+        """Test that words are split into equal tiers from easiest to hardest."""
+        words = ["STATION", "RELATIONS", "GARDEN", "PLANET", "JAZZ", "FIZZ"]
+        tiers = classify(words, workers=1)
+        
+        assert [len(tiers[difficulty]) for difficulty in ("easy", "medium", "hard")] == [2, 2, 2]
+        assert set(tiers["hard"]) == {"JAZZ", "FIZZ"}
+        assert set(tiers["easy"]) == {"STATION", "RELATIONS"}
+    
+    def test_classify_in_chunks(self):
+        """Test that scoring in several chunks gives the same tiers."""
+        words = [f"{a}{b}{c}" for a in "ABCDEF" for b in "GHIJKL" for c in "MNOPQR"]
+        with patch.object(corpus, "CHUNK_SIZE", 7):
+            chunked = classify(words, workers=1)
+        assert chunked == classify(words, workers=1)
+    
+    def test_ingest_corpus(self, tmp_path):
+        """Test that a corpus is compiled into a word store with every word in a tier."""
+        path = tmp_path / "words.txt"
+        path.write_text("station relations garden\nplanet jazz fizz\njazz\n")
+        store = WordStore(ingest_corpus(str(path), str(tmp_path / "cache"), workers=1))
+        try:
+            assert len(store) == 6
+            assert store.count("easy") == store.count("medium") == store.count("hard") == 2
+            assert store.random_word("hard") in ("JAZZ", "FIZZ")
+        finally:
+            store.close()
+    
+    def test_ingest_corpus_is_cached(self, tmp_path):
+        """Test that an unchanged corpus is not processed again."""
+        path = tmp_path / "words.txt"
+        path.write_text("station relations garden\n")
+        cache_dir = str(tmp_path / "cache")
+        store_path = ingest_corpus(str(path), cache_dir, workers=1)
+        
+        with patch.object(corpus, "classify") as mock_classify:
+            assert ingest_corpus(str(path), cache_dir, workers=1) == store_path
+            mock_classify.assert_not_called()
+        
+        path.write_text("station relations garden planet\n")
+        assert ingest_corpus(str(path), cache_dir, workers=1) != store_path
+        assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,136 @@
+"""Tests for evil hangman."""
+
+from hangman.evil import EvilHangmanGame, choose_family, pack_words, partition, select
+from hangman.words import get_word_block
+
+WORDS = ["hello", "hallo", "hills", "jelly", "belly", "sully", "cat", "cot", "dog"]
+
+class TestPartition:
+    """Test grouping candidates by the pattern of a letter."""
+    
+    def test_pack_words_pads_to_eight_bytes(self):
+        """Test that words are padded with zero bytes."""
+        packed, stride = pack_words(b"CATCOT", 3)
+        assert stride == 8
+        assert packed == b"CAT\0\0\0\0\0COT\0\0\0\0\0"
+        assert pack_words(b"A" * 9, 9)[1] == 16
+    
+    def test_partition_groups_by_positions(self):
+        """Test that words with the letter in the same places share a key."""
+        packed, stride = pack_words(b"HELLOHALLOJELLYHELPS", 5)
+        families, keys = partition(packed, stride, "L")
+        assert keys[0] == keys[1] == keys[2] != keys[3]
+        assert sorted(families.values()) == [1, 3]
+        families, keys = partition(packed, stride, "Y")
+        assert keys[0] == keys[1] == keys[3] == 0 and keys[2] != 0
+    
+    def test_partition_long_words(self):
+        """Test that words longer than 8 letters are partitioned too."""
+        packed, stride = pack_words(b"ABCDEFGHIZABCDEFGHIJABCDEFGHIZ", 10)
+        families, keys = partition(packed, stride, "Z")
+        assert keys[0] == keys[2] != keys[1] == 0
+        assert families[0] == 1
+    
+    def test_partition_absent_letter(self):
+        """Test that a letter no word has puts every word in the miss family."""
+        packed, stride = pack_words(b"CATCOT", 3)
+        assert partition(packed, stride, "Z") == ({0: 2}, [0, 0])
+        assert partition(packed, stride, "É") == ({0: 2}, [0, 0])
+    
+    def test_choose_family_prefers_misses_on_ties(self):
+        """Test that ties go to a miss, then to fewer revealed positions."""
+        packed, stride = pack_words(b"CATCOTDOGDIE", 3)
+        families, keys = partition(packed, stride, "O")
+        assert choose_family(families, stride) == keys[0] == 0
+        packed, stride = pack_words(b"AABAACABDACD", 3)
+        families, keys = partition(packed, stride, "A")
+        assert choose_family(families, stride) == keys[2] != keys[0]
+    
+    def test_select(self):
+        """Test keeping the words whose selector is set."""
+        for length in (3, 10):
+            words = [bytes([65 + i]) * length for i in range(4)]
+            packed, stride = pack_words(b"".join(words), length)
+            kept = select(packed, stride, [True, False, False, True])
+            assert kept == pack_words(words[0] + words[3], length)[0]
+
+class TestEvilHangmanGame:
+    """Test the game that dodges guesses."""
+    
+    def test_dodges_guesses_while_it_can(self):
+        """Test that guesses miss while a family without the letter is largest."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS)
+        assert game.candidate_count == 6
+        result = game.make_guess("e")
+        assert result["status"] == "wrong"
+        assert game.candidates() == ["HALLO", "HILLS", "SULLY"]
+        assert "E" not in game.word
+    
+    def test_keeps_largest_family_on_hits(self):
+        """Test that a hit reveals the positions shared by most candidates."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS)
+        result = game.make_guess("L")
+        assert result["status"] == "correct"
+        assert game.candidate_count == 6
+        assert game.get_game_state()["word_progress"] == "_ _ L L _"
+    
+    def test_progress_stays_consistent(self):
+        """Test that the word always matches the revealed letters."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS, max_wrong_guesses=26)
+        for letter in "LYSHAOEIUBJ":
+            game.make_guess(letter)
+            progress = game.get_game_state()["word_progress"].split()
+            assert game.word in game.candidates()
+            for index, cell in enumerate(progress):
+                assert cell == "_" or cell == game.word[index]
+            if game.game_over:
+                break
+        assert game.won
+        assert game.candidate_count == 1
+    
+    def test_loses_with_a_real_word(self):
+        """Test that a lost game reveals a candidate word."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS, max_wrong_guesses=1)
+        result = game.make_guess("E")
+        assert result["status"] == "lose"
+        assert game.word in ["HALLO", "HILLS", "SULLY"]
+        assert game.get_game_state()["word"] == game.word
+    
+    def test_invalid_and_duplicate_guesses(self):
+        """Test that invalid and duplicate guesses leave the candidates alone."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS)
+        assert game.make_guess("1")["status"] == "invalid"
+        game.make_guess("E")
+        count = game.candidate_count
+        assert game.make_guess("e")["status"] == "duplicate"
+        assert game.candidate_count == count
+    
+    def test_word_outside_candidates(self):
+        """Test that a word with no candidates of its length is played alone."""
+        game = EvilHangmanGame(word="PYTHON", words=WORDS)
+        assert game.candidates() == ["PYTHON"]
+        assert game.make_guess("P")["status"] == "correct"
+    
+    def test_reset_game(self):
+        """Test that resetting reloads the candidates for the new length."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS)
+        game.make_guess("E")
+        game.reset_game(word="CAT")
+        assert game.candidates() == ["CAT", "COT", "DOG"]
+        assert game.guessed_letters == set()
+        assert not game.game_over
+    
+    def test_dictionary_candidates(self):
+        """Test that the default candidates are the dictionary words of the length."""
+        game = EvilHangmanGame("easy", word="CAT")
+        block = get_word_block(3, "easy")
+        assert game.candidate_count == len(block) // 3
+        game.make_guess("E")
+        assert all(len(word) == 3 for word in game.candidates())
+    
+    def test_state_delta_tracks_word_changes(self):
+        """Test that switching words marks the word as changed."""
+        game = EvilHangmanGame(word="HELLO", words=WORDS)
+        version = game.state_version
+        game.make_guess("E")
+        assert game.get_state_delta(version)["word"] == game.word
@@ -0,0 +1,130 @@
+"""Tests for hangman session snapshots and journals."""
+
+import pytest
+import game_metrics
+from hangman.hangman import HangmanGame
+from hangman.persistence import (
+    GAME_OVER, WON, SessionJournal, compact, load_sessions, load_snapshot,
+    replay_journal, restore_game, save_snapshot
+)
+
+def play(game, letters):
+    for letter in letters:
+        game.make_guess(letter)
+    return game
+
+class TestSnapshots:
+    """Test saving and restoring sessions."""
+    
+    def test_round_trip(self, tmp_path):
+        """Test that restored games match the saved ones."""
+        path = str(tmp_path / "sessions.snap")
+        games = {1: play(HangmanGame(word="PYTHON"), "PXZ"),
+                 2: play(HangmanGame(word="CAT"), "CAT"),
+                 2**64 - 1: play(HangmanGame(word="JAZZ", max_wrong_guesses=3), "QWE")}
+        assert save_snapshot(path, games.items()) == 3
+        
+        records = load_snapshot(path)
+        assert set(records) == set(games)
+        for session_id, game in games.items():
+            restored = restore_game(records[session_id])
+            assert restored.get_game_state() == game.get_game_state()
+            assert restored.guessed_letters == game.guessed_letters
+        assert records[2][5] == GAME_OVER | WON
+        assert records[2**64 - 1][5] == GAME_OVER
+    
+    def test_invalid_snapshot(self, tmp_path):
+        """Test that other files are rejected."""
+        path = tmp_path / "bogus.snap"
+        path.write_bytes(b"\0" * 32)
+        with pytest.raises(ValueError):
+            load_snapshot(str(path))
+
+class TestJournal:
+    """Test journaling changes and compacting them into snapshots."""
+    
+    def test_replay_matches_games(self, tmp_path):
+        """Test that replayed records match games played live."""
+        journal_path = str(tmp_path / "sessions.journal")
+        journal = SessionJournal(journal_path)
+        games = {}
+        for session_id, word, letters in ((1, "PYTHON", "PYXTHON"), (2, "GARDEN", "QWRTZUI"),
+                                          (3, "CAT", "C")):
+            games[session_id] = game = HangmanGame(word=word)
+            journal.start(session_id, game)
+            for letter in letters:
+                game.make_guess(letter)
+                journal.guess(session_id, letter)
+        journal.end(3)
+        journal.close()
+        del games[3]
+        
+        records = replay_journal(journal_path, {})
+        assert set(records) == {1, 2}
+        for session_id, game in games.items():
+            assert restore_game(records[session_id]).get_game_state() == game.get_game_state()
+    
+    def test_restore_records_no_metrics(self, tmp_path):
+        """Test that restoring games does not count their guesses again."""
+        path = str(tmp_path / "sessions.snap")
+        save_snapshot(path, [(1, play(HangmanGame(word="CAT"), "CAT"))])
+        metrics = game_metrics.enable()
+        try:
+            game = restore_game(load_snapshot(path)[1])
+        finally:
+            game_metrics.disable()
+        assert game.won is True
+        assert metrics.make_guess_seconds.count == 0
+        assert metrics.hangman_games.values == {}
+    
+    def test_compact(self, tmp_path):
+        """Test folding a journal into the snapshot."""
+        snapshot_path = str(tmp_path / "sessions.snap")
+        journal_path = str(tmp_path / "sessions.journal")
+        save_snapshot(snapshot_path, [(1, play(HangmanGame(word="CAT"), "C"))])
+        
+        journal = SessionJournal(journal_path)
+        journal.guess(1, "a")
+        journal.start(2, HangmanGame(word="DOG"))
+        journal.flush()
+        
+        expected = load_sessions(snapshot_path, journal_path)
+        assert compact(snapshot_path, journal_path, journal) == 2
+        assert load_sessions(snapshot_path, journal_path) == expected
+        assert (tmp_path / "sessions.journal").stat().st_size == 0
+        assert not (tmp_path / "sessions.journal.compacting").exists()
+        
+        journal.guess(1, "T")
+        journal.close()
+        assert restore_game(load_sessions(snapshot_path, journal_path)[1]).won is True
+    
+    def test_compact_keeps_entries_appended_meanwhile(self, tmp_path):
+        """Test that entries written after the journal is moved aside survive."""
+        snapshot_path = str(tmp_path / "sessions.snap")
+        journal_path = str(tmp_path / "sessions.journal")
+        journal = SessionJournal(journal_path)
+        journal.start(1, HangmanGame(word="CAT"))
+        journal.flush()
+        
+        journal.rotate()
+        journal.start(2, HangmanGame(word="DOG"))
+        journal.flush()
+        # A crash here leaves the moved journal, which is still loaded.
+        assert set(load_sessions(snapshot_path, journal_path)) == {1, 2}
+        
+        assert compact(snapshot_path, journal_path, journal) == 1
+        journal.guess(2, "D")
+        journal.close()
+        records = load_sessions(snapshot_path, journal_path)
+        assert set(records) == {1, 2}
+        assert records[2][2] == 1 << 3
+    
+    def test_max_wrong_guesses_out_of_range(self, tmp_path):
+        """Test that games a record cannot hold are refused with ValueError."""
+        game = HangmanGame(word="CAT", max_wrong_guesses=300)
+        with pytest.raises(ValueError):
+            save_snapshot(str(tmp_path / "sessions.snap"), [(1, game)])
+        journal = SessionJournal(str(tmp_path / "sessions.journal"))
+        with pytest.raises(ValueError):
+            journal.start(1, game)
+        journal.close()
@@ -0,0 +1,213 @@
+"""Tests for multiplayer hangman rooms."""
+
+import asyncio
+import json
+from hangman.rooms import TURNS, Room, RoomTable
+from hangman.server import SessionTable, handle_request, start_server
+
+class Inbox:
+    """Collects the messages sent to a room member."""
+    
+    def __init__(self):
+        self.payloads = []
+    
+    def __call__(self, payload):
+        self.payloads.append(payload)
+    
+    @property
+    def messages(self):
+        return [json.loads(payload) for payload in self.payloads]
+
+class TestRoom:
+    """Test shared games in rooms."""
+    
+    def test_join_sends_state(self):
+        """Test that joining members get the state without the word."""
+        room = Room("lobby", word="CAT")
+        inbox = Inbox()
+        room.join("ann", inbox)
+        
+        message = inbox.messages[0]
+        assert message["state"]["word_progress"] == "_ _ _"
+        assert "word" not in message["state"]
+        assert message["players"] == ["ann"]
+    
+    def test_tick_coalesces_guesses(self):
+        """Test that one tick applies queued guesses in order and broadcasts once."""
+        room = Room("lobby", word="CAT")
+        ann, bob, spectator = Inbox(), Inbox(), Inbox()
+        room.join("ann", ann)
+        room.join("bob", bob)
+        room.join("eve", spectator, play=False)
+        
+        assert room.submit("ann", "c")
+        assert room.submit("bob", "x")
+        assert room.submit("bob", "c")
+        assert not room.submit("eve", "a")
+        assert room.tick() == 3
+        
+        message = spectator.messages[-1]
+        assert [result["status"] for result in message["results"]] == ["correct", "wrong", "duplicate"]
+        assert message["delta"]["word_progress"] == "C _ _"
+        assert message["delta"]["wrong_guesses"] == 1
+        assert "word" not in message["delta"]
+        # Every member gets the very same bytes
+        assert ann.payloads[-1] is bob.payloads[-1] is spectator.payloads[-1]
+        
+        assert room.tick() == 0
+        assert len(spectator.payloads) == 2
+    
+    def test_delta_has_only_changes(self):
+        """Test that a broadcast only carries the fields changed since the last one."""
+        room = Room("lobby", word="CAT")
+        inbox = Inbox()
+        room.join("ann", inbox)
+        room.submit("ann", "x")
+        room.tick()
+        room.submit("ann", "c")
+        room.tick()
+        
+        delta = inbox.messages[-1]["delta"]
+        assert "wrong_guesses" not in delta and "hangman_art" not in delta
+        assert delta["word_progress"] == "C _ _"
+    
+    def test_word_revealed_at_game_over(self):
+        """Test that the word is broadcast once the game is over."""
+        room = Room("lobby", word="CAT")
+        inbox = Inbox()
+        room.join("ann", inbox)
+        for letter in "cat":
+            room.submit("ann", letter)
+        room.tick()
+        assert inbox.messages[-1]["delta"]["word"] == "CAT"
+        
+        room.submit("ann", "d")
+        room.tick()
+        assert inbox.messages[-1]["error"] == "The game is over."
+        
+        room.new_round(word="DOG")
+        room.tick()
+        delta = inbox.messages[-1]["delta"]
+        assert delta["word_progress"] == "_ _ _" and delta["game_over"] is False
+        assert "word" not in delta
+    
+    def test_turns(self):
+        """Test that players guess in turn and out-of-turn guesses are rejected privately."""
+        room = Room("lobby", mode=TURNS, word="BANANA")
+        ann, bob = Inbox(), Inbox()
+        room.join("ann", ann)
+        room.join("bob", bob)
+        
+        room.submit("bob", "a")
+        room.submit("ann", "a")
+        room.submit("ann", "n")
+        room.submit("bob", "n")
+        room.tick()
+        
+        assert bob.messages[1]["error"] == "It is not your turn."
+        assert [message.get("error") for message in ann.messages[1:]] == ["It is not your turn.", None]
+        results = ann.messages[-1]["results"]
+        assert [(result["player"], result["letter"]) for result in results] == [("ann", "a"), ("bob", "n")]
+        assert ann.messages[-1]["turn"] == "ann"
+    
+    def test_leaving_passes_the_turn(self):
+        """Test that the turn stays with the right player when players leave."""
+        room = Room("lobby", mode=TURNS, word="CAT")
+        for player in ("ann", "bob", "cy"):
+            room.join(player, Inbox())
+        room.submit("ann", "x")
+        room.tick()
+        assert room.current_player == "bob"
+        room.leave("ann")
+        assert room.current_player == "bob"
+        room.leave("bob")
+        assert room.current_player == "cy"
+
+    def test_guesses_of_departed_players_are_dropped(self):
+        """Test that guesses queued by a player who then left are not applied."""
+        room = Room("lobby", word="CAT")
+        ann, bob = Inbox(), Inbox()
+        room.join("ann", ann)
+        room.join("bob", bob)
+        room.submit("ann", "c")
+        room.submit("bob", "a")
+        room.leave("ann")
+        
+        assert room.tick() == 1
+        assert [result["player"] for result in bob.messages[-1]["results"]] == ["bob"]
+        assert "C" not in room.game.guessed_letters
+
+class TestRoomTable:
+    """Test the room table."""
+    
+    def test_only_active_rooms_tick(self):
+        """Test that ticking skips rooms without queued guesses and empty rooms close."""
+        rooms = RoomTable()
+        quiet, busy = Inbox(), Inbox()
+        rooms.join("quiet", "ann", quiet, word="CAT")
+        rooms.join("busy", "bob", busy, word="DOG")
+        rooms.submit("busy", "bob", "d")
+        
+        assert rooms.tick() == 1
+        assert len(quiet.payloads) == 1 and len(busy.payloads) == 2
+        rooms.leave_all("ann")
+        assert len(rooms) == 1
+
+class TestServerRooms:
+    """Test rooms over the TCP server."""
+    
+    def test_room_requests_are_checked(self):
+        """Test that bad difficulties and new words from non-players are refused."""
+        rooms = RoomTable()
+        sessions = SessionTable()
+        
+        def request(member_id, **message):
+            return handle_request(sessions, message, rooms, member_id, Inbox())
+        
+        assert request("ann", op="join", room="lobby", difficulty=["x"])["ok"] is False
+        assert len(rooms) == 0
+        assert request("ann", op="join", room="lobby", difficulty="easy") == {"ok": True}
+        assert request("eve", op="join", room="lobby", spectate=True) == {"ok": True}
+        version = rooms.get("lobby").game.state_version
+        
+        assert request("mallory", op="room_new", room="lobby")["ok"] is False
+        assert request("eve", op="room_new", room="lobby")["ok"] is False
+        assert request("ann", op="room_new", room="lobby", difficulty={})["ok"] is False
+        assert rooms.get("lobby").game.state_version == version
+        assert request("ann", op="room_new", room="lobby") == {"ok": True}
+        assert request("ann", op="room_new", room="hall")["ok"] is False
+    
+    def test_room_over_tcp(self):
+        """Test joining a room and receiving a broadcast after guessing."""
+        async def scenario():
+            rooms = RoomTable()
+            server = await start_server(SessionTable(), rooms=rooms)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            
+            async def send(message):
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+            
+            async def receive():
+                return json.loads(await reader.readline())
+            
+            await send({"op": "join", "room": "lobby"})
+            assert "state" in await receive()
+            assert await receive() == {"ok": True}
+            await send({"op": "room_guess", "room": "lobby", "letter": "e"})
+            assert await receive() == {"ok": True}
+            await send({"op": "room_guess", "room": "hall", "letter": "e"})
+            assert await receive() == {"ok": False, "error": "Unknown room."}
+            
+            rooms.tick()
+            message = await receive()
+            assert message["results"][0]["letter"] == "e"
+            
+            writer.close()
+            await asyncio.sleep(0.01)
+            assert len(rooms) == 0
+            server.close()
+            await server.wait_closed()
+        
+        asyncio.run(scenario())
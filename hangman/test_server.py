@@ -0,0 +1,131 @@
+"""Tests for the hangman session server."""
+
+import asyncio
+import json
+from unittest.mock import patch
+from hangman.server import SessionTable, handle_request, start_server
+
+class FakeClock:
+    """Clock that only moves when told to."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestSessionTable:
+    """Test the session table."""
+    
+    def test_create_and_get(self):
+        """Test creating and looking up sessions."""
+        sessions = SessionTable()
+        session_id, game = sessions.create("easy")
+        
+        assert sessions.get(session_id) is game
+        assert len(sessions) == 1
+        sessions.remove(session_id)
+        assert len(sessions) == 0
+    
+    def test_expire_idle_sessions(self):
+        """Test that only idle sessions expire."""
+        clock = FakeClock()
+        sessions = SessionTable(idle_timeout=10, clock=clock)
+        old_id, _ = sessions.create()
+        clock.now = 5
+        fresh_id, _ = sessions.create()
+        clock.now = 12
+        
+        assert sessions.expire() == 1
+        assert sessions.get(fresh_id)
+        clock.now = 20
+        assert sessions.expire() == 0
+        clock.now = 40
+        assert sessions.expire() == 1
+        assert len(sessions) == 0
+    
+    def test_ended_sessions_recycle_games(self):
+        """Test that removed and expired sessions return their games to the pool."""
+        clock = FakeClock()
+        sessions = SessionTable(idle_timeout=10, clock=clock)
+        session_id, game = sessions.create()
+        sessions.remove(session_id)
+        assert len(sessions.pool) == 1
+        
+        _, reused = sessions.create("easy")
+        assert reused is game
+        clock.now = 20
+        sessions.expire()
+        assert len(sessions.pool) == 1
+
+class TestHandleRequest:
+    """Test the request protocol."""
+    
+    @patch('hangman.hangman.get_random_word')
+    def test_game_over_protocol(self, mock_get_word):
+        """Test playing a game through requests."""
+        mock_get_word.return_value = "CAT"
+        sessions = SessionTable()
+        
+        response = handle_request(sessions, {"op": "new"})
+        assert response["ok"] is True
+        assert "word" not in response["state"]
+        session_id = response["session"]
+        
+        response = handle_request(sessions, {"op": "guess", "session": session_id, "letter": "c"})
+        assert response["result"]["status"] == "correct"
+        assert response["state"]["word_progress"] == "C _ _"
+        
+        handle_request(sessions, {"op": "guess", "session": session_id, "letter": "a"})
+        response = handle_request(sessions, {"op": "guess", "session": session_id, "letter": "t"})
+        assert response["result"]["status"] == "win"
+        assert response["state"]["word"] == "CAT"
+        
+        assert handle_request(sessions, {"op": "end", "session": session_id}) == {"ok": True}
+        assert handle_request(sessions, {"op": "state", "session": session_id})["ok"] is False
+    
+    def test_bad_requests(self):
+        """Test that bad requests get error responses."""
+        sessions = SessionTable()
+        assert handle_request(sessions, [])["ok"] is False
+        assert handle_request(sessions, {"op": "fly"})["ok"] is False
+        assert handle_request(sessions, {"op": "guess", "session": "nope", "letter": "A"})["ok"] is False
+        assert handle_request(sessions, {"op": "new", "max_wrong_guesses": 0})["ok"] is False
+        assert handle_request(sessions, {"op": "new", "max_wrong_guesses": 300})["ok"] is False
+        assert handle_request(sessions, {"op": "new", "max_wrong_guesses": True})["ok"] is False
+        assert handle_request(sessions, {"op": "new", "difficulty": ["x"]})["ok"] is False
+        assert handle_request(sessions, {"op": "new", "difficulty": "extreme"})["ok"] is False
+        assert handle_request(sessions, {"op": "end", "session": [1]})["ok"] is False
+        assert handle_request(sessions, {"op": "state", "session": {}})["ok"] is False
+        assert len(sessions) == 0
+        session_id = handle_request(sessions, {"op": "new"})["session"]
+        assert handle_request(sessions, {"op": "guess", "session": session_id})["ok"] is False
+
+class TestServer:
+    """Test the server over a real socket."""
+    
+    def test_round_trip(self):
+        """Test sending requests to a running server."""
+        async def scenario():
+            sessions = SessionTable()
+            server = await start_server(sessions)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            
+            writer.write(b'{"op": "new", "difficulty": "easy"}\n')
+            created = json.loads(await reader.readline())
+            writer.write(json.dumps({"op": "guess", "session": created["session"],
+                                     "letter": "#"}).encode() + b"\n")
+            guessed = json.loads(await reader.readline())
+            writer.write(b"not json\n")
+            invalid = json.loads(await reader.readline())
+            
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return created, guessed, invalid
+        
+        created, guessed, invalid = asyncio.run(scenario())
+        assert created["ok"] is True
+        assert guessed["result"]["status"] == "invalid"
+        assert invalid == {"ok": False, "error": "Invalid JSON."}
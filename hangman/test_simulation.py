@@ -0,0 +1,69 @@
+"""Tests for the headless hangman simulations."""
+
+from hangman.hangman import HangmanGame
+from hangman.simulation import (
+    CHUNK_SIZE, frequency_strategy, play_headless, random_strategy, simulate
+)
+from hangman.words import compile_word_store, get_random_word, get_word_store, use_word_store
+
+def invalid_strategy(rng):
+    """Strategy that only makes invalid guesses."""
+    return lambda game: "#"
+
+class TestSimulation:
+    """Test simulating games against strategies."""
+    
+    def test_play_headless(self):
+        """Test playing a single game to the end."""
+        game = HangmanGame(word="TEA")
+        guesses = play_headless(game, frequency_strategy(None))
+        
+        assert game.won is True
+        assert guesses == 3
+    
+    def test_play_headless_gives_up_on_invalid_guesses(self):
+        """Test that a guesser that never makes a valid guess is abandoned."""
+        game = HangmanGame(word="TEA")
+        assert play_headless(game, invalid_strategy(None)) == 0
+        assert game.game_over is False
+    
+    def test_simulate_summary(self):
+        """Test the summary of a small simulation."""
+        summary = simulate(200, random_strategy, difficulty="easy", workers=1)
+        
+        assert summary["games"] == 200
+        assert summary["win_rate"] == summary["wins"] / 200
+        assert sum(summary["guess_counts"].values()) == 200
+        assert sum(summary["wrong_guesses"].values()) == 200
+        assert max(summary["wrong_guesses"]) <= 6
+    
+    def test_simulate_is_reproducible(self):
+        """Test that a seed fixes the results, whatever the worker count."""
+        games = CHUNK_SIZE + 50
+        first = simulate(games, random_strategy, seed=7, workers=1)
+        
+        assert simulate(games, random_strategy, seed=7, workers=1) == first
+        assert simulate(games, random_strategy, seed=7, workers=2) == first
+        assert simulate(games, random_strategy, seed=8, workers=1) != first
+    
+    def test_simulate_max_wrong_guesses(self):
+        """Test that the wrong-guess limit is applied to simulated games."""
+        summary = simulate(50, random_strategy, difficulty="hard", max_wrong_guesses=26, workers=1)
+        assert summary["win_rate"] == 1.0
+    
+    def test_simulate_leaves_word_store_alone(self, tmp_path):
+        """Test that a word store given to an in-process run is not selected."""
+        path = str(tmp_path / "words.hws")
+        active_path = str(tmp_path / "active.hws")
+        compile_word_store(path, {"easy": ["cat"], "medium": ["garden"], "hard": ["tea"]})
+        compile_word_store(active_path, {"easy": ["dog"], "medium": ["planet"], "hard": ["jazz"]})
+        active = use_word_store(active_path)
+        try:
+            summary = simulate(20, frequency_strategy, difficulty="hard", workers=1,
+                               word_store=path)
+            assert get_word_store() is active
+            assert get_random_word("hard") == "JAZZ"
+        finally:
+            use_word_store(None)
+        
+        assert summary["wins"] == 20 and summary["wrong_guesses"] == {0: 20}
@@ -0,0 +1,53 @@
+"""Tests for the hangman solver."""
+
+import pytest
+from hangman.hangman import HangmanGame
+from hangman.simulation import simulate
+from hangman.solver import HangmanSolver
+from hangman.words import ALL_WORDS
+
+WORDS = ["hello", "hallo", "hills", "jelly", "cat", "cot", "dog"]
+
+class TestHangmanSolver:
+    """Test narrowing candidates and suggesting guesses."""
+    
+    def test_candidates_revealed_letters(self):
+        """Test that revealed letters fix their positions."""
+        solver = HangmanSolver(WORDS)
+        assert solver.candidates("_ _ L L _", {"L"}) == ["HALLO", "HELLO", "HILLS", "JELLY"]
+        assert solver.candidates("H _ l l _", {"l", "H"}) == ["HALLO", "HELLO", "HILLS"]
+        assert solver.candidates("_____", set()) == ["HALLO", "HELLO", "HILLS", "JELLY"]
+    
+    def test_candidates_exclude_hidden_and_wrong_letters(self):
+        """Test that guessed letters are ruled out where they are hidden."""
+        solver = HangmanSolver(WORDS)
+        assert solver.candidates("_ _ L L _", {"L", "A"}) == ["HELLO", "HILLS", "JELLY"]
+        assert solver.candidates("_ E L L _", {"L", "E"}) == ["HELLO", "JELLY"]
+        assert solver.candidates("_ O _", {"O"}) == ["COT", "DOG"]
+        assert solver.candidates("_ _ _", {"O"}) == ["CAT"]
+    
+    def test_best_guess(self):
+        """Test that the suggested letter splits the candidates."""
+        solver = HangmanSolver(WORDS)
+        assert solver.best_guess("_ _ L L _", {"L"}) == "H"
+        assert solver.best_guess("_ _ L L _", {"L", "H"}) == "E"
+        assert solver.best_guess("C _ T", {"C", "T"}) in ("A", "O")
+        assert solver.best_guess("_ _ _ _ _ _ _ _ _ _ _ _", set()) == "E"
+    
+    def test_hint(self):
+        """Test suggesting a guess for a game."""
+        game = HangmanGame(word="JELLY")
+        solver = HangmanSolver(WORDS, method="entropy")
+        game.make_guess("L")
+        game.make_guess("E")
+        assert solver.hint(game) in ("H", "O", "J", "Y")
+    
+    def test_unknown_method(self):
+        """Test that unknown guessing methods are rejected."""
+        with pytest.raises(ValueError):
+            HangmanSolver(WORDS, method="magic")
+    
+    def test_solver_strategy_wins_with_full_dictionary(self):
+        """Test the solver as a simulation strategy."""
+        summary = simulate(300, HangmanSolver(ALL_WORDS), workers=1)
+        assert summary["win_rate"] > 0.9
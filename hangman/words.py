@@ -0,0 +1,357 @@
+"""Word lists and word selection for the hangman game.
+
+Small built-in word lists are used by default. Large dictionaries are
+compiled once into a word store file with ``compile_word_store`` and
+memory-mapped by every process that uses them, so picking a word never
+requires building or upper-casing a list in memory.
+
+Word store layout (all integers little-endian):
+
+    header   magic b"HWS1", bucket count (u32), total words (u32)
+    buckets  one 16-byte entry per (tier, length) bucket:
+             tier (u8), length (u8), padding (2 bytes),
+             word count (u32), data offset (u32), first word id (u32)
+    data     the words of each bucket, upper-case ASCII, sorted and
+             packed back to back with no separators
+
+Because every word in a bucket has the same length, the word with index
+``i`` in a bucket starts at ``offset + i * length``.
+"""
+
+import bisect
+import mmap
+import os
+import random
+import struct
+import sys
+
+from random_source import default_source
+
+EASY_WORDS = [
+    "CAT", "DOG", "SUN", "HAT", "CAR", "BOOK", "TREE", "FISH", "BIRD", "CAKE",
+    "MILK", "BALL", "DOOR", "HAND", "RAIN", "STAR", "MOON", "SHIP", "FROG", "LAMP",
+]
+
+MEDIUM_WORDS = [
+    "PYTHON", "GARDEN", "PLANET", "BRIDGE", "CASTLE", "JUNGLE", "ORANGE", "PENCIL",
+    "ROCKET", "SILVER", "WINTER", "FOREST", "MARKET", "KITTEN", "ISLAND", "BASKET",
+    "DRAGON", "CANDLE", "FLOWER", "GUITAR",
+]
+
+HARD_WORDS = [
+    "XYLOPHONE", "JAZZ", "QUIZZICAL", "RHYTHM", "SPHINX", "ZEPHYR", "BUZZWORD",
+    "OXYGEN", "KAYAK", "MYSTIFY", "PNEUMONIA", "AWKWARD", "BAGPIPES", "JUKEBOX",
+    "SYZYGY", "CRYPT", "GLYPH", "IVORY", "VORTEX", "WALTZ",
+]
+
+ALL_WORDS = EASY_WORDS + MEDIUM_WORDS + HARD_WORDS
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+_WORDS_BY_DIFFICULTY = {
+    "easy": EASY_WORDS,
+    "medium": MEDIUM_WORDS,
+    "hard": HARD_WORDS,
+}
+
+STORE_MAGIC = b"HWS1"
+STORE_ENV_VAR = "HANGMAN_WORD_STORE"
+
+_HEADER = struct.Struct("<4sII")
+_BUCKET = struct.Struct("<BBxxIII")
+
+def _normalize_word(word):
+    """Upper-case a word and check that it only contains ASCII letters.
+
+    Args:
+        word (str): Raw word
+
+    Returns:
+        str: The normalized word, or an empty string if it is unusable
+    """
+    word = word.strip().upper()
+    if not word.isascii() or not word.isalpha() or len(word) > 255:
+        return ""
+    return word
+
+def compile_word_store(path, tiers):
+    """Compile word lists into a memory-mappable word store file.
+
+    Words are normalized, de-duplicated within each tier and grouped by
+    length. The file is written next to its destination and moved into
+    place, so processes that already have it mapped are never exposed to
+    a partially written store.
+
+    Args:
+        path (str): Destination file path
+        tiers (dict): Mapping of difficulty ('easy', 'medium', 'hard') to
+            an iterable of words
+
+    Returns:
+        int: Number of words written to the store
+    """
+    buckets = {}
+    for difficulty, words in tiers.items():
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty: {difficulty!r}")
+        tier = DIFFICULTIES.index(difficulty)
+        for word in words:
+            word = _normalize_word(word)
+            if word:
+                buckets.setdefault((tier, len(word)), set()).add(word)
+
+    keys = sorted(buckets)
+    offset = _HEADER.size + _BUCKET.size * len(keys)
+    first_id = 0
+    table = []
+    for tier, length in keys:
+        count = len(buckets[(tier, length)])
+        table.append(_BUCKET.pack(tier, length, count, offset, first_id))
+        offset += count * length
+        first_id += count
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(STORE_MAGIC, len(keys), first_id))
+        f.write(b"".join(table))
+        for key in keys:
+            f.write("".join(sorted(buckets[key])).encode("ascii"))
+    os.replace(tmp_path, path)
+    return first_id
+
+class WordStore:
+    """Read-only, memory-mapped view of a compiled word store."""
+
+    def __init__(self, path):
+        """Open and map a word store file.
+
+        Args:
+            path (str): Path of a file written by ``compile_word_store``
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, bucket_count, total = _HEADER.unpack_from(self._data, 0)
+        if magic != STORE_MAGIC:
+            self._data.close()
+            raise ValueError(f"{path} is not a hangman word store")
+
+        self.total = total
+        self._buckets = [
+            _BUCKET.unpack_from(self._data, _HEADER.size + i * _BUCKET.size)
+            for i in range(bucket_count)
+        ]
+        # Cumulative word counts per tier and per (tier, length), so a
+        # uniformly random word is one randrange and a short bisect away.
+        # Tier None covers the whole store.
+        self._index = {}
+        for tier, length, count, offset, first_id in self._buckets:
+            entry = (count, offset, length)
+            for key in (tier, (tier, length), None, (None, length)):
+                ends, entries = self._index.setdefault(key, ([], []))
+                ends.append((ends[-1] if ends else 0) + count)
+                entries.append(entry)
+        self._first_ids = [bucket[4] for bucket in self._buckets]
+
+    def __len__(self):
+        return self.total
+
+    def close(self):
+        """Unmap the store file."""
+        self._data.close()
+
+    def count(self, difficulty="random", length=None):
+        """Count the words available for a difficulty and word length.
+
+        Args:
+            difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random')
+            length (int): Only count words of this length, if given
+
+        Returns:
+            int: Number of matching words
+        """
+        tier = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else None
+        ends, _ = self._index.get(tier if length is None else (tier, length), ([0], []))
+        return ends[-1]
+
+    def _read(self, offset, length):
+        # Interned, so games playing the same word share one string.
+        return sys.intern(self._data[offset:offset + length].decode("ascii"))
+
+    def word_at(self, word_id):
+        """Get a word by its position in the store.
+
+        Args:
+            word_id (int): Word id, from 0 to ``len(store) - 1``
+
+        Returns:
+            str: The word
+        """
+        if not 0 <= word_id < self.total:
+            raise IndexError("word id out of range")
+        bucket = bisect.bisect_right(self._first_ids, word_id) - 1
+        _, length, _, offset, first_id = self._buckets[bucket]
+        return self._read(offset + (word_id - first_id) * length, length)
+
+    def word_id(self, word):
+        """Find the id of a word.
+
+        Args:
+            word (str): Word to look up, in any case
+
+        Returns:
+            int: Id of the word in the lowest tier that has it
+
+        Raises:
+            KeyError: If the word is not in the store
+        """
+        key = word.upper().encode("ascii", "replace")
+        length = len(key)
+        for _, word_length, count, offset, first_id in self._buckets:
+            if word_length != length:
+                continue
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                start = offset + middle * length
+                if self._data[start:start + length] < key:
+                    low = middle + 1
+                else:
+                    high = middle
+            start = offset + low * length
+            if low < count and self._data[start:start + length] == key:
+                return first_id + low
+        raise KeyError(word)
+
+    def word_block(self, difficulty="random", length=None):
+        """Get all the words of one length, packed back to back.
+
+        Args:
+            difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random').
+                Unknown difficulties take words from the whole store.
+            length (int): Length of the words
+
+        Returns:
+            bytes: The upper-case ASCII words, ``length`` bytes each
+        """
+        tier = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else None
+        _, entries = self._index.get((tier, length), ([], []))
+        return b"".join(self._data[offset:offset + count * word_length]
+                        for count, offset, word_length in entries)
+
+    def random_word(self, difficulty="random", length=None, rng=random):
+        """Pick a uniformly random word.
+
+        Args:
+            difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random').
+                Unknown difficulties pick from the whole store.
+            length (int): Only pick words of this length, if given
+            rng: Random number generator providing ``randrange``
+
+        Returns:
+            str: The selected word in upper case
+        """
+        tier = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else None
+        ends, entries = self._index.get(tier if length is None else (tier, length), ([], []))
+        if not ends:
+            raise LookupError(f"No {difficulty} words of length {length}")
+        pick = rng.randrange(ends[-1])
+        bucket = bisect.bisect_right(ends, pick)
+        count, offset, word_length = entries[bucket]
+        index = pick - (ends[bucket] - count)
+        return self._read(offset + index * word_length, word_length)
+
+_store = None
+_store_checked = False
+_all_word_ids = None
+
+def use_word_store(path):
+    """Select the word store used by ``get_random_word``.
+
+    Args:
+        path (str): Path of a compiled word store, or None to go back to
+            the built-in word lists
+
+    Returns:
+        WordStore: The opened store, or None
+    """
+    global _store, _store_checked
+    if _store is not None:
+        _store.close()
+    _store = WordStore(path) if path else None
+    _store_checked = True
+    return _store
+
+def get_word_store():
+    """Get the active word store.
+
+    On first use the store named by the ``HANGMAN_WORD_STORE`` environment
+    variable is opened, if it is set.
+
+    Returns:
+        WordStore: The active store, or None when using the built-in lists
+    """
+    if not _store_checked:
+        use_word_store(os.environ.get(STORE_ENV_VAR))
+    return _store
+
+def get_word_id(word):
+    """Get the id of a word in the active store or the built-in lists.
+
+    Raises:
+        KeyError: If the word is unknown
+    """
+    global _all_word_ids
+    store = get_word_store()
+    if store is not None:
+        return store.word_id(word)
+    if _all_word_ids is None:
+        _all_word_ids = {}
+        for index, known in enumerate(ALL_WORDS):
+            _all_word_ids.setdefault(known, index)
+    return _all_word_ids[word.upper()]
+
+def get_word_by_id(word_id):
+    """Get a word by its id in the active store or the built-in lists."""
+    store = get_word_store()
+    if store is not None:
+        return store.word_at(word_id)
+    return ALL_WORDS[word_id]
+
+def get_random_word(difficulty="random", rng=None):
+    """Get a random word for the given difficulty.
+
+    Args:
+        difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random').
+            Unknown difficulties pick from all words.
+        rng: Random number generator to draw with, such as a seeded
+            ``random_source.RandomSource``; defaults to
+            ``random_source.default_source()``
+
+    Returns:
+        str: A random word in upper case
+    """
+    if rng is None:
+        rng = default_source()
+    store = get_word_store()
+    if store is not None:
+        return store.random_word(difficulty, rng=rng)
+    return rng.choice(_WORDS_BY_DIFFICULTY.get(difficulty, ALL_WORDS))
+
+def get_word_block(length, difficulty="random"):
+    """Get the words of one length from the active store or the built-in lists.
+
+    Args:
+        length (int): Length of the words
+        difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'random').
+            Unknown difficulties take words from all words.
+
+    Returns:
+        bytes: The upper-case ASCII words, ``length`` bytes each, back to back
+    """
+    store = get_word_store()
+    if store is not None:
+        return store.word_block(difficulty, length)
+    words = _WORDS_BY_DIFFICULTY.get(difficulty, ALL_WORDS)
+    return "".join(word for word in words if len(word) == length).encode("ascii")
@@ -0,0 +1,337 @@
+"""SQLite leaderboard for finished games.
+
+Games are recorded without blocking the game loop: record() puts the
+result on a queue, and a background thread writes queued results in
+batches, one transaction per batch. The database runs in WAL mode, so
+leaderboard queries read a consistent snapshot while games are written.
+
+Every game is kept in the ``games`` table, indexed by player and time.
+Each batch also adds its games to two aggregate tables: ``player_totals``,
+one row per game type and player, ranked by an index so the all-time top
+players are read straight off it, and ``daily_totals``, one row per game
+type, day and player, so the top players over the last few days are found
+by summing at most that many rows per player instead of scanning every
+recorded game.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+GAME_TYPES = ("hangman", "rps")
+
+# Largest number of games written in one transaction
+BATCH_SIZE = 500
+
+# Seconds the writer waits for more games before writing a partial batch
+FLUSH_INTERVAL = 0.5
+
+SECONDS_PER_DAY = 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    game TEXT NOT NULL,
+    player TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    won INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    opponent_score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_player ON games (player, game, played_at);
+CREATE TABLE IF NOT EXISTS daily_totals (
+    game TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (game, day, player)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_totals (
+    game TEXT NOT NULL,
+    player TEXT NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (game, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS player_totals_by_rank ON player_totals (game, wins DESC, score DESC);
+"""
+
+_INSERT_GAME = """
+INSERT INTO games (game, player, played_at, won, score, opponent_score)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_ADD_TO_DAY = """
+INSERT INTO daily_totals (game, day, player, games, wins, score)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (game, day, player) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    score = score + excluded.score
+"""
+
+_ADD_TO_PLAYER = """
+INSERT INTO player_totals (game, player, games, wins, score)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (game, player) DO UPDATE SET
+    games = games + excluded.games,
+    wins = wins + excluded.wins,
+    score = score + excluded.score
+"""
+
+_TOP_ALL_TIME = """
+SELECT player, wins, games, score
+FROM player_totals
+WHERE game = ?
+ORDER BY wins DESC, score DESC, player
+LIMIT ?
+"""
+
+_TOP = """
+SELECT player, SUM(wins) AS wins, SUM(games) AS games, SUM(score) AS score
+FROM daily_totals
+WHERE game = ? AND day >= ?
+GROUP BY player
+ORDER BY wins DESC, score DESC, player
+LIMIT ?
+"""
+
+_HISTORY = """
+SELECT played_at, won, score, opponent_score
+FROM games
+WHERE player = ? AND game = ?
+ORDER BY played_at DESC
+LIMIT ?
+"""
+
+_PLAYER = """
+SELECT game, games, wins, score
+FROM player_totals
+WHERE player = ?
+ORDER BY game
+"""
+
+# Queue item that stops the writer thread
+_STOP = None
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only syncs at checkpoints; a crash can lose the last
+    # few batches but never corrupts the database.
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+def _day(timestamp):
+    return int(timestamp // SECONDS_PER_DAY)
+
+class Leaderboard:
+    """Leaderboard stored in a SQLite database, written by a background thread."""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 clock=time.time):
+        """Open or create a leaderboard database and start its writer.
+
+        Args:
+            path (str): Database file path
+            batch_size (int): Largest number of games written per transaction
+            flush_interval (float): Seconds to wait for a full batch
+            clock: Function returning the current Unix time
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._connection = _connect(path)
+        self._connection.executescript(SCHEMA)
+        self._queue = queue.Queue()
+        self._error = None
+        self._writer = threading.Thread(target=self._write_batches, name="leaderboard-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def record(self, game, player, won, score, opponent_score=0, played_at=None):
+        """Queue a finished game to be written.
+
+        Args:
+            game (str): Game type, 'hangman' or 'rps'
+            player (str): Player name
+            won (bool): Whether the player won
+            score (int): The player's score
+            opponent_score (int): The opponent's score, or mistakes made
+            played_at (float): Unix time the game finished; now if None
+        """
+        if game not in GAME_TYPES:
+            raise ValueError(f"Unknown game type: {game!r}")
+        for value in (score, opponent_score):
+            if not isinstance(value, int):
+                raise TypeError(f"Scores must be integers: {value!r}")
+        if self._error is not None:
+            raise RuntimeError("leaderboard writer failed") from self._error
+        if played_at is None:
+            played_at = self.clock()
+        self._queue.put((game, player, played_at, int(bool(won)), score, opponent_score))
+
+    def record_rps(self, player, user_score, computer_score, played_at=None):
+        """Queue a rock paper scissors session; the player won if they scored more."""
+        self.record("rps", player, user_score > computer_score, user_score, computer_score,
+                    played_at)
+
+    def record_hangman(self, player, won, wrong_guesses, played_at=None):
+        """Queue a hangman game; it scores one point when won."""
+        self.record("hangman", player, won, int(bool(won)), wrong_guesses, played_at)
+
+    def _write_batches(self):
+        # Any failure is kept for record and flush to raise, and the queue is
+        # still drained so that flush never waits on games that will not be
+        # written.
+        try:
+            connection = _connect(self.path)
+        except Exception as error:
+            connection = None
+            self._error = error
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        batch.append(self._queue.get(timeout=timeout) if timeout > 0
+                                     else self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch[-1] is _STOP:
+                    stopping = True
+                    games = batch[:-1]
+                else:
+                    games = batch
+                try:
+                    if games and self._error is None:
+                        self._write(connection, games)
+                except Exception as error:
+                    self._error = error
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            if connection is not None:
+                connection.close()
+
+    def _write(self, connection, games):
+        daily = {}
+        players = {}
+        for game, player, played_at, won, score, _ in games:
+            for totals, key in ((daily, (game, _day(played_at), player)),
+                                (players, (game, player))):
+                count, wins, total = totals.get(key, (0, 0, 0))
+                totals[key] = (count + 1, wins + won, total + score)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.executemany(_INSERT_GAME, games)
+            connection.executemany(_ADD_TO_DAY, [key + value for key, value in daily.items()])
+            connection.executemany(_ADD_TO_PLAYER,
+                                   [key + value for key, value in players.items()])
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def flush(self):
+        """Wait until every queued game has been written.
+
+        Raises:
+            RuntimeError: If the writer failed to write a batch
+        """
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("leaderboard writer failed") from self._error
+
+    def close(self):
+        """Write the queued games, stop the writer and close the database.
+
+        Raises:
+            RuntimeError: If the writer failed to write a batch
+        """
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._connection.close()
+        if self._error is not None:
+            raise RuntimeError("leaderboard writer failed") from self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def top(self, game, days=None, limit=10):
+        """Get the players with the most wins.
+
+        Args:
+            game (str): Game type, 'hangman' or 'rps'
+            days (int): Only count the last this many days, including
+                today; all time if None
+            limit (int): Number of players to return
+
+        Returns:
+            list: (player, wins, games, score) tuples, best first
+        """
+        if days is None:
+            return self._connection.execute(_TOP_ALL_TIME, (game, limit)).fetchall()
+        first_day = _day(self.clock()) - days + 1
+        return self._connection.execute(_TOP, (game, first_day, limit)).fetchall()
+
+    def player_stats(self, player):
+        """Get a player's totals for each game type.
+
+        Returns:
+            dict: Game type to a dict with games, wins and score
+        """
+        rows = self._connection.execute(_PLAYER, (player,)).fetchall()
+        return {game: {"games": games, "wins": wins, "score": score}
+                for game, games, wins, score in rows}
+
+    def history(self, player, game, limit=10):
+        """Get a player's most recent games.
+
+        Returns:
+            list: (played_at, won, score, opponent_score) tuples, newest first
+        """
+        return self._connection.execute(_HISTORY, (player, game, limit)).fetchall()
+
+def default_player():
+    """Get the name games are recorded under when no player is given."""
+    return os.environ.get("USER") or os.environ.get("USERNAME") or "player"
+
+def main(argv=None):
+    """Show the leaderboard from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the game leaderboard.")
+    parser.add_argument("database")
+    parser.add_argument("--game", choices=GAME_TYPES, default="rps")
+    parser.add_argument("--days", type=int, help="only count the last DAYS days")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--player", help="show one player's totals instead")
+    args = parser.parse_args(argv)
+
+    with Leaderboard(args.database) as board:
+        if args.player:
+            for game, stats in board.player_stats(args.player).items():
+                print(f"{game}: {stats['wins']} wins in {stats['games']} games, "
+                      f"score {stats['score']}")
+            return
+        for place, (player, wins, games, score) in enumerate(
+                board.top(args.game, args.days, args.limit), 1):
+            print(f"{place:>3}. {player:<20} {wins:>6} wins {games:>7} games {score:>8} points")
+
+if __name__ == "__main__":
+    main()
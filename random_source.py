@@ -0,0 +1,119 @@
+"""Seedable random source that draws random indexes in blocks.
+
+Picking a computer move or a word only needs a random index below a small
+bound, but every call to the ``random`` module pays for a Python-level
+rejection loop. RandomSource draws a block of indexes for a bound at once
+and hands them out one by one:
+
+* bounds up to 256 draw a block of random bytes and drop the bytes that
+  would bias the result with one ``bytes.translate`` call, which also
+  reduces the rest modulo the bound;
+* larger bounds draw a block with ``random.Random.choices``.
+
+A source is reproducible from its seed, and ``spawn`` derives independent
+sources for workers from it. Anything else, such as ``shuffle`` or
+``random``, is passed through to the source's underlying ``random.Random``,
+so a RandomSource can be used wherever the games take an ``rng``.
+"""
+
+import os
+import random
+
+# Number of random indexes drawn at a time for each bound
+BLOCK_SIZE = 4096
+
+# Byte translation tables by bound: (table reducing bytes modulo the bound,
+# bytes to delete because they would bias the result)
+_byte_tables = {}
+
+def _get_byte_tables(bound):
+    tables = _byte_tables.get(bound)
+    if tables is None:
+        limit = 256 - 256 % bound
+        tables = (bytes(value % bound for value in range(256)), bytes(range(limit, 256)))
+        _byte_tables[bound] = tables
+    return tables
+
+class RandomSource:
+    """Random number generator that hands out pre-drawn blocks of indexes."""
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        """Create a source.
+
+        Args:
+            seed: Seed of the source, any value ``random.Random`` accepts;
+                drawn from the operating system if None
+            block_size (int): Number of indexes to draw at a time
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+        self.block_size = block_size
+        self._random = random.Random(seed)
+        self._blocks = {}
+
+    def __repr__(self):
+        return f"RandomSource({self.seed!r})"
+
+    def __getattr__(self, name):
+        # Pass everything else, such as shuffle and random, to random.Random.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._random, name)
+
+    def _draw(self, bound):
+        """Draw a block of random indexes below a bound."""
+        if bound <= 0:
+            raise ValueError("empty range for randrange()")
+        if bound > 256:
+            return self._random.choices(range(bound), k=self.block_size)
+        table, biased = _get_byte_tables(bound)
+        block = b""
+        while not block:
+            # The same bytes as Random.randbytes, which needs Python 3.9.
+            size = self.block_size
+            block = self._random.getrandbits(size * 8).to_bytes(size, "little").translate(table, biased)
+        return block
+
+    def randrange(self, bound):
+        """Get a random index from 0 up to, but not including, bound."""
+        try:
+            return next(self._blocks[bound])
+        except (KeyError, StopIteration):
+            block = self._blocks[bound] = iter(self._draw(bound))
+            return next(block)
+
+    def choice(self, seq):
+        """Pick a random element of a non-empty sequence."""
+        try:
+            return seq[next(self._blocks[len(seq)])]
+        except (KeyError, StopIteration):
+            if not seq:
+                raise IndexError("Cannot choose from an empty sequence") from None
+            return seq[self.randrange(len(seq))]
+
+    def spawn(self, key):
+        """Derive an independent source, such as one per worker.
+
+        Args:
+            key: Value identifying the new source, such as a worker or
+                chunk number; the same seed and key give the same source
+
+        Returns:
+            RandomSource: The derived source
+        """
+        return RandomSource(f"{self.seed}:{key}", self.block_size)
+
+_default_source = None
+
+def default_source():
+    """Get the source used when no rng is given, creating it on first use."""
+    global _default_source
+    if _default_source is None:
+        _default_source = RandomSource()
+    return _default_source
+
+def seed(value=None):
+    """Replace the default source with one seeded from value."""
+    global _default_source
+    _default_source = RandomSource(value)
@@ -1,32 +1,142 @@
-import random
+import os
+import struct
+import sys
+import time
 
-def get_user_choice():
-    """Get and validate user's choice."""
+from operator import add
+
+import game_metrics
+from random_source import RandomSource, default_source
+from rps_rules import CLASSIC, OUTCOMES
+
+# Moves and outcome table of the classic rule set. OUTCOME_TABLE[user * 3 +
+# computer] is the index in OUTCOMES of the result of a round, with moves
+# given as indexes into CHOICES.
+CHOICES = CLASSIC.moves
+CHOICE_INDEX = CLASSIC.index
+OUTCOME_TABLE = CLASSIC.table
+
+# Byte translation tables used by determine_winners, by rule set
+_batch_tables = {}
+
+def get_user_choice(rules=CLASSIC, renderer=None):
+    """Get and validate user's choice, through a FrameRenderer if given."""
+    prompt = f"Enter your choice ({'/'.join(rules.moves)}) or 'quit' to exit: "
     while True:
-        choice = input("Enter your choice (rock/paper/scissors) or 'quit' to exit: ").lower().strip()
-        if choice in ['rock', 'paper', 'scissors', 'quit']:
+        if renderer is None:
+            choice = input(prompt)
+        else:
+            choice = renderer.input(prompt)
+        choice = choice.lower().strip()
+        if choice in rules.index or choice == 'quit':
             return choice
-        print("Invalid choice. Please enter 'rock', 'paper', 'scissors', or 'quit'.")
+        message = f"Invalid choice. Please enter {rules.prompt_list()}, or 'quit'."
+        if renderer is None:
+            print(message)
+        else:
+            renderer.write(message + "\n")
 
-def get_computer_choice():
-    """Generate computer's random choice."""
-    return random.choice(['rock', 'paper', 'scissors'])
+def get_computer_choice(rules=CLASSIC, rng=None):
+    """Generate computer's random choice.
+    
+    Args:
+        rules (RuleSet): Moves to choose from
+        rng: Random number generator; defaults to random_source.default_source()
+    """
+    return (rng if rng is not None else default_source()).choice(rules.moves)
 
-def determine_winner(user_choice, computer_choice):
+def determine_winner(user_choice, computer_choice, rules=CLASSIC):
     """Determine the winner of the round."""
-    if user_choice == computer_choice:
-        return 'tie'
+    return rules.winner(user_choice, computer_choice)
+
+def encode_moves(choices, rules=CLASSIC):
+    """Encode move names as a bytes string of move indexes."""
+    return bytes(rules.index[choice] for choice in choices)
+
+def _as_move_bytes(moves):
+    """Get moves given as a bytes-like object or iterable of ints as bytes."""
+    try:
+        view = memoryview(moves)
+    except TypeError:
+        return bytes(moves)
+    if view.itemsize == 1:
+        return view.tobytes()
+    return bytes(view.tolist())
+
+def _get_batch_tables(rules):
+    tables = _batch_tables.get(rules)
+    if tables is None:
+        size = len(rules)
+        tables = _batch_tables[rules] = (
+            bytes(value * size & 0xFF for value in range(256)),
+            rules.table.ljust(256, b"\0")[:256],
+            bytes(range(size)),
+        )
+    return tables
+
+def determine_winners(user_moves, computer_moves, rules=CLASSIC):
+    """Determine the results of many rounds at once.
+    
+    Moves are indexes into the rule set's moves, for example from
+    encode_moves. The rounds are scored with whole-buffer operations over
+    the rule set's outcome table rather than one Python call per round.
+    
+    Returns:
+        bytes: Index in OUTCOMES of the result of each round
+    """
+    user = _as_move_bytes(user_moves)
+    computer = _as_move_bytes(computer_moves)
+    if len(user) != len(computer):
+        raise ValueError("user_moves and computer_moves must have the same length")
+    if not user:
+        return b""
+    times_size, outcome_lookup, valid_moves = _get_batch_tables(rules)
+    if user.translate(None, valid_moves) or computer.translate(None, valid_moves):
+        raise ValueError(f"moves must be indexes below {len(rules)}")
     
-    winning_combinations = {
-        ('rock', 'scissors'),
-        ('paper', 'rock'),
-        ('scissors', 'paper')
-    }
+    size = len(rules)
+    if size * size > 256:
+        return bytes(map(rules.table.__getitem__,
+                         map(add, map(size.__mul__, user), computer)))
+    # Add user * size + computer byte by byte as one big integer; every sum
+    # fits in a byte, so no byte carries into the next one.
+    pairs = (int.from_bytes(user.translate(times_size), 'little') +
+             int.from_bytes(computer, 'little'))
+    return pairs.to_bytes(len(user), 'little').translate(outcome_lookup)
+
+def score_rounds(user_moves, computer_moves, rules=CLASSIC):
+    """Count the results of many rounds at once.
     
-    if (user_choice, computer_choice) in winning_combinations:
-        return 'user'
+    Returns:
+        dict: Number of rounds for each outcome ('tie', 'user', 'computer')
+    """
+    outcomes = determine_winners(user_moves, computer_moves, rules)
+    return {outcome: outcomes.count(index) for index, outcome in enumerate(OUTCOMES)}
+
+def format_result(winner):
+    """Describe the result of the round."""
+    if winner == 'tie':
+        return "It's a tie!"
+    elif winner == 'user':
+        return "You win this round!"
     else:
-        return 'computer'
+        return "Computer wins this round!"
+
+def format_score(user_score, computer_score):
+    """Describe the current score."""
+    return f"Score - You: {user_score}, Computer: {computer_score}"
+
+def format_round_frame(user_choice, computer_choice, winner, user_score, computer_score):
+    """Build the lines shown after a round."""
+    return [
+        "",
+        f"You chose: {user_choice}",
+        f"Computer chose: {computer_choice}",
+        format_result(winner),
+        "",
+        format_score(user_score, computer_score),
+        "-" * 30,
+    ]
 
 def display_choices(user_choice, computer_choice):
     """Display the choices made by user and computer."""
@@ -35,45 +145,81 @@ def display_choices(user_choice, computer_choice):
 
 def display_result(winner):
     """Display the result of the round."""
-    if winner == 'tie':
-        print("It's a tie!")
-    elif winner == 'user':
-        print("You win this round!")
-    else:
-        print("Computer wins this round!")
+    print(format_result(winner))
 
 def display_score(user_score, computer_score):
     """Display the current score."""
-    print(f"\nScore - You: {user_score}, Computer: {computer_score}")
+    print("\n" + format_score(user_score, computer_score))
+
+# Scoreboard file record: player id (u64), user score (u32), computer score (u32)
+SCOREBOARD_RECORD = struct.Struct('<QII')
+
+def save_scoreboards(path, scoreboards):
+    """Save scores by player id to a file of fixed-width binary records.
+    
+    The file is written next to its destination and moved into place, so
+    a crash never leaves a partially written file behind.
+    """
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(b"".join(SCOREBOARD_RECORD.pack(player_id, user_score, computer_score)
+                         for player_id, (user_score, computer_score) in scoreboards.items()))
+    os.replace(tmp_path, path)
+
+def load_scoreboards(path):
+    """Load scores saved by save_scoreboards as {player_id: (user_score, computer_score)}."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return {player_id: (user_score, computer_score)
+            for player_id, user_score, computer_score in SCOREBOARD_RECORD.iter_unpack(data)}
 
-def play_game():
-    """Main game loop."""
+def play_game(opponent=None, rules=CLASSIC, leaderboard=None, player=None):
+    """Main game loop.
+    
+    Args:
+        opponent: Computer opponent with choose() and observe(user_choice)
+            methods, such as one from rps_opponents; plays at random if None
+        rules (RuleSet): Moves and outcomes to play with, from rps_rules
+        leaderboard (Leaderboard): Leaderboard to record the final score on
+        player (str): Name to record the score under
+    """
+    from frame_renderer import FrameRenderer
+    
     print("Welcome to Rock Paper Scissors!")
     print("Enter 'quit' at any time to exit the game.\n")
     
+    renderer = FrameRenderer()
+    started = time.monotonic()
     user_score = 0
     computer_score = 0
     
     while True:
-        user_choice = get_user_choice()
+        user_choice = get_user_choice(rules, renderer)
         
         if user_choice == 'quit':
             break
         
-        computer_choice = get_computer_choice()
-        display_choices(user_choice, computer_choice)
-        
-        winner = determine_winner(user_choice, computer_choice)
-        display_result(winner)
+        if opponent is None:
+            computer_choice = get_computer_choice(rules)
+        else:
+            computer_choice = opponent.choose()
+            opponent.observe(user_choice)
         
+        winner = determine_winner(user_choice, computer_choice, rules)
+        if game_metrics.registry is not None:
+            game_metrics.registry.rps_rounds.inc(winner)
         if winner == 'user':
             user_score += 1
         elif winner == 'computer':
             computer_score += 1
         
-        display_score(user_score, computer_score)
-        print("-" * 30)
+        renderer.render(format_round_frame(user_choice, computer_choice, winner,
+                                           user_score, computer_score))
     
+    if game_metrics.registry is not None:
+        game_metrics.registry.rps_session_seconds.observe(time.monotonic() - started)
+    if leaderboard is not None and (user_score or computer_score):
+        leaderboard.record_rps(player, user_score, computer_score)
     print(f"\nFinal Score - You: {user_score}, Computer: {computer_score}")
     
     if user_score > computer_score:
@@ -85,5 +231,97 @@ def play_game():
     
     print("Thanks for playing!")
 
+def iter_rounds(lines, opponent=None, rules=CLASSIC):
+    """Play scripted rounds without prompting or printing.
+    
+    Args:
+        lines (iterable): User moves, one per line; blank lines are skipped
+            and 'quit' stops the game
+        opponent: Computer opponent; plays at random if None
+        rules (RuleSet): Moves and outcomes to play with
+        
+    Yields:
+        dict: One result per line, with the round number, both moves, the
+            winner and the scores, or an error for an invalid move
+    """
+    user_score = 0
+    computer_score = 0
+    rounds = 0
+    for line in lines:
+        user_choice = line.strip().lower()
+        if not user_choice:
+            continue
+        if user_choice == 'quit':
+            break
+        if user_choice not in rules.index:
+            yield {"error": "Invalid choice.", "input": user_choice}
+            continue
+        
+        if opponent is None:
+            computer_choice = get_computer_choice(rules)
+        else:
+            computer_choice = opponent.choose()
+            opponent.observe(user_choice)
+        winner = determine_winner(user_choice, computer_choice, rules)
+        if game_metrics.registry is not None:
+            game_metrics.registry.rps_rounds.inc(winner)
+        if winner == 'user':
+            user_score += 1
+        elif winner == 'computer':
+            computer_score += 1
+        rounds += 1
+        yield {"round": rounds, "user": user_choice, "computer": computer_choice,
+               "winner": winner, "user_score": user_score, "computer_score": computer_score}
+
+def play_script(lines, output, opponent=None, rules=CLASSIC):
+    """Play scripted rounds and write each result to output as a JSON line."""
+    import json
+    
+    encode = json.JSONEncoder().encode
+    write = output.write
+    for result in iter_rounds(lines, opponent, rules):
+        write(encode(result) + "\n")
+
+def main(argv=None):
+    """Play from the command line."""
+    import argparse
+    from rps_opponents import OPPONENTS
+    from rps_rules import RULE_SETS
+    
+    parser = argparse.ArgumentParser(description="Play rock paper scissors.")
+    parser.add_argument('--opponent', choices=sorted(OPPONENTS), default='random')
+    parser.add_argument('--rules', choices=sorted(RULE_SETS), default='classic')
+    parser.add_argument('--script', metavar='FILE',
+                        help="read moves from FILE ('-' for stdin) and write results as JSON lines")
+    parser.add_argument('--seed', type=int, help="seed the computer's moves")
+    parser.add_argument('--metrics-file', metavar='FILE',
+                        help="periodically write Prometheus metrics to FILE")
+    parser.add_argument('--leaderboard', metavar='DB',
+                        help="record the final score in the SQLite leaderboard DB")
+    parser.add_argument('--player', help="name to record scores under")
+    args = parser.parse_args(argv)
+    rules = RULE_SETS[args.rules]
+    opponent = OPPONENTS[args.opponent](rng=RandomSource(args.seed), rules=rules)
+    
+    exporter = None
+    if args.metrics_file:
+        game_metrics.enable()
+        exporter = game_metrics.TextfileExporter(args.metrics_file).start()
+    try:
+        if args.script is None and args.leaderboard:
+            from leaderboard import Leaderboard, default_player
+            with Leaderboard(args.leaderboard) as board:
+                play_game(opponent, rules, board, args.player or default_player())
+        elif args.script is None:
+            play_game(opponent, rules)
+        elif args.script == '-':
+            play_script(sys.stdin, sys.stdout, opponent, rules)
+        else:
+            with open(args.script) as lines:
+                play_script(lines, sys.stdout, opponent, rules)
+    finally:
+        if exporter is not None:
+            exporter.stop()
+
 if __name__ == "__main__":
-    play_game()
\ No newline at end of file
+    main()
\ No newline at end of file
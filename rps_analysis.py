@@ -0,0 +1,183 @@
+"""Exploitability analysis of rock paper scissors strategies.
+
+A strategy is described by the probability of each of its moves, either
+a single mixed distribution or one distribution per context (such as the
+user's last few moves). The payoff matrix of a rule set gives the
+expected score of every reply to such a distribution exactly, so there is
+no need to simulate rounds:
+
+* the best response is the reply with the highest expected score;
+* the exploitability is that score, in points per round. The rule sets
+  are symmetric zero-sum games worth 0, so a strategy that cannot be
+  exploited scores 0 and one that always plays the same move scores 1.
+
+Many strategies are analyzed at once by multiplying the matrix of their
+distributions with the payoff matrix.
+"""
+
+from operator import mul
+
+from rps_rules import CLASSIC
+
+# Score of a round for the first player, by index in rps_rules.OUTCOMES
+PAYOFFS = (0, 1, -1)
+
+# Differences in expected score smaller than this count as ties
+TOLERANCE = 1e-9
+
+def payoff_matrix(rules=CLASSIC):
+    """Build the payoff matrix of a rule set.
+
+    Returns:
+        list: Rows of scores, where row i, column j is the score of playing
+            move i against move j
+    """
+    size = len(rules)
+    return [[PAYOFFS[code] for code in rules.table[row * size:(row + 1) * size]]
+            for row in range(size)]
+
+def _check_distribution(distribution, rules):
+    if len(distribution) != len(rules):
+        raise ValueError(f"Expected {len(rules)} probabilities, got {len(distribution)}")
+    if abs(sum(distribution) - 1) > 1e-6 or min(distribution) < 0:
+        raise ValueError("Probabilities must be non-negative and sum to 1")
+
+def response_values(distributions, rules=CLASSIC):
+    """Get the expected score of every reply to each of many strategies.
+
+    This is the product of the distributions, one row per strategy, with
+    the transposed payoff matrix.
+
+    Args:
+        distributions (list): Move probabilities of each strategy, in
+            rules.moves order
+        rules (RuleSet): Moves and outcomes being played
+
+    Returns:
+        list: For each strategy, the expected score of each reply
+    """
+    matrix = payoff_matrix(rules)
+    values = []
+    for distribution in distributions:
+        _check_distribution(distribution, rules)
+        values.append([sum(map(mul, row, distribution)) for row in matrix])
+    return values
+
+def best_responses(distributions, rules=CLASSIC):
+    """Find the exploitability and best responses of many strategies at once.
+
+    Args:
+        distributions (list): Move probabilities of each strategy, in
+            rules.moves order
+        rules (RuleSet): Moves and outcomes being played
+
+    Returns:
+        list: For each strategy, its exploitability in points per round and
+            the names of the replies that achieve it
+    """
+    analyses = []
+    for values in response_values(distributions, rules):
+        best = max(values)
+        moves = [move for move, value in zip(rules.moves, values) if value >= best - TOLERANCE]
+        analyses.append((best, moves))
+    return analyses
+
+def best_response(distribution, rules=CLASSIC):
+    """Find the exploitability and best responses of one mixed strategy.
+
+    Returns:
+        tuple: Exploitability in points per round and the names of the
+            replies that achieve it
+    """
+    return best_responses([distribution], rules)[0]
+
+def exploitability(distribution, rules=CLASSIC):
+    """Get how many points per round a best response scores against a strategy."""
+    return best_response(distribution, rules)[0]
+
+def analyze_conditional(distributions, rules=CLASSIC, weights=None):
+    """Analyze a strategy whose move probabilities depend on a context.
+
+    Args:
+        distributions (dict): Context, such as a tuple of previous moves, to
+            the move probabilities in that context
+        rules (RuleSet): Moves and outcomes being played
+        weights (dict): How often each context occurs; all equally often if None
+
+    Returns:
+        dict: The exploitability and best responses in each context
+            ("contexts"), their weighted mean ("mean") and the largest
+            exploitability of any context ("worst")
+    """
+    contexts = list(distributions)
+    analyses = dict(zip(contexts, best_responses([distributions[context] for context in contexts],
+                                                 rules)))
+    if weights is None:
+        weights = dict.fromkeys(contexts, 1)
+    total = sum(weights.get(context, 0) for context in contexts)
+    mean = (sum(analyses[context][0] * weights.get(context, 0) for context in contexts) / total
+            if total else 0.0)
+    return {
+        "contexts": analyses,
+        "mean": mean,
+        "worst": max((value for value, _ in analyses.values()), default=0.0),
+    }
+
+def move_frequencies(moves, rules=CLASSIC):
+    """Get the share of each move in recorded moves, as a mixed strategy."""
+    counts = [0] * len(rules)
+    for move in moves:
+        counts[rules.index[move]] += 1
+    total = sum(counts)
+    if not total:
+        raise ValueError("moves must not be empty")
+    return [count / total for count in counts]
+
+def conditional_frequencies(moves, order=1, rules=CLASSIC):
+    """Get the share of each move after each sequence of previous moves.
+
+    Args:
+        moves (list): Recorded move names
+        order (int): Number of previous moves making up a context
+        rules (RuleSet): Moves and outcomes being played
+
+    Returns:
+        tuple: Dict of context (tuple of move names, oldest first) to move
+            probabilities, and dict of context to how often it occurred
+    """
+    counts = {}
+    for index in range(order, len(moves)):
+        context = tuple(moves[index - order:index])
+        row = counts.setdefault(context, [0] * len(rules))
+        row[rules.index[moves[index]]] += 1
+    distributions = {context: [count / sum(row) for count in row] for context, row in counts.items()}
+    weights = {context: sum(row) for context, row in counts.items()}
+    return distributions, weights
+
+def main(argv=None):
+    """Analyze recorded players from the command line."""
+    import argparse
+    import os
+    from rps_rules import RULE_SETS
+    from rps_tournament import load_move_stream
+
+    parser = argparse.ArgumentParser(description="Measure how exploitable recorded players are.")
+    parser.add_argument("--rules", choices=sorted(RULE_SETS), default="classic")
+    parser.add_argument("--order", type=int, default=1,
+                        help="previous moves to condition on (0 for the overall mix only)")
+    parser.add_argument("recordings", nargs="+", help="files of recorded moves, one per line")
+    args = parser.parse_args(argv)
+    rules = RULE_SETS[args.rules]
+
+    print(f"{'player':20} {'mixed':>8} {'best reply':>16} {'conditional':>12}")
+    for path in args.recordings:
+        moves = load_move_stream(path)
+        value, replies = best_response(move_frequencies(moves, rules), rules)
+        conditional = ""
+        if args.order:
+            distributions, weights = conditional_frequencies(moves, args.order, rules)
+            conditional = f"{analyze_conditional(distributions, rules, weights)['mean']:+12.3f}"
+        print(f"{os.path.basename(path):20} {value:+8.3f} {'/'.join(replies):>16} {conditional}")
+
+if __name__ == "__main__":
+    main()
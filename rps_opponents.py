@@ -0,0 +1,173 @@
+"""Computer opponents for rock paper scissors.
+
+An opponent picks the computer's move with choose() and is told the
+user's move after every round with observe(user_choice). Any object with
+those two methods can be passed to play_game. The opponents here also
+report the probabilities of their next move with distribution(), which
+rps_analysis uses to measure how exploitable they are.
+"""
+
+import random
+from array import array
+
+from rps_rules import CLASSIC
+
+# COUNTER_MOVES[i] is the index of the classic move that beats move i.
+COUNTER_MOVES = CLASSIC.counter_moves
+
+class RandomOpponent:
+    """Opponent that plays uniformly at random."""
+
+    def __init__(self, rng=random, rules=CLASSIC):
+        self.rng = rng
+        self.rules = rules
+
+    def choose(self):
+        """Pick the computer's move."""
+        return self.rules.random_move(self.rng)
+
+    def distribution(self):
+        """Get the probability of each move, in rules.moves order."""
+        return [1 / len(self.rules)] * len(self.rules)
+
+    def observe(self, user_choice):
+        """Random play ignores the user's moves."""
+
+class NGramOpponent:
+    """Opponent that predicts the user's next move from their last few moves.
+
+    For every sequence of the user's last ``order`` moves it counts which
+    move came next, in a fixed-size table of moves ** (order + 1) counters, and
+    plays the move that beats the most likely next move. Updating and
+    predicting are constant time, and a table row is halved when one of its
+    counters saturates, which bounds memory and lets the opponent follow a
+    player who changes habits.
+    """
+
+    # Counter value at which a table row is halved.
+    MAX_COUNT = 0xFFFF
+
+    def __init__(self, order=2, rng=random, rules=CLASSIC):
+        """Create an opponent with an empty history.
+
+        Args:
+            order (int): Number of previous user moves to predict from
+            rng: Random number generator used while there is nothing to predict from
+            rules (RuleSet): Moves and outcomes being played, from rps_rules
+        """
+        if order < 0:
+            raise ValueError("order must not be negative")
+        self.order = order
+        self.rng = rng
+        self.rules = rules
+        self._moves = len(rules)
+        self._contexts = self._moves ** order
+        self._counts = array('H', bytes(2 * self._contexts * self._moves))
+        self._context = 0
+
+    def predict(self):
+        """Get the index of the user's most likely next move, or None if unknown."""
+        start = self._context * self._moves
+        row = self._counts[start:start + self._moves]
+        best = max(row)
+        if not best:
+            return None
+        likely = [move for move, count in enumerate(row) if count == best]
+        return likely[0] if len(likely) == 1 else self.rng.choice(likely)
+
+    def _context_distribution(self, context):
+        """Get the probability of each move being chosen in a context."""
+        start = context * self._moves
+        row = self._counts[start:start + self._moves]
+        best = max(row)
+        uniform = [1 / self._moves] * self._moves
+        if not best:
+            return uniform
+        likely = [move for move, count in enumerate(row) if count == best]
+        probabilities = [0.0] * self._moves
+        for move in likely:
+            counter = self.rules.counter_moves[move]
+            if counter is None:
+                probabilities = [p + q / len(likely) for p, q in zip(probabilities, uniform)]
+            else:
+                probabilities[counter] += 1 / len(likely)
+        return probabilities
+
+    def distribution(self):
+        """Get the probability of each move, in rules.moves order, for the next round."""
+        return self._context_distribution(self._context)
+
+    def context_distributions(self):
+        """Get the move probabilities for every context of previous user moves.
+
+        Returns:
+            dict: Tuple of the user's last ``order`` move names, oldest
+                first, to the probability of each move in that context
+        """
+        distributions = {}
+        for context in range(self._contexts):
+            moves = []
+            rest = context
+            for _ in range(self.order):
+                rest, move = divmod(rest, self._moves)
+                moves.append(self.rules.moves[move])
+            distributions[tuple(reversed(moves))] = self._context_distribution(context)
+        return distributions
+
+    def choose(self):
+        """Pick the move that beats the user's most likely next move."""
+        predicted = self.predict()
+        if predicted is None or self.rules.counter_moves[predicted] is None:
+            return self.rules.random_move(self.rng)
+        return self.rules.moves[self.rules.counter_moves[predicted]]
+
+    def observe(self, user_choice):
+        """Count the user's move after the current context and move on."""
+        move = self.rules.index[user_choice]
+        start = self._context * self._moves
+        counts = self._counts
+        counts[start + move] += 1
+        if counts[start + move] == self.MAX_COUNT:
+            for index in range(start, start + self._moves):
+                counts[index] >>= 1
+        self._context = (self._context * self._moves + move) % self._contexts
+
+class ReplayOpponent:
+    """Opponent that replays a recorded sequence of moves, looping at the end."""
+
+    def __init__(self, moves, rng=None, rules=CLASSIC):
+        """Create an opponent from recorded moves.
+
+        Args:
+            moves (list): Recorded move names, such as a human's moves from a log
+            rng: Unused; accepted so all opponents can be built the same way
+            rules (RuleSet): Moves and outcomes being played, from rps_rules
+        """
+        if not moves:
+            raise ValueError("moves must not be empty")
+        for move in moves:
+            if move not in rules.index:
+                raise ValueError(f"Unknown move: {move!r}")
+        self.moves = list(moves)
+        self.rules = rules
+        self._next = 0
+
+    def choose(self):
+        """Play the next recorded move."""
+        move = self.moves[self._next]
+        self._next = (self._next + 1) % len(self.moves)
+        return move
+
+    def distribution(self):
+        """Get the probability of each move; the next recorded move is certain."""
+        probabilities = [0.0] * len(self.rules)
+        probabilities[self.rules.index[self.moves[self._next]]] = 1.0
+        return probabilities
+
+    def observe(self, user_choice):
+        """Recorded moves do not depend on the other player."""
+
+OPPONENTS = {
+    'random': RandomOpponent,
+    'ngram': NGramOpponent,
+}
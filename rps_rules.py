@@ -0,0 +1,118 @@
+"""Rule sets for rock paper scissors and its larger variants.
+
+A rule set is defined as data: its moves and which moves each one beats.
+It is compiled once into a move index and an outcome table, so checking a
+move, finding the winner of a round and picking a random move are all
+constant-time lookups.
+"""
+
+import random
+
+OUTCOMES = ('tie', 'user', 'computer')
+
+class RuleSet:
+    """A compiled set of moves and the outcome of every pair of moves."""
+
+    def __init__(self, name, moves, beats):
+        """Compile a rule set.
+
+        Args:
+            name (str): Name of the rule set
+            moves (iterable): Move names, in order
+            beats (dict): For each move, the moves it beats. Pairs where
+                neither move beats the other are ties.
+        """
+        self.name = name
+        self.moves = tuple(moves)
+        self.index = {move: index for index, move in enumerate(self.moves)}
+        if len(self.index) != len(self.moves):
+            raise ValueError("moves must be unique")
+        if len(self.moves) > 256:
+            raise ValueError("rule sets are limited to 256 moves")
+
+        size = len(self.moves)
+        table = bytearray(size * size)
+        for move, beaten_moves in beats.items():
+            for beaten in beaten_moves:
+                if move not in self.index or beaten not in self.index:
+                    raise ValueError(f"Unknown move in rule: {move!r} beats {beaten!r}")
+                if move == beaten:
+                    raise ValueError(f"{move!r} cannot beat itself")
+                first, second = self.index[move], self.index[beaten]
+                if table[second * size + first]:
+                    raise ValueError(f"{move!r} and {beaten!r} cannot beat each other")
+                table[first * size + second] = 1
+                table[second * size + first] = 2
+        # table[first * len(moves) + second] is the index in OUTCOMES of a
+        # round where the user plays first and the computer plays second.
+        self.table = bytes(table)
+        # counter_moves[i] is the index of a move that beats move i, or None.
+        self.counter_moves = [
+            next((move for move in range(size) if table[move * size + beaten] == 1), None)
+            for beaten in range(size)
+        ]
+
+    def __len__(self):
+        return len(self.moves)
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, {self.moves!r})"
+
+    def outcome(self, first, second):
+        """Get the index in OUTCOMES of a round between two move indexes."""
+        return self.table[first * len(self.moves) + second]
+
+    def winner(self, user_choice, computer_choice):
+        """Determine the winner of a round between two move names.
+
+        Returns:
+            str: 'tie', 'user' or 'computer'; unknown moves lose to known
+                ones and tie with themselves
+        """
+        user = self.index.get(user_choice)
+        computer = self.index.get(computer_choice)
+        if user is None or computer is None:
+            return 'tie' if user_choice == computer_choice else 'computer'
+        return OUTCOMES[self.table[user * len(self.moves) + computer]]
+
+    def random_move(self, rng=random):
+        """Pick a move name uniformly at random."""
+        return self.moves[rng.randrange(len(self.moves))]
+
+    def prompt_list(self):
+        """List the moves for messages, such as "'rock', 'paper', 'scissors'"."""
+        return ", ".join(f"'{move}'" for move in self.moves)
+
+def cyclic_rules(name, moves):
+    """Build a balanced rule set for an odd number of moves.
+
+    Each move beats the (len(moves) - 1) / 2 moves listed just before it,
+    wrapping around, so every move beats and loses to the same number of
+    moves. Rock, paper, scissors is the three-move case.
+    """
+    size = len(moves)
+    if size < 3 or size % 2 == 0:
+        raise ValueError("cyclic rule sets need an odd number of moves, at least 3")
+    beats = {
+        move: [moves[(index - step) % size] for step in range(1, size // 2 + 1)]
+        for index, move in enumerate(moves)
+    }
+    return RuleSet(name, moves, beats)
+
+CLASSIC = RuleSet('classic', ('rock', 'paper', 'scissors'), {
+    'rock': ['scissors'],
+    'paper': ['rock'],
+    'scissors': ['paper'],
+})
+
+RPSLS = RuleSet('rpsls', ('rock', 'paper', 'scissors', 'lizard', 'spock'), {
+    'rock': ['scissors', 'lizard'],
+    'paper': ['rock', 'spock'],
+    'scissors': ['paper', 'lizard'],
+    'lizard': ['paper', 'spock'],
+    'spock': ['rock', 'scissors'],
+})
+
+RPS7 = cyclic_rules('rps7', ('rock', 'water', 'air', 'paper', 'sponge', 'scissors', 'fire'))
+
+RULE_SETS = {rules.name: rules for rules in (CLASSIC, RPSLS, RPS7)}
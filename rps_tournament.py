@@ -0,0 +1,198 @@
+"""Round-robin tournaments between rock paper scissors opponents.
+
+Strategies are given as factories that return an opponent from
+rps_opponents (or anything with choose() and observe()) when called with
+``rng=`` a ``random_source.RandomSource`` and ``rules=`` a rule set from rps_rules.
+Every pair of strategies plays a number of matches, each with its own RNG
+seeded from the tournament seed and the match, so results are
+reproducible whatever the number of worker processes.
+"""
+
+import math
+import os
+from fractions import Fraction
+from functools import partial
+from itertools import combinations
+
+from random_source import RandomSource
+from rock_paper_scissors import determine_winner
+from rps_opponents import NGramOpponent, RandomOpponent, ReplayOpponent
+from rps_rules import CLASSIC
+
+# z value of the two-sided 95% confidence intervals
+Z_95 = 1.96
+
+def play_match(first, second, rounds, rules=CLASSIC):
+    """Play two opponents against each other.
+    
+    Each opponent observes the other's move after every round. Opponents
+    must be built for the same rule set as the match.
+    
+    Returns:
+        tuple: Rounds won by the first opponent, won by the second, and tied
+    """
+    first_wins = second_wins = 0
+    for _ in range(rounds):
+        first_choice = first.choose()
+        second_choice = second.choose()
+        winner = determine_winner(first_choice, second_choice, rules)
+        if winner == 'user':
+            first_wins += 1
+        elif winner == 'computer':
+            second_wins += 1
+        first.observe(second_choice)
+        second.observe(first_choice)
+    return first_wins, second_wins, rounds - first_wins - second_wins
+
+def _run_match(task):
+    """Play one scheduled match; runs in a worker process."""
+    first, second, repeat, first_factory, second_factory, rounds, seed, rules = task
+    key = f"{seed}:{first}:{second}:{repeat}"
+    first_opponent = first_factory(rng=RandomSource(key + ":first"), rules=rules)
+    second_opponent = second_factory(rng=RandomSource(key + ":second"), rules=rules)
+    return (first, second, repeat) + play_match(first_opponent, second_opponent, rounds, rules)
+
+def run_matches(strategies, rounds=1000, matches=1, workers=None, seed=0, rules=CLASSIC):
+    """Play every pair of strategies and yield match results as they finish.
+    
+    Only a bounded number of matches is scheduled at a time, so memory
+    does not grow with the number of strategies.
+    
+    Args:
+        strategies (list): Opponent factories
+        rounds (int): Rounds per match
+        matches (int): Matches per pair of strategies
+        workers (int): Worker processes; 1 plays in this process, None uses
+            one per CPU
+        seed (int): Tournament seed
+        rules (RuleSet): Rule set to play; factories are called with rules=
+        
+    Yields:
+        tuple: Indexes of the two strategies, match number, and the first
+            strategy's wins, the second's wins and ties
+    """
+    tasks = (
+        (first, second, repeat, strategies[first], strategies[second], rounds, seed, rules)
+        for first, second in combinations(range(len(strategies)), 2)
+        for repeat in range(matches)
+    )
+    if workers == 1:
+        for task in tasks:
+            yield _run_match(task)
+        return
+    
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    limit = 4 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for task in tasks:
+            pending.add(executor.submit(_run_match, task))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in pending:
+            yield future.result()
+
+def rank(names, results):
+    """Aggregate match results into a ranked table.
+    
+    A strategy scores +1 per round won and -1 per round lost, averaged over
+    the rounds of each match. Its score is the mean of its match scores, and
+    the interval a normal approximation over those matches, since rounds
+    within a match depend on each other through the opponents' learning.
+    The interval is unbounded for a strategy that played fewer than two
+    matches.
+    
+    Args:
+        names (list): Strategy names, by index
+        results (iterable): Match results from run_matches
+        
+    Returns:
+        list: One dict per strategy, best mean score first
+    """
+    # Wins, losses, ties, matches, and the sum and sum of squares of match
+    # scores, kept exact so the table does not depend on the order matches
+    # finish in
+    totals = [[0, 0, 0, 0, 0, 0] for _ in names]
+    for first, second, _, first_wins, second_wins, ties in results:
+        played = first_wins + second_wins + ties
+        for index, wins, losses in ((first, first_wins, second_wins),
+                                    (second, second_wins, first_wins)):
+            score = Fraction(wins - losses, played) if played else 0
+            total = totals[index]
+            total[0] += wins
+            total[1] += losses
+            total[2] += ties
+            total[3] += 1
+            total[4] += score
+            total[5] += score * score
+    
+    table = []
+    for name, (wins, losses, ties, matches, score_sum, square_sum) in zip(names, totals):
+        mean = Fraction(score_sum, matches) if matches else 0
+        score = float(mean)
+        if matches > 1:
+            variance = (square_sum - matches * mean * mean) / (matches - 1)
+            margin = Z_95 * math.sqrt(variance / matches)
+        else:
+            margin = math.inf
+        table.append({
+            "name": name,
+            "matches": matches,
+            "rounds": wins + losses + ties,
+            "wins": wins,
+            "losses": losses,
+            "ties": ties,
+            "score": score,
+            "ci_low": score - margin,
+            "ci_high": score + margin,
+        })
+    table.sort(key=lambda row: row["score"], reverse=True)
+    return table
+
+def tournament(strategies, rounds=1000, matches=1, workers=None, seed=0, rules=CLASSIC):
+    """Run a round-robin tournament.
+    
+    Args:
+        strategies (dict): Opponent factories by name
+        rounds, matches, workers, seed, rules: See run_matches
+        
+    Returns:
+        list: Ranked table, see rank
+    """
+    names = list(strategies)
+    factories = [strategies[name] for name in names]
+    return rank(names, run_matches(factories, rounds, matches, workers, seed, rules))
+
+def load_move_stream(path):
+    """Read recorded moves, one per line, ignoring blank lines."""
+    with open(path) as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+def main(argv=None):
+    """Run a tournament of the built-in strategies and recorded players."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Rock paper scissors strategy tournament.")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--matches", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("recordings", nargs="*", help="files of recorded moves, one per line")
+    args = parser.parse_args(argv)
+    
+    strategies = {"random": RandomOpponent}
+    for order in (1, 2, 3):
+        strategies[f"ngram{order}"] = partial(NGramOpponent, order=order)
+    for path in args.recordings:
+        strategies[os.path.basename(path)] = partial(ReplayOpponent, load_move_stream(path))
+    
+    table = tournament(strategies, args.rounds, args.matches, args.workers, args.seed)
+    print(f"{'strategy':20} {'score':>8} {'95% CI':>19} {'rounds':>10}")
+    for row in table:
+        interval = f"[{row['ci_low']:+.3f}, {row['ci_high']:+.3f}]"
+        print(f"{row['name']:20} {row['score']:+8.3f} {interval:>19} {row['rounds']:>10}")
+
+if __name__ == "__main__":
+    main()
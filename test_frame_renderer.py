@@ -0,0 +1,50 @@
+import io
+from unittest.mock import patch
+from frame_renderer import CLEAR_BELOW, CLEAR_LINE, CURSOR_DOWN, FrameRenderer
+
+class TestFrameRenderer:
+    """Test drawing game turns as buffered frames."""
+    
+    def test_plain_output(self):
+        """Test that frames are written in full without ANSI support."""
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream)
+        renderer.render(["a", "b"])
+        renderer.render(["a", "c"])
+        assert stream.getvalue() == "a\nb\na\nc\n"
+    
+    def test_redraws_only_changed_lines(self):
+        """Test that unchanged lines are skipped on terminals."""
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream, ansi=True)
+        renderer.render(["title", "one\ntwo"])
+        stream.seek(0)
+        stream.truncate()
+        
+        renderer.render(["title", "one", "three"])
+        assert stream.getvalue() == ("\x1b[3A\r" + CURSOR_DOWN + CURSOR_DOWN +
+                                     CLEAR_LINE + "three\n" + CLEAR_BELOW)
+    
+    @patch('builtins.input')
+    def test_input_lines_are_redrawn(self, mock_input):
+        """Test that prompts below a frame are covered by the next frame."""
+        mock_input.return_value = "x"
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream, ansi=True)
+        renderer.render(["frame"])
+        assert renderer.input("> ") == "x"
+        renderer.write("oops\n")
+        stream.seek(0)
+        stream.truncate()
+        
+        renderer.render(["frame"])
+        assert stream.getvalue() == "\x1b[3A\r" + CURSOR_DOWN + CLEAR_BELOW
+    
+    def test_reset(self):
+        """Test that a reset renderer draws the next frame in full."""
+        stream = io.StringIO()
+        renderer = FrameRenderer(stream, ansi=True)
+        renderer.render(["a"])
+        renderer.reset()
+        renderer.render(["a"])
+        assert stream.getvalue() == "a\na\n"
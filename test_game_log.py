@@ -0,0 +1,134 @@
+import io
+import os
+import random
+import struct
+import pytest
+import game_log
+from game_log import (
+    HangmanLog, HangmanLogWriter, RpsLog, RpsLogWriter, pack_rps_script, write_rps_log
+)
+from rock_paper_scissors import encode_moves, play_script, score_rounds
+from rps_opponents import ReplayOpponent
+from rps_rules import CLASSIC, RPS7, cyclic_rules
+
+def random_rounds(rules, count, seed=0):
+    rng = random.Random(seed)
+    user = bytes(rng.randrange(len(rules)) for _ in range(count))
+    computer = bytes(rng.randrange(len(rules)) for _ in range(count))
+    return user, computer
+
+class TestRpsLog:
+    """Test writing and reading rock paper scissors logs."""
+    
+    @pytest.mark.parametrize("rules", [CLASSIC, RPS7])
+    @pytest.mark.parametrize("count", [0, 1, 2, 999])
+    def test_round_trip(self, tmp_path, rules, count):
+        """Test that rounds are read back and scored as written."""
+        user, computer = random_rounds(rules, count)
+        path = str(tmp_path / "rounds.glr")
+        with RpsLogWriter(path, rules) as writer:
+            # Odd-sized appends leave a round waiting for the next byte.
+            writer.append(user[:count // 3], computer[:count // 3])
+            writer.append(user[count // 3:], computer[count // 3:])
+        
+        with RpsLog(path) as log:
+            assert len(log) == count
+            assert log.rules is rules
+            assert log.moves() == (user, computer)
+            assert log.score() == score_rounds(user, computer, rules)
+    
+    def test_classic_packs_two_rounds_per_byte(self, tmp_path):
+        """Test that classic rounds take 4 bits each."""
+        path = str(tmp_path / "rounds.glr")
+        write_rps_log(path, *random_rounds(CLASSIC, 1000))
+        assert os.path.getsize(path) == game_log._RPS_HEADER.size + 500
+    
+    def test_scans_in_chunks(self, tmp_path):
+        """Test that logs larger than a scan chunk are read correctly."""
+        user, computer = random_rounds(CLASSIC, 1001, seed=1)
+        path = str(tmp_path / "rounds.glr")
+        write_rps_log(path, user, computer)
+        with RpsLog(path) as log, pytest.MonkeyPatch.context() as patch:
+            patch.setattr(game_log, "SCAN_CHUNK", 7)
+            assert log.moves() == (user, computer)
+            assert log.score() == score_rounds(user, computer)
+    
+    def test_unknown_rule_set(self, tmp_path):
+        """Test that a rule set missing from RULE_SETS must be passed in."""
+        rules = cyclic_rules("fingers", ["one", "two", "three"])
+        user, computer = random_rounds(rules, 10)
+        path = str(tmp_path / "rounds.glr")
+        write_rps_log(path, user, computer, rules)
+        with pytest.raises(ValueError):
+            RpsLog(path)
+        with pytest.raises(ValueError):
+            RpsLog(path, CLASSIC)
+        with RpsLog(path, rules) as log:
+            assert log.score() == score_rounds(user, computer, rules)
+    
+    def test_invalid_moves(self, tmp_path):
+        """Test that moves outside the rule set are rejected."""
+        with RpsLogWriter(str(tmp_path / "rounds.glr")) as writer:
+            with pytest.raises(ValueError):
+                writer.append(b"\x00\x03", b"\x00\x01")
+    
+    def test_pack_script_results(self, tmp_path):
+        """Test packing the JSON lines of a scripted game."""
+        output = io.StringIO()
+        play_script(["rock", "lizard", "paper", "scissors"], output, ReplayOpponent(["rock"]))
+        path = str(tmp_path / "rounds.glr")
+        assert pack_rps_script(output.getvalue().splitlines(), path) == 3
+        with RpsLog(path) as log:
+            assert log.moves() == (encode_moves(["rock", "paper", "scissors"]),
+                                   encode_moves(["rock"] * 3))
+
+class TestHangmanLog:
+    """Test writing, reading and replaying hangman logs."""
+    
+    def test_round_trip_and_replay(self, tmp_path):
+        """Test reading guesses back and replaying the games."""
+        path = str(tmp_path / "games.glh")
+        games = [("CAT", "CAT"), ("GARDEN", "XYZQWERTGADN"), ("JAZZ", ""), ("DOG", "EAIOUD")]
+        with HangmanLogWriter(path) as writer:
+            for word, guesses in games:
+                writer.append(word, guesses)
+        
+        with HangmanLog(path) as log:
+            assert len(log) == 4
+            assert [log.guesses_of(index) for index in range(4)] == [guesses for _, guesses in games]
+            replayed = [(game.word, game.won, game.wrong_guesses) for game in log.replay()]
+            assert replayed == [("CAT", True, 0), ("GARDEN", True, 6), ("JAZZ", False, 0),
+                                ("DOG", False, 4)]
+            assert log.score() == {"won": 2, "lost": 0, "unfinished": 2}
+    
+    def test_writes_word_ids_in_chunks(self, tmp_path):
+        """Test that word ids are written little-endian, a chunk at a time."""
+        from hangman.words import get_word_id
+        
+        path = str(tmp_path / "games.glh")
+        words = ["CAT", "DOG", "GARDEN", "JAZZ", "CAT"]
+        with HangmanLogWriter(path) as writer, pytest.MonkeyPatch.context() as patch:
+            patch.setattr(game_log, "WRITE_CHUNK", 2)
+            for word in words:
+                writer.append(word, word)
+        
+        ids = [get_word_id(word) for word in words]
+        with open(path, "rb") as f:
+            f.seek(game_log._HANGMAN_HEADER.size)
+            assert [word_id for word_id, in struct.iter_unpack("<I", f.read(4 * len(ids)))] == ids
+        with HangmanLog(path) as log:
+            assert list(log.word_ids) == ids
+            assert [game.word for game in log.replay()] == words
+    
+    def test_five_bits_per_letter(self, tmp_path):
+        """Test that guesses take 5 bits each."""
+        path = str(tmp_path / "games.glh")
+        with HangmanLogWriter(path) as writer:
+            writer.append("CAT", "ETAOINSHRDLCUMWF")
+        assert os.path.getsize(path) == game_log._HANGMAN_HEADER.size + 4 + 1 + 10
+    
+    def test_invalid_guesses(self, tmp_path):
+        """Test that guesses other than letters are rejected."""
+        with HangmanLogWriter(str(tmp_path / "games.glh")) as writer:
+            with pytest.raises(ValueError):
+                writer.append("CAT", "C4")
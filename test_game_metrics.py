@@ -0,0 +1,87 @@
+import os
+import game_metrics
+from game_metrics import Counter, Histogram, TextfileExporter, write_textfile
+from hangman.hangman import HangmanGame
+from rock_paper_scissors import iter_rounds
+from rps_opponents import ReplayOpponent
+
+class TestGameMetrics:
+    """Test game metrics and their textfile export."""
+    
+    def setup_method(self):
+        game_metrics.disable()
+    
+    def teardown_method(self):
+        game_metrics.disable()
+    
+    def test_counter_render(self):
+        """Test that counters render one sample per label value."""
+        counter = Counter("rounds_total", "Rounds.", "winner")
+        counter.inc("user")
+        counter.inc("user")
+        counter.inc("tie", 3)
+        assert counter.render() == [
+            "# HELP rounds_total Rounds.",
+            "# TYPE rounds_total counter",
+            'rounds_total{winner="tie"} 3',
+            'rounds_total{winner="user"} 2',
+        ]
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets count values up to and including their bound."""
+        histogram = Histogram("guesses", "Guesses.", (1, 5))
+        for value in (1, 2, 5, 9):
+            histogram.observe(value)
+        assert histogram.render() == [
+            "# HELP guesses Guesses.",
+            "# TYPE guesses histogram",
+            'guesses_bucket{le="1"} 1',
+            'guesses_bucket{le="5"} 3',
+            'guesses_bucket{le="+Inf"} 4',
+            "guesses_sum 17",
+            "guesses_count 4",
+        ]
+    
+    def test_disabled_by_default(self):
+        """Test that games record nothing while metrics are disabled."""
+        game = HangmanGame(word="CAT")
+        for letter in "CAT":
+            game.make_guess(letter)
+        assert game_metrics.registry is None
+    
+    def test_hangman_hooks(self):
+        """Test that guesses and finished games are recorded."""
+        metrics = game_metrics.enable()
+        game = HangmanGame(word="CAT")
+        for letter in "XCAT":
+            game.make_guess(letter)
+        assert metrics.make_guess_seconds.count == 4
+        assert metrics.hangman_games.values == {"win": 1}
+        assert metrics.guesses_per_game.sum == 4
+        assert metrics.hangman_game_seconds.count == 1
+    
+    def test_rps_hooks(self):
+        """Test that scripted rounds are counted by winner."""
+        metrics = game_metrics.enable()
+        opponent = ReplayOpponent(["rock"])
+        list(iter_rounds(["paper", "rock", "scissors"], opponent))
+        assert metrics.rps_rounds.values == {"user": 1, "tie": 1, "computer": 1}
+    
+    def test_write_textfile(self, tmp_path):
+        """Test that the textfile is written in full and leaves no temporary file."""
+        metrics = game_metrics.enable()
+        metrics.hangman_games.inc("lose")
+        path = tmp_path / "games.prom"
+        write_textfile(str(path))
+        text = path.read_text()
+        assert 'hangman_games_total{result="lose"} 1\n' in text
+        assert text.endswith("\n")
+        assert os.listdir(tmp_path) == ["games.prom"]
+    
+    def test_exporter_writes_on_stop(self, tmp_path):
+        """Test that stopping the exporter writes the final metrics."""
+        game_metrics.enable().rps_rounds.inc("tie")
+        path = tmp_path / "rps.prom"
+        exporter = TextfileExporter(str(path), interval=3600).start()
+        exporter.stop()
+        assert 'rps_rounds_total{winner="tie"} 1' in path.read_text()
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+import pytest
+from leaderboard import SECONDS_PER_DAY, Leaderboard
+from rock_paper_scissors import play_game
+from rps_opponents import ReplayOpponent
+
+NOW = 100 * SECONDS_PER_DAY + 3600
+
+class TestLeaderboard:
+    """Test recording games and ranking players."""
+    
+    def open(self, tmp_path, **kwargs):
+        kwargs.setdefault("flush_interval", 0.01)
+        return Leaderboard(str(tmp_path / "scores.db"), clock=lambda: NOW, **kwargs)
+    
+    def test_uses_wal(self, tmp_path):
+        """Test that the database is opened in WAL mode."""
+        with self.open(tmp_path) as board:
+            mode = board._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+    
+    def test_top_players(self, tmp_path):
+        """Test that players are ranked by wins, then score."""
+        with self.open(tmp_path) as board:
+            board.record_rps("ann", 5, 2)
+            board.record_rps("ann", 1, 3)
+            board.record_rps("bob", 4, 1)
+            board.record_rps("bob", 9, 0)
+            board.record_rps("cy", 3, 0)
+            board.flush()
+            assert board.top("rps") == [("bob", 2, 2, 13), ("ann", 1, 2, 6), ("cy", 1, 1, 3)]
+            assert board.top("rps", limit=1) == [("bob", 2, 2, 13)]
+            assert board.top("hangman") == []
+    
+    def test_time_window(self, tmp_path):
+        """Test that only games in the last few days count towards a window."""
+        with self.open(tmp_path) as board:
+            board.record_hangman("ann", True, 1, played_at=NOW)
+            board.record_hangman("bob", True, 0, played_at=NOW - 2 * SECONDS_PER_DAY)
+            board.record_hangman("bob", True, 2, played_at=NOW - 30 * SECONDS_PER_DAY)
+            board.flush()
+            assert board.top("hangman", days=1) == [("ann", 1, 1, 1)]
+            assert board.top("hangman", days=7) == [("ann", 1, 1, 1), ("bob", 1, 1, 1)]
+            assert board.top("hangman") == [("bob", 2, 2, 2), ("ann", 1, 1, 1)]
+    
+    def test_batches_match_games(self, tmp_path):
+        """Test that daily totals agree with the games written in small batches."""
+        with self.open(tmp_path, batch_size=7) as board:
+            for index in range(100):
+                board.record_hangman(f"p{index % 3}", index % 2 == 0, index % 6,
+                                     played_at=NOW - (index % 4) * SECONDS_PER_DAY)
+            board.flush()
+            execute = board._connection.execute
+            daily = execute("SELECT SUM(games), SUM(wins) FROM daily_totals").fetchone()
+            players = execute("SELECT SUM(games), SUM(wins) FROM player_totals").fetchone()
+            games = execute("SELECT COUNT(*), SUM(won) FROM games").fetchone()
+        assert daily == players == games == (100, 50)
+    
+    def test_close_writes_queued_games(self, tmp_path):
+        """Test that closing the leaderboard writes the games still queued."""
+        board = self.open(tmp_path, flush_interval=60)
+        board.record_rps("ann", 2, 1)
+        board.close()
+        with self.open(tmp_path) as board:
+            assert board.player_stats("ann") == {"rps": {"games": 1, "wins": 1, "score": 2}}
+            assert board.history("ann", "rps") == [(NOW, 1, 2, 1)]
+    
+    def test_writer_failure_does_not_hang_flush(self, tmp_path):
+        """Test that flush and close raise rather than wait when a batch fails to write."""
+        board = self.open(tmp_path)
+        with patch.object(board, "_write", side_effect=TypeError("broken")):
+            board.record_rps("ann", 2, 1)
+            with pytest.raises(RuntimeError):
+                board.flush()
+        with pytest.raises(RuntimeError):
+            board.record_rps("ann", 2, 1)
+        with pytest.raises(RuntimeError):
+            board.close()
+    
+    def test_scores_must_be_integers(self, tmp_path):
+        """Test that scores that cannot be added up are rejected when recorded."""
+        with self.open(tmp_path) as board:
+            with pytest.raises(TypeError):
+                board.record("rps", "ann", True, "many")
+            with pytest.raises(TypeError):
+                board.record_rps("ann", 2, 1.5)
+            board.record_rps("ann", 2, 1)
+            board.flush()
+            assert board.player_stats("ann") == {"rps": {"games": 1, "wins": 1, "score": 2}}
+    
+    def test_unknown_game(self, tmp_path):
+        """Test that unknown game types are rejected."""
+        with self.open(tmp_path) as board:
+            with pytest.raises(ValueError):
+                board.record("chess", "ann", True, 1)
+    
+    @patch('builtins.input')
+    def test_play_game_records_score(self, mock_input, tmp_path, capsys):
+        """Test that play_game records the final score on the leaderboard."""
+        mock_input.side_effect = ['paper', 'paper', 'quit']
+        with self.open(tmp_path) as board:
+            play_game(ReplayOpponent(['rock']), leaderboard=board, player="ann")
+            board.flush()
+            assert board.top("rps") == [("ann", 1, 1, 2)]
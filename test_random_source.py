@@ -0,0 +1,62 @@
+from collections import Counter
+import pytest
+import random_source
+from random_source import RandomSource
+from rock_paper_scissors import get_computer_choice
+from rps_rules import RPS7
+
+class TestRandomSource:
+    """Test the seedable, block-drawing random source."""
+    
+    def test_seed_is_reproducible(self):
+        """Test that sources with the same seed draw the same values."""
+        first, second = RandomSource(42), RandomSource(42)
+        assert [first.randrange(3) for _ in range(10000)] == [second.randrange(3) for _ in range(10000)]
+        assert [first.randrange(10 ** 6) for _ in range(100)] == [second.randrange(10 ** 6) for _ in range(100)]
+    
+    @pytest.mark.parametrize("bound", [1, 3, 7, 200, 256, 257, 100000])
+    def test_randrange_bounds(self, bound):
+        """Test that indexes stay below the bound."""
+        source = RandomSource(1, block_size=64)
+        values = [source.randrange(bound) for _ in range(1000)]
+        assert min(values) >= 0 and max(values) < bound
+    
+    def test_randrange_is_uniform(self):
+        """Test that biased bytes are dropped, so every index is about equally likely."""
+        source = RandomSource(7)
+        counts = Counter(source.randrange(100) for _ in range(200000))
+        assert len(counts) == 100
+        # 255 % 100 biased bytes would make 0-55 about 33% more likely than 56-99
+        assert max(counts.values()) / min(counts.values()) < 1.2
+    
+    def test_choice(self):
+        """Test picking from sequences."""
+        source = RandomSource(3)
+        assert {source.choice("abc") for _ in range(100)} == {"a", "b", "c"}
+        with pytest.raises(IndexError):
+            source.choice([])
+        with pytest.raises(ValueError):
+            source.randrange(0)
+    
+    def test_spawn_gives_independent_streams(self):
+        """Test that spawned sources are reproducible and differ by key."""
+        source = RandomSource(5)
+        streams = [[spawned.randrange(1000) for _ in range(20)]
+                   for spawned in (source.spawn(key) for key in (0, 1, 2, 0))]
+        assert streams[0] == streams[3]
+        assert len({tuple(stream) for stream in streams}) == 3
+    
+    def test_passes_other_methods_through(self):
+        """Test that methods such as shuffle come from the underlying random.Random."""
+        letters = list("abcdef")
+        RandomSource(9).shuffle(letters)
+        assert sorted(letters) == list("abcdef")
+        assert 0 <= RandomSource(9).random() < 1
+    
+    def test_default_source_seed(self):
+        """Test that seeding the default source fixes the computer's moves."""
+        random_source.seed(11)
+        first = [get_computer_choice(RPS7) for _ in range(50)]
+        random_source.seed(11)
+        assert [get_computer_choice(RPS7) for _ in range(50)] == first
+        random_source.seed()
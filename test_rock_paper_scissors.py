@@ -1,3 +1,5 @@
+import io
+import json
 import pytest
 from unittest.mock import patch
 from rock_paper_scissors import (
@@ -6,8 +8,18 @@ from rock_paper_scissors import (
     display_choices,
     display_result,
     display_score,
-    get_user_choice
+    get_user_choice,
+    CHOICES,
+    OUTCOMES,
+    encode_moves,
+    determine_winners,
+    score_rounds,
+    save_scoreboards,
+    load_scoreboards,
+    iter_rounds,
+    play_script
 )
+from rps_opponents import ReplayOpponent
 
 class TestRockPaperScissors:
     
@@ -34,6 +46,58 @@ class TestRockPaperScissors:
         assert determine_winner('rock', 'paper') == 'computer'
         assert determine_winner('paper', 'scissors') == 'computer'
     
+    def test_determine_winners_matches_determine_winner(self):
+        """Test batch results against the single-round function."""
+        user = [u for u in range(3) for c in range(3)]
+        computer = [c for u in range(3) for c in range(3)]
+        outcomes = determine_winners(user, computer)
+        for u, c, outcome in zip(user, computer, outcomes):
+            assert OUTCOMES[outcome] == determine_winner(CHOICES[u], CHOICES[c])
+    
+    def test_score_rounds(self):
+        """Test aggregate scores for encoded moves."""
+        user = encode_moves(['rock', 'rock', 'paper', 'scissors'])
+        computer = encode_moves(['scissors', 'rock', 'scissors', 'rock'])
+        assert score_rounds(user, computer) == {'tie': 1, 'user': 1, 'computer': 2}
+        assert score_rounds(b"", b"") == {'tie': 0, 'user': 0, 'computer': 0}
+    
+    def test_determine_winners_invalid_moves(self):
+        """Test that bad batches are rejected."""
+        with pytest.raises(ValueError):
+            determine_winners([0, 1], [0])
+        with pytest.raises(ValueError):
+            determine_winners([0, 3], [0, 1])
+    
+    def test_scoreboards_round_trip(self, tmp_path):
+        """Test saving and loading scoreboards."""
+        path = str(tmp_path / "scores.bin")
+        scoreboards = {1: (3, 2), 2**63: (0, 7)}
+        save_scoreboards(path, scoreboards)
+        assert load_scoreboards(path) == scoreboards
+    
+    def test_iter_rounds(self):
+        """Test scripted rounds."""
+        opponent = ReplayOpponent(['scissors', 'paper'])
+        results = list(iter_rounds(['rock', '', 'lizard', 'ROCK', 'quit', 'rock'], opponent))
+        assert results == [
+            {'round': 1, 'user': 'rock', 'computer': 'scissors', 'winner': 'user',
+             'user_score': 1, 'computer_score': 0},
+            {'error': 'Invalid choice.', 'input': 'lizard'},
+            {'round': 2, 'user': 'rock', 'computer': 'paper', 'winner': 'computer',
+             'user_score': 1, 'computer_score': 1},
+        ]
+    
+    @patch('builtins.input')
+    @patch('builtins.print')
+    def test_play_script_does_not_prompt(self, mock_print, mock_input):
+        """Test that scripted play writes JSON lines only."""
+        output = io.StringIO()
+        play_script(io.StringIO("paper\nscissors\n"), output)
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [line['round'] for line in lines] == [1, 2]
+        mock_input.assert_not_called()
+        mock_print.assert_not_called()
+    
     @patch('builtins.print')
     def test_display_choices(self, mock_print):
         """Test display choices function."""
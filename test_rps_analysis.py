@@ -0,0 +1,73 @@
+import pytest
+from rps_analysis import (
+    analyze_conditional, best_response, best_responses, conditional_frequencies,
+    exploitability, move_frequencies, payoff_matrix
+)
+from rps_opponents import NGramOpponent, RandomOpponent, ReplayOpponent
+from rps_rules import CLASSIC, RPSLS, RPS7
+
+class TestAnalysis:
+    """Test the exploitability analysis of strategies."""
+    
+    def test_payoff_matrix(self):
+        """Test that the payoff matrix follows determine_winner."""
+        assert payoff_matrix() == [[0, -1, 1], [1, 0, -1], [-1, 1, 0]]
+    
+    @pytest.mark.parametrize("rules", [CLASSIC, RPSLS, RPS7])
+    def test_uniform_play_is_unexploitable(self, rules):
+        """Test that uniform random play cannot be exploited."""
+        value, replies = best_response(RandomOpponent(rules=rules).distribution(), rules)
+        assert value == pytest.approx(0)
+        assert replies == list(rules.moves)
+    
+    def test_pure_strategy(self):
+        """Test that always playing rock is fully exploited by paper."""
+        assert best_response([1, 0, 0]) == (1, ['paper'])
+        assert best_response([0, 0, 1, 0, 0], RPSLS) == (1, ['rock', 'spock'])
+    
+    def test_many_strategies_at_once(self):
+        """Test analyzing several strategies in one call."""
+        analyses = best_responses([[0.5, 0.5, 0], [0.2, 0.3, 0.5], [1 / 3] * 3])
+        assert analyses[0] == (pytest.approx(0.5), ['paper'])
+        assert analyses[1] == (pytest.approx(0.2), ['rock'])
+        assert analyses[2][0] == pytest.approx(0)
+    
+    def test_bad_distribution(self):
+        """Test that malformed distributions are rejected."""
+        with pytest.raises(ValueError):
+            exploitability([0.5, 0.5])
+        with pytest.raises(ValueError):
+            exploitability([0.5, 0.6, -0.1])
+    
+    def test_replay_opponent(self):
+        """Test that a replayed move is predictable."""
+        opponent = ReplayOpponent(['rock', 'scissors'])
+        opponent.choose()
+        assert best_response(opponent.distribution()) == (1, ['rock'])
+    
+    def test_ngram_opponent(self):
+        """Test the contexts of a trained n-gram opponent."""
+        opponent = NGramOpponent(order=1)
+        for move in ['rock', 'rock', 'rock', 'paper']:
+            opponent.observe(move)
+        distributions = opponent.context_distributions()
+        
+        # After rock the user played rock twice, so the opponent plays paper.
+        assert distributions[('rock',)] == [0, 1, 0]
+        assert distributions[('scissors',)] == pytest.approx([1 / 3] * 3)
+        assert opponent.distribution() == distributions[('paper',)]
+        analysis = analyze_conditional(distributions)
+        assert analysis["contexts"][('rock',)] == (1, ['scissors'])
+        assert analysis["worst"] == 1
+        assert analysis["mean"] == pytest.approx(1 / 3)
+    
+    def test_recorded_moves(self):
+        """Test measuring a recorded player from their moves."""
+        moves = ['rock', 'paper', 'rock', 'paper', 'rock', 'scissors']
+        assert best_response(move_frequencies(moves)) == (pytest.approx(1 / 3), ['paper'])
+        
+        distributions, weights = conditional_frequencies(moves, order=1)
+        assert distributions[('rock',)] == [0, 2 / 3, 1 / 3]
+        assert weights == {('rock',): 3, ('paper',): 2}
+        analysis = analyze_conditional(distributions, weights=weights)
+        assert analysis["mean"] == pytest.approx((3 * 2 / 3 + 2 * 1) / 5)
@@ -0,0 +1,58 @@
+import random
+import pytest
+from unittest.mock import patch
+from rock_paper_scissors import CHOICES, determine_winner, play_game
+from rps_opponents import COUNTER_MOVES, NGramOpponent, RandomOpponent
+
+class TestOpponents:
+    """Test the pluggable computer opponents."""
+    
+    def test_counter_moves(self):
+        """Test that each counter move beats its move."""
+        for move, counter in enumerate(COUNTER_MOVES):
+            assert determine_winner(CHOICES[counter], CHOICES[move]) == 'user'
+    
+    def test_random_opponent(self):
+        """Test that the random opponent plays valid moves."""
+        opponent = RandomOpponent(random.Random(1))
+        assert {opponent.choose() for _ in range(100)} == set(CHOICES)
+    
+    def test_ngram_beats_repeated_move(self):
+        """Test that a repeated move is countered."""
+        opponent = NGramOpponent(order=1)
+        for _ in range(5):
+            opponent.observe('rock')
+        assert opponent.choose() == 'paper'
+    
+    def test_ngram_learns_cycle(self):
+        """Test that a cycling player is beaten once the cycle is learned."""
+        opponent = NGramOpponent(order=2, rng=random.Random(0))
+        cycle = ['rock', 'paper', 'scissors']
+        results = []
+        for round_number in range(60):
+            user_choice = cycle[round_number % 3]
+            results.append(determine_winner(user_choice, opponent.choose()))
+            opponent.observe(user_choice)
+        assert results[10:] == ['computer'] * 50
+    
+    def test_ngram_counts_stay_bounded(self):
+        """Test that saturated counters are halved instead of overflowing."""
+        opponent = NGramOpponent(order=0)
+        for _ in range(NGramOpponent.MAX_COUNT + 10):
+            opponent.observe('scissors')
+        assert max(opponent._counts) < NGramOpponent.MAX_COUNT
+        assert opponent.predict() == 2
+    
+    def test_ngram_invalid_order(self):
+        """Test that negative orders are rejected."""
+        with pytest.raises(ValueError):
+            NGramOpponent(order=-1)
+    
+    @patch('builtins.input')
+    def test_play_game_with_opponent(self, mock_input, capsys):
+        """Test that play_game asks the opponent for moves and reports user moves."""
+        mock_input.side_effect = ['rock', 'rock', 'quit']
+        opponent = NGramOpponent(order=0)
+        play_game(opponent)
+        assert "Computer chose: paper" in capsys.readouterr().out
+        assert opponent.predict() == 0
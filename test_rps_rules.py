@@ -0,0 +1,74 @@
+import random
+import pytest
+from unittest.mock import patch
+from rock_paper_scissors import determine_winner, determine_winners, encode_moves, get_user_choice
+from rps_opponents import NGramOpponent
+from rps_rules import CLASSIC, OUTCOMES, RPS7, RPSLS, RuleSet, cyclic_rules
+
+class TestRuleSets:
+    """Test rule sets defined as data."""
+    
+    def test_classic_rules(self):
+        """Test the classic outcomes."""
+        assert CLASSIC.winner('rock', 'scissors') == 'user'
+        assert CLASSIC.winner('rock', 'paper') == 'computer'
+        assert CLASSIC.winner('paper', 'paper') == 'tie'
+        assert CLASSIC.winner('quit', 'rock') == 'computer'
+    
+    def test_rpsls_rules(self):
+        """Test rock paper scissors lizard Spock."""
+        assert determine_winner('spock', 'scissors', RPSLS) == 'user'
+        assert determine_winner('lizard', 'spock', RPSLS) == 'user'
+        assert determine_winner('rock', 'spock', RPSLS) == 'computer'
+    
+    def test_balanced_rule_sets(self):
+        """Test that every move beats and loses to half of the others."""
+        for rules in (CLASSIC, RPSLS, RPS7, cyclic_rules('rps15', [str(i) for i in range(15)])):
+            size = len(rules)
+            for move in range(size):
+                outcomes = [rules.outcome(move, other) for other in range(size)]
+                assert outcomes.count(1) == outcomes.count(2) == size // 2
+                assert rules.outcome(move, move) == 0
+    
+    def test_cyclic_rules_matches_classic(self):
+        """Test that three cyclic moves are the classic game."""
+        assert cyclic_rules('three', CLASSIC.moves).table == CLASSIC.table
+        with pytest.raises(ValueError):
+            cyclic_rules('four', ['a', 'b', 'c', 'd'])
+    
+    def test_invalid_rules(self):
+        """Test that inconsistent rules are rejected."""
+        with pytest.raises(ValueError):
+            RuleSet('self', ['a', 'b'], {'a': ['a']})
+        with pytest.raises(ValueError):
+            RuleSet('mutual', ['a', 'b'], {'a': ['b'], 'b': ['a']})
+        with pytest.raises(ValueError):
+            RuleSet('unknown', ['a', 'b'], {'a': ['c']})
+    
+    def test_batch_scoring_with_rules(self):
+        """Test batch scoring for small and large rule sets."""
+        big = cyclic_rules('rps17', [str(i) for i in range(17)])
+        for rules in (RPSLS, big):
+            rng = random.Random(len(rules))
+            user = [rng.randrange(len(rules)) for _ in range(200)]
+            computer = [rng.randrange(len(rules)) for _ in range(200)]
+            outcomes = determine_winners(user, computer, rules)
+            for u, c, outcome in zip(user, computer, outcomes):
+                assert OUTCOMES[outcome] == rules.winner(rules.moves[u], rules.moves[c])
+        assert encode_moves(['spock', 'rock'], RPSLS) == bytes([4, 0])
+    
+    @patch('builtins.input')
+    @patch('builtins.print')
+    def test_get_user_choice_with_rules(self, mock_print, mock_input):
+        """Test validating moves of another rule set."""
+        mock_input.side_effect = ['fire', 'Spock']
+        assert get_user_choice(RPSLS) == 'spock'
+        mock_print.assert_called_with(
+            "Invalid choice. Please enter 'rock', 'paper', 'scissors', 'lizard', 'spock', or 'quit'.")
+    
+    def test_ngram_opponent_with_rules(self):
+        """Test that the n-gram opponent counters a repeated RPSLS move."""
+        opponent = NGramOpponent(order=1, rules=RPSLS)
+        for _ in range(3):
+            opponent.observe('lizard')
+        assert RPSLS.winner(opponent.choose(), 'lizard') == 'user'
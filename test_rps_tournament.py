@@ -0,0 +1,58 @@
+from functools import partial
+from rps_opponents import NGramOpponent, RandomOpponent, ReplayOpponent
+from rps_tournament import play_match, rank, run_matches, tournament
+
+CYCLE = ['rock', 'paper', 'scissors']
+
+class TestTournament:
+    """Test round-robin tournaments between strategies."""
+    
+    def test_play_match(self):
+        """Test counting the rounds of a match."""
+        first = ReplayOpponent(['rock'])
+        second = ReplayOpponent(['scissors', 'rock', 'paper'])
+        assert play_match(first, second, 6) == (2, 2, 2)
+    
+    def test_run_matches_schedules_every_pair(self):
+        """Test that each pair plays the requested number of matches."""
+        strategies = [RandomOpponent, RandomOpponent, RandomOpponent]
+        results = list(run_matches(strategies, rounds=10, matches=2, workers=1))
+        assert sorted(result[:3] for result in results) == [
+            (0, 1, 0), (0, 1, 1), (0, 2, 0), (0, 2, 1), (1, 2, 0), (1, 2, 1)]
+        assert all(sum(result[3:]) == 10 for result in results)
+    
+    def test_rank(self):
+        """Test the ranked table and its confidence intervals."""
+        table = rank(['a', 'b'], [(0, 1, 0, 6, 2, 2)])
+        assert [row['name'] for row in table] == ['a', 'b']
+        assert table[0]['score'] == 0.4
+        assert table[1]['score'] == -0.4
+        assert table[0]['ci_low'] < 0.4 < table[0]['ci_high']
+    
+    def test_rank_interval_over_matches(self):
+        """Test that the interval comes from the spread of match scores."""
+        table = rank(['a', 'b'], [(0, 1, 0, 6, 2, 2), (0, 1, 1, 2, 6, 2), (0, 1, 2, 4, 4, 2)])
+        assert table[0]['matches'] == 3
+        assert table[0]['rounds'] == 30
+        assert table[0]['score'] == 0.0
+        # Match scores 0.4, -0.4 and 0 have a standard error of 0.4 / sqrt(3).
+        margin = 1.96 * 0.4 / 3 ** 0.5
+        assert abs(table[0]['ci_high'] - margin) < 1e-9
+        table = rank(['a', 'b'], [(0, 1, 0, 6, 2, 2), (0, 1, 1, 6, 2, 2)])
+        assert table[0]['ci_low'] == table[0]['ci_high'] == 0.4
+    
+    def test_ngram_beats_recorded_cycle(self):
+        """Test a tournament with a recorded player."""
+        strategies = {
+            'cycle': partial(ReplayOpponent, CYCLE),
+            'ngram': partial(NGramOpponent, order=2),
+        }
+        table = tournament(strategies, rounds=300, matches=2, workers=1)
+        assert table[0]['name'] == 'ngram'
+        assert table[0]['ci_low'] > 0
+    
+    def test_results_do_not_depend_on_workers(self):
+        """Test that seeded tournaments are reproducible."""
+        strategies = {'random': RandomOpponent, 'ngram': partial(NGramOpponent, order=1)}
+        single = tournament(strategies, rounds=200, matches=3, workers=1, seed=5)
+        assert tournament(strategies, rounds=200, matches=3, workers=2, seed=5) == single
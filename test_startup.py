@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Cumulative import time budgets in microseconds, as reported by
+# python -X importtime. They leave room for slow machines; a module
+# that starts pulling in heavy dependencies at import time blows them.
+IMPORT_BUDGETS = {
+    "hangman.hangman": 30000,
+    "rock_paper_scissors": 45000,
+}
+
+# Modules only needed by some commands, which must be imported on demand
+LAZY_MODULES = (
+    "argparse", "asyncio", "concurrent.futures", "json", "mmap", "re",
+    "sqlite3", "threading", "hangman.words", "hangman.ascii_art",
+)
+
+def import_time(module):
+    """Import a module in a fresh interpreter and return its cumulative import time."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"no import time reported for {module}")
+
+def imported_modules(statement):
+    """Run a statement in a fresh interpreter and list the modules it imported."""
+    code = f"import sys; before = set(sys.modules); {statement}; print(*set(sys.modules) - before)"
+    result = subprocess.run([sys.executable, "-c", code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+class TestStartup:
+    """Test the import time and lazy imports of the entry points."""
+    
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+    def test_import_time_budget(self, module):
+        """Test that importing a game stays within its cold start budget."""
+        # Import once first so the timed run does not include writing bytecode caches
+        import_time(module)
+        elapsed = min(import_time(module) for _ in range(3))
+        assert elapsed <= IMPORT_BUDGETS[module], f"{module} took {elapsed}us to import"
+    
+    @pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS))
+    def test_heavy_modules_are_lazy(self, module):
+        """Test that importing a game does not load modules only some commands need."""
+        assert imported_modules(f"import {module}").isdisjoint(LAZY_MODULES)
+    
+    def test_game_loads_words_on_first_use(self):
+        """Test that the word lists and art are loaded when the first game starts."""
+        modules = imported_modules("import hangman.hangman; hangman.hangman.HangmanGame()")
+        assert {"hangman.words", "hangman.ascii_art"} <= modules